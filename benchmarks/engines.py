@@ -0,0 +1,279 @@
+"""
+Benchmarks the stepping engines on a matrix of grid sizes, densities, edge modes and
+the patterns bundled in data/, and saves the results as JSON to compare runs.
+
+Each configuration reports cell updates per second, the transient memory of a
+generation (peak traced memory above the memory held before it) and the memory still
+held after a few generations (caches, buffers). Memory is traced with tracemalloc,
+which sees numpy allocations but not those of the worker processes of the "parallel"
+engine.
+
+Engines are measured in two modes: "step" calls Game.update_grid_state once per
+generation, as the terminal interface did, and "run" advances the stepper of
+Game.create_stepper, as Game.run does. HashLife only has the "run" mode and evolves
+on the infinite plane, reported as the "infinite" edge mode.
+
+Usage:
+    python benchmarks/engines.py --quick --output results.json
+    python benchmarks/engines.py --engines numpy bitpacked --sizes 1024 4096 --compare results.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from GameOfLife.game import Game
+from GameOfLife.hashlife import HashLife
+
+ENGINES = ["numpy", "bitpacked", "sparse", "active", "parallel", "reference", "hashlife"]
+MODES = ["step", "run"]
+EDGES = ["wrap", "bounded"]
+SIZES = [64, 256, 1024, 4096, 16384]
+DENSITIES = [0.1, 0.35, 0.5]
+DATA_DIRECTORY = Path(__file__).resolve().parent.parent / "data"
+# Largest grid side run by default for engines whose cost explodes on random soups.
+MAX_SIDE = {"reference": 256, "sparse": 1024, "hashlife": 256}
+# HashLife memoizes whole regions, so doubling jumps can get arbitrarily cheap.
+MAX_GENERATIONS = 10_000
+# Fields identifying a configuration when comparing two result files.
+KEY_FIELDS = ("engine", "mode", "size", "density", "pattern", "edge")
+
+
+def bundled_patterns():
+    """
+    Returns the pattern files of data/, without the parser test grids.
+    """
+    return sorted(path for path in DATA_DIRECTORY.iterdir()
+                  if path.suffix in ('.txt', '.rle') and not path.name.startswith('test_'))
+
+
+def make_grid(size, density=None, pattern=None, seed=0):
+    """
+    Returns a random square grid, or a pattern centred in a dead one.
+    """
+    if pattern is None:
+        rng = np.random.default_rng(seed)
+        return (rng.random((size, size)) < density).astype(np.uint8)
+    cells = Game(starting_grid_filepath=str(pattern)).initialize_grid()
+    grid = np.zeros((size, size), dtype=np.uint8)
+    (top, left) = ((size - cells.shape[0]) // 2, (size - cells.shape[1]) // 2)
+    grid[top:top + cells.shape[0], left:left + cells.shape[1]] = cells
+    return grid
+
+
+def make_stepper(engine, mode, grid, no_wrapping):
+    """
+    Returns a function advancing ``grid`` by a given number of generations with an engine,
+    and a function releasing what it holds (the worker processes and shared memory of
+    the "parallel" stepper in run mode).
+    """
+    if engine == "hashlife":
+        life = HashLife.from_array(grid)
+        return (life.advance, lambda: None)
+    game = Game(*grid.shape, random_grid=False, backend=engine)
+    if mode == "step":
+        state = [grid]
+
+        def step(generations):
+            for _ in range(generations):
+                state[0] = game.update_grid_state(state[0], no_wrapping)
+        return (step, lambda: None)
+    stepper = game.create_stepper(grid.shape)
+    stepper.load(grid)
+    return (lambda generations: stepper.advance(generations, no_wrapping), lambda: Game.close_stepper(stepper))
+
+
+def measure(measurement, engine, mode, grid, no_wrapping):
+    """
+    Returns ``measurement(step)`` for a new stepper, closed afterwards.
+    """
+    (step, close) = make_stepper(engine, mode, grid, no_wrapping)
+    try:
+        return measurement(step)
+    finally:
+        close()
+
+
+def measure_speed(step, min_time, max_generations=MAX_GENERATIONS):
+    """
+    Runs doubling numbers of generations until ``min_time`` seconds have been timed,
+    after one warm-up generation, or ``max_generations`` have been run.
+
+    Returns
+    -------
+    tuple
+        (generations, seconds) timed.
+    """
+    step(1)
+    (generations, seconds, batch) = (0, 0.0, 1)
+    while seconds < min_time and generations < max_generations:
+        batch = min(batch, max_generations - generations)
+        start = time.perf_counter()
+        step(batch)
+        seconds += time.perf_counter() - start
+        generations += batch
+        batch = generations
+    return (generations, seconds)
+
+
+def measure_memory(step, generations=3):
+    """
+    Traces the memory of a few generations.
+
+    Returns
+    -------
+    tuple
+        (peak_bytes, retained_bytes): largest traced memory above the memory held at
+        the start of a generation, and memory held after the last generation above
+        the memory held before the first one.
+    """
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        peak = 0
+        for _ in range(generations):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            step(1)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        return (peak, tracemalloc.get_traced_memory()[0] - base)
+    finally:
+        tracemalloc.stop()
+
+
+def configurations(args):
+    """
+    Yields the (engine, mode, size, density, pattern, edge) configurations to run.
+    """
+    patterns = bundled_patterns() if args.patterns == ["all"] else [
+        DATA_DIRECTORY / name for name in args.patterns if name != "none"]
+    inputs = [(size, density, None) for (size, density) in itertools.product(args.sizes, args.densities)]
+    inputs += [(args.pattern_size, None, pattern) for pattern in patterns]
+    for engine in args.engines:
+        modes = ["run"] if engine == "hashlife" else args.modes
+        edges = ["infinite"] if engine == "hashlife" else args.edges
+        for (mode, edge, (size, density, pattern)) in itertools.product(modes, edges, inputs):
+            if args.all_sizes or size <= MAX_SIDE.get(engine, size):
+                yield (engine, mode, size, density, pattern, edge)
+
+
+def run_benchmark(engine, mode, size, density, pattern, edge, min_time):
+    """
+    Measures one configuration and returns its result record.
+    """
+    grid = make_grid(size, density, pattern)
+    no_wrapping = edge == "bounded"
+    (generations, seconds) = measure(lambda step: measure_speed(step, min_time), engine, mode, grid, no_wrapping)
+    (peak_bytes, retained_bytes) = measure(measure_memory, engine, mode, grid, no_wrapping)
+    return {
+        "engine": engine,
+        "mode": mode,
+        "size": size,
+        "density": density,
+        "pattern": pattern.name if pattern else None,
+        "edge": edge,
+        "generations": generations,
+        "seconds": seconds,
+        "cell_updates_per_second": generations * grid.size / seconds,
+        "peak_bytes": peak_bytes,
+        "retained_bytes": retained_bytes,
+        "peak_bytes_per_cell": peak_bytes / grid.size,
+    }
+
+
+def environment():
+    """
+    Returns the machine and code version the results were measured on.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "date": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints the speed ratio of each configuration measured in both runs, and returns
+    the configurations slower than the baseline by more than ``tolerance``.
+    """
+    previous = {tuple(record[field] for field in KEY_FIELDS): record for record in baseline["results"]}
+    regressions = []
+    for record in results:
+        key = tuple(record[field] for field in KEY_FIELDS)
+        if key not in previous:
+            continue
+        ratio = record["cell_updates_per_second"] / previous[key]["cell_updates_per_second"]
+        flag = "  REGRESSION" if ratio < 1 - tolerance else ""
+        print(f"{describe(record):<60} x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(record)
+    return regressions
+
+
+def describe(record):
+    source = record["pattern"] or f"density {record['density']}"
+    return f"{record['engine']}/{record['mode']} {record['size']}^2 {source} {record['edge']}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Game of Life engines.")
+    parser.add_argument('--engines', nargs='+', default=ENGINES, choices=ENGINES)
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES, help='Sides of the random grids.')
+    parser.add_argument('--densities', nargs='+', type=float, default=DENSITIES)
+    parser.add_argument('--edges', nargs='+', default=EDGES, choices=EDGES)
+    parser.add_argument('--patterns', nargs='+', default=["all"],
+                        help='Files of data/ to benchmark, "all" or "none".')
+    parser.add_argument('--pattern-size', type=int, default=256, help='Side of the grids holding the patterns.')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Seconds timed per configuration.')
+    parser.add_argument('--all-sizes', action='store_true',
+                        help='Also run the slow engines on grids larger than their default limit.')
+    parser.add_argument('--quick', action='store_true', help='Small matrix for a fast check.')
+    parser.add_argument('--output', help='Write the results to this JSON file.')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare with.')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Slowdown over the compared run reported as a regression.')
+    args = parser.parse_args(argv)
+    if args.quick:
+        (args.sizes, args.densities, args.min_time) = ([64, 256], [0.35], 0.1)
+
+    results = []
+    for config in configurations(args):
+        record = run_benchmark(*config, args.min_time)
+        results.append(record)
+        print(f"{describe(record):<60} {record['cell_updates_per_second']:10.3g} cells/s"
+              f" {record['peak_bytes'] / 1e6:9.2f} MB peak {record['retained_bytes'] / 1e6:9.2f} MB retained",
+              flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=1)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.tolerance:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
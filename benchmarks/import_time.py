@@ -0,0 +1,80 @@
+"""
+Measures the import time of the package modules in fresh interpreters with
+``python -X importtime``, and checks it against a budget.
+
+The time reported for a module excludes numpy, which every module needs and whose
+import time only depends on the installation. The best of several runs is kept, the
+first ones being slowed down by a cold file cache.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --modules GameOfLife.game GameOfLife.batch --budget 40
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+MODULES = ["GameOfLife", "GameOfLife.game", "GameOfLife.batch", "GameOfLife.soup", "GameOfLife.gui"]
+# Milliseconds allowed for importing a module of the package, numpy excluded.
+BUDGET_MS = 60
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module):
+    """
+    Imports a module in a new interpreter.
+
+    Returns
+    -------
+    tuple
+        (total, numpy): cumulative import times in microseconds of the module and of
+        numpy, wherever it was first imported. Imports of the interpreter startup are
+        not counted.
+    """
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True, env=os.environ).stderr
+    (total, numpy) = (0, 0)
+    for match in _LINE.finditer(output):
+        if len(match.group(3)) == 1 and match.group(4) == module:
+            total = int(match.group(2))
+        if match.group(4) == "numpy":
+            numpy = int(match.group(2))
+    return (total, numpy)
+
+
+def measure(module, repeat):
+    """
+    Returns the best import time of a module, numpy excluded, in milliseconds.
+    """
+    best = None
+    for _ in range(repeat):
+        (total, numpy) = import_times(module)
+        total -= numpy
+        best = total if best is None else min(best, total)
+    return best / 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the import time of the package.")
+    parser.add_argument('--modules', nargs='+', default=MODULES)
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per module, the best one is kept.')
+    parser.add_argument('--budget', type=float, default=BUDGET_MS, help='Milliseconds allowed per module.')
+    args = parser.parse_args(argv)
+
+    over_budget = []
+    for module in args.modules:
+        milliseconds = measure(module, args.repeat)
+        flag = "  OVER BUDGET" if milliseconds > args.budget else ""
+        print(f"{module:<24} {milliseconds:8.1f} ms{flag}", flush=True)
+        if flag:
+            over_budget.append(module)
+    if over_budget:
+        print(f"{len(over_budget)} module(s) above the {args.budget:g} ms budget.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Times the RLE loader on large random patterns.
+
+Usage: python benchmarks/rle_parser.py [size ...]
+"""
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+from GameOfLife.game import Game
+
+
+def encode_rle(grid: np.ndarray) -> str:
+    """
+    Encodes a grid as an RLE body, 70 characters per line.
+    """
+    lines = []
+    for row in grid:
+        # Boundaries of runs of equal cells.
+        edges = np.flatnonzero(np.diff(row)) + 1
+        starts = np.concatenate([[0], edges])
+        lengths = np.diff(np.concatenate([starts, [len(row)]]))
+        lines.append(''.join((str(n) if n > 1 else '') + ('o' if row[s] else 'b')
+                             for (s, n) in zip(starts, lengths)))
+    body = '$'.join(lines) + '!'
+    return '\n'.join(body[i:i + 70] for i in range(0, len(body), 70))
+
+
+def main(sizes):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            grid = (rng.random((size, size)) < 0.3).astype(np.uint8)
+            path = os.path.join(directory, f"random_{size}.rle")
+            with open(path, 'w') as file:
+                file.write(f"x = {size}, y = {size}, rule = B3/S23\n{encode_rle(grid)}\n")
+            megabytes = os.path.getsize(path) / 1e6
+
+            start = time.perf_counter()
+            loaded = Game(starting_grid_filepath=path).initialize_grid()
+            seconds = time.perf_counter() - start
+            assert np.array_equal(loaded[4:-4, 4:-4], grid)
+            print(f"{size}x{size}: {megabytes:.1f} MB in {seconds:.3f} s "
+                  f"({megabytes / seconds:.1f} MB/s, {size * size / seconds:.3g} cells/s)")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [500, 1000, 3000])
@@ -5,33 +5,52 @@ import curses
 import re
 import os
 import argparse
+import locale
 
 from curses import wrapper
 
 import sys
 
+from GameOfLife import setup_logging
 from GameOfLife.game import Game
+from GameOfLife.history import DEFAULT_KEYFRAME_INTERVAL, GenerationHistory
 from GameOfLife.gui import TerminalGUI
+from GameOfLife.profiling import Profiler, StackSampler
+from GameOfLife.recording import FrameRecorder
 
 def parse_arguments():
     """
-    Handles no-wrapping argument parsing.
+    Handles no-wrapping, cycle detection, history, recording and profiling argument parsing.
     """
     parser = argparse.ArgumentParser(description='Run Game of Life with optional no wrapping mode.')
 
     parser.add_argument('-nw', '--no-wrapping', action='store_true',
                         help='Run the game without wrapping edges.')
+    parser.add_argument('-dc', '--detect-cycles', action='store_true',
+                        help='Pause the game once it settles into still lifes and oscillators.')
+    parser.add_argument('--history', type=float, default=0, metavar='MEGABYTES',
+                        help='Keep this much memory of past generations to step back through (off by default:'
+                             ' it compresses every generation on the simulation thread).')
+    parser.add_argument('--keyframe-interval', type=int, default=DEFAULT_KEYFRAME_INTERVAL,
+                        help='Generations between two full copies in the history.')
+    parser.add_argument('--record', metavar='PATH',
+                        help='Record every generation to a frame log (see python -m GameOfLife.recording).')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='Time the phases of every frame and save their latency histograms as JSON on exit.')
+    parser.add_argument('--sample', metavar='PATH',
+                        help='Sample the call stacks of the interface and save them as collapsed stacks on exit.')
 
     args = parser.parse_args()
     return args
 
 
-def main(stdscr):
+def main(stdscr, args, profiler, recorder):
     """
     Program entry-point.
     """
-    args = parse_arguments()
-    terminal = TerminalGUI(stdscr, args.no_wrapping)
+    history = (GenerationHistory(args.keyframe_interval, int(args.history * 2 ** 20))
+               if args.history > 0 else None)
+    terminal = TerminalGUI(stdscr, args.no_wrapping, args.detect_cycles, profiler, recorder, history)
 
     current_row_idx = 0
     terminal.display_main_menu(current_row_idx)
@@ -96,4 +115,22 @@ def main(stdscr):
         terminal.run_game(game)
 
 
-wrapper(main)
+setup_logging()
+# Lets curses draw the half-block and braille characters of the zoomed-out views.
+locale.setlocale(locale.LC_ALL, '')
+args = parse_arguments()
+profiler = Profiler(enabled=args.profile is not None)
+sampler = StackSampler() if args.sample else None
+recorder = FrameRecorder(args.record) if args.record else None
+if sampler:
+    sampler.start()
+try:
+    wrapper(main, args, profiler, recorder)
+finally:
+    if recorder:
+        recorder.close()
+    if args.profile:
+        profiler.dump(args.profile)
+    if sampler:
+        sampler.stop()
+        sampler.dump(args.sample)
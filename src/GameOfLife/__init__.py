@@ -1,22 +1,60 @@
 """
-Initializes package by setting logging feature.
+Initializes package: defines the package logger and lazily imported shortcuts to the
+main classes.
+
+Importing the package has no side effect: logging is configured by the entry points
+(main.py, the batch and soup command lines) through setup_logging, and submodules
+such as the curses interface or the parallel engine are only imported when used.
 """
-import os
+import importlib
 import logging
+import os
 
 LOGGING_STR = "[%(asctime)s - %(levelname)s - %(module)s - %(message)s]"
 
 LOG_DIR = "logs"
-log_filepath = os.path.join(LOG_DIR, "running_logs.log")
-os.makedirs(LOG_DIR, exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format=LOGGING_STR,
+logger = logging.getLogger("GameOfLifeLogger")
+# Silent until an entry point configures logging.
+logger.addHandler(logging.NullHandler())
+
+# Attributes of the package and the submodule they are imported from on first access.
+_LAZY_ATTRIBUTES = {
+    "Game": "GameOfLife.game",
+    "Rule": "GameOfLife.rules",
+    "HashLife": "GameOfLife.hashlife",
+    "SimulationThread": "GameOfLife.simulation",
+    "TerminalGUI": "GameOfLife.gui",
+}
+
+
+def setup_logging(log_dir: str = LOG_DIR, level: int = logging.INFO) -> None:
+    """
+    Sends the logs to ``log_dir``/running_logs.log, or to stderr if the directory
+    cannot be written to (e.g. in a read-only container).
+
+    Parameters
+    ----------
+    log_dir : str
+        Directory of the log file, created if needed.
+    level : int
+        Minimum level of the records logged.
+    """
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        handler = logging.FileHandler(os.path.join(log_dir, "running_logs.log"))
+    except OSError:
+        handler = logging.StreamHandler()
+    logging.basicConfig(level=level, format=LOGGING_STR, handlers=[handler])
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    handlers=[
-        logging.FileHandler(log_filepath),
-    ]
-)
 
-logger = logging.getLogger("GameOfLifeLogger")
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
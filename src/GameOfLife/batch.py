@@ -0,0 +1,476 @@
+"""
+Headless batch runner: runs simulations without any rendering and reports their
+throughput, from the command line or from a manifest of jobs run on a process pool.
+
+Usage::
+
+    python -m GameOfLife.batch --size 2048 2048 --seed 1 --generations 1000 --backend bitpacked
+    python -m GameOfLife.batch --manifest jobs.jsonl --processes 4 --results results.jsonl
+"""
+import argparse
+import json
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
+
+import numpy as np
+from GameOfLife import LOG_DIR, logger, setup_logging
+from GameOfLife.game import BACKENDS, Game
+
+# Like in GameOfLife.game, the instrumentation of a job is imported by the jobs using it.
+if TYPE_CHECKING:
+    from GameOfLife.history import GenerationHistory
+    from GameOfLife.profiling import Profiler
+    from GameOfLife.recording import FrameRecorder
+
+# Job fields and their defaults; a manifest entry may set any of them.
+JOB_DEFAULTS = {
+    "name": None,
+    "height": None,
+    "width": None,
+    "seed": None,
+    "density": 0.5,
+    "pattern": None,
+    "rule": None,
+    "generations": 100,
+    "backend": "numpy",
+    "workers": None,
+    "no_wrapping": False,
+    "output": None,
+    "stop_on_cycle": False,
+    "cycle_history": 256,
+    "stats_output": None,
+    "profile": False,
+    "profile_output": None,
+    "profile_live": None,
+    "checkpoint_dir": None,
+    "checkpoint_every": None,
+    "checkpoint_seconds": None,
+    "checkpoint_keep": 3,
+    "resume": False,
+    "record": None,
+    "record_every": 1,
+    "rewind": None,
+    "rewind_dir": ".",
+    "history": 64,
+    # None for the default of GenerationHistory.
+    "keyframe_interval": None,
+}
+
+
+def make_job(**fields) -> dict:
+    """
+    Fills in the defaults of a job and checks its fields.
+
+    Raises
+    ------
+    ValueError
+        For unknown fields, or a job without a size nor a pattern.
+    """
+    unknown = set(fields) - set(JOB_DEFAULTS)
+    if unknown:
+        logger.error(f"Unknown job fields: {sorted(unknown)}.")
+        raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+    job = dict(JOB_DEFAULTS, **fields)
+    if not (job["height"] and job["width"]) and not job["pattern"]:
+        logger.error("A job needs a grid size or a pattern.")
+        raise ValueError("A job needs a grid size or a pattern.")
+    return job
+
+
+def load_manifest(path: str) -> List[dict]:
+    """
+    Reads the jobs of a manifest: a JSON list of job objects, or one job object per
+    line (JSON Lines).
+
+    Parameters
+    ----------
+    path : str
+        Manifest file path.
+
+    Returns
+    -------
+    list of dict
+        Jobs with their defaults filled in.
+    """
+    text = Path(path).read_text()
+    if text.lstrip().startswith('['):
+        entries = json.loads(text)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [make_job(**entry) for entry in entries]
+
+
+def _initial_grid(game: Game, job: dict) -> np.ndarray:
+    """
+    Creates the grid of a job: its pattern, centred in a dead grid if a size is also
+    given, or a random grid.
+    """
+    grid = game.initialize_grid()
+    if not (job["pattern"] and job["height"] and job["width"]):
+        return grid
+    (height, width) = (job["height"], job["width"])
+    if grid.shape[0] > height or grid.shape[1] > width:
+        logger.error(f"Pattern {job['pattern']} does not fit a {height}x{width} grid.")
+        raise ValueError(f"Pattern {job['pattern']} is larger than the {height}x{width} grid.")
+    board = np.zeros((height, width), dtype=np.uint8)
+    (top, left) = ((height - grid.shape[0]) // 2, (width - grid.shape[1]) // 2)
+    board[top:top + grid.shape[0], left:left + grid.shape[1]] = grid
+    return board
+
+
+def _label(job: dict) -> str:
+    """
+    Returns the name of a job in reports: its name, pattern or size, or "job" if it has none.
+    """
+    if job["name"] or job["pattern"]:
+        return job["name"] or job["pattern"]
+    return f"{job['height']}x{job['width']}" if job["height"] and job["width"] else "job"
+
+
+def _live_report(job: dict):
+    """
+    Returns a Profiler callback printing the histograms of a job to stderr.
+    """
+    label = _label(job)
+
+    def report(profiler: "Profiler") -> None:
+        print(f"{label}:\n{profiler.report()}", file=sys.stderr, flush=True)
+    return report
+
+
+def _run_callback(game: Game, frames: Optional["FrameRecorder"], record_every: int,
+                  history: Optional["GenerationHistory"]):
+    """
+    Returns the callback of Game.run feeding the frame recorder and the history with
+    generations numbered from the game's generation, and the number of generations
+    between two calls.
+    """
+    if frames is None and history is None:
+        return (None, record_every)
+
+    def callback(done: int, grid: np.ndarray) -> None:
+        if history is not None:
+            history(game.generation + done, grid)
+        if frames is not None and done % record_every == 0:
+            frames(game.generation + done, grid)
+    return (callback, record_every if history is None else 1)
+
+
+def _save_rewinds(job: dict, game: Game, history: "GenerationHistory") -> dict:
+    """
+    Saves the generations of ``job["rewind"]`` kept in the history as snapshots, and
+    returns their paths by generation. Negative generations count back from the last one.
+    """
+    from GameOfLife.snapshot import SNAPSHOT_EXTENSION, save_snapshot
+    label = job["name"] or "rewind"
+    Path(job["rewind_dir"]).mkdir(parents=True, exist_ok=True)
+    saved = {}
+    for generation in job["rewind"]:
+        if generation < 0:
+            generation += history.newest
+        if generation not in history:
+            logger.error(f"Generation {generation} of job {job['name'] or ''} is not in its history"
+                         f" ({history.oldest} to {history.newest}).")
+            continue
+        path = Path(job["rewind_dir"]) / f"{label}-{generation:012d}{SNAPSHOT_EXTENSION}"
+        save_snapshot(path, history.seek(generation), game.rule, generation, job["no_wrapping"])
+        saved[generation] = str(path)
+    return saved
+
+
+def run_job(job: dict) -> dict:
+    """
+    Runs a job and measures its throughput.
+
+    Only the stepping is timed, not the grid creation nor the output. Jobs with
+    ``stop_on_cycle`` stop at the first still life or oscillator found, and their
+    throughput is computed on the generations actually run.
+
+    Jobs with ``profile`` time every generation (see Game.run), which costs a little
+    throughput on small grids. The histograms are saved to ``profile_output`` if set,
+    and printed to stderr every ``profile_live`` seconds if set.
+
+    Jobs with a ``checkpoint_dir`` save a checkpoint there every ``checkpoint_every``
+    generations and/or ``checkpoint_seconds`` seconds, keeping the last
+    ``checkpoint_keep`` ones. With ``resume``, a job starts from the latest checkpoint
+    of its directory, if any, and only runs the generations left to reach
+    ``generations``.
+
+    Jobs with ``record`` write every ``record_every``-th generation to that frame log
+    (see GameOfLife.recording); frames are dropped rather than slowing the job down.
+    A resumed job writes to a new log named after its start generation, e.g.
+    ``run-000000001000.golf`` for ``run.golf``, so the frames recorded before are kept.
+
+    Jobs with ``rewind``, a list of generations (negative ones counting back from the
+    last one), keep a history of ``history`` megabytes of their generations, with a
+    keyframe every ``keyframe_interval`` generations (see GameOfLife.history), and save
+    the ones listed as snapshots in ``rewind_dir``, e.g. to look at the generations
+    before a pattern broke or a cycle started. The history costs every generation a
+    bit-packing and a compression.
+
+    Parameters
+    ----------
+    job : dict
+        Job fields (see JOB_DEFAULTS).
+
+    Returns
+    -------
+    dict
+        The job fields, plus ``start_generation`` (0 unless resumed), ``generations_run``,
+        ``seconds``, ``generations_per_second`` and ``cells_per_second`` (None if too
+        fast to measure), the final ``population`` and the ``cycle_start`` and
+        ``cycle_period`` found, the ``latency`` summary of each phase for profiled jobs,
+        ``frames_log``, ``frames_recorded`` and ``frames_dropped`` for recorded jobs, the
+        ``history`` summary and the ``rewound`` snapshot paths by generation for rewound
+        jobs, or ``error`` if it failed.
+    """
+    result = dict(job)
+    try:
+        resume_path = None
+        if job["checkpoint_dir"] and job["resume"]:
+            from GameOfLife.checkpoint import latest_checkpoint
+            resume_path = latest_checkpoint(job["checkpoint_dir"])
+        if resume_path:
+            logger.info(f"Job {job['name'] or ''} resumed from {resume_path}.")
+            game = Game(starting_grid_filepath=str(resume_path), backend=job["backend"],
+                        workers=job["workers"], rule=job["rule"])
+            grid = game.initialize_grid()
+        else:
+            game = Game(job["height"], job["width"], starting_grid_filepath=job["pattern"],
+                        random_seed=job["seed"], alive_probability=job["density"],
+                        backend=job["backend"], workers=job["workers"], rule=job["rule"])
+            grid = _initial_grid(game, job)
+        start_generation = game.generation if resume_path else 0
+        checkpointer = None
+        if job["checkpoint_dir"] and (job["checkpoint_every"] or job["checkpoint_seconds"]):
+            from GameOfLife.checkpoint import Checkpointer
+            checkpointer = Checkpointer(job["checkpoint_dir"], job["checkpoint_every"], job["checkpoint_seconds"],
+                                        job["checkpoint_keep"], metadata={"job": job["name"]})
+        detector = None
+        if job["stop_on_cycle"]:
+            from GameOfLife.cycles import CycleDetector
+            detector = CycleDetector(job["cycle_history"])
+        profiler = None
+        if job["profile"] or job["profile_output"] or job["profile_live"]:
+            from GameOfLife.profiling import Profiler
+            profiler = Profiler(on_report=_live_report(job) if job["profile_live"] else None,
+                                report_interval=job["profile_live"] or 1.0)
+        history = None
+        if job["rewind"]:
+            from GameOfLife.history import DEFAULT_KEYFRAME_INTERVAL, GenerationHistory
+            history = GenerationHistory(job["keyframe_interval"] or DEFAULT_KEYFRAME_INTERVAL,
+                                        int(job["history"] * 2 ** 20))
+            history(game.generation, grid)
+        (recorder, frames) = (None, None)
+        try:
+            if job["stats_output"]:
+                from GameOfLife.stats import StatsRecorder
+                recorder = StatsRecorder(job["stats_output"])
+            if job["record"]:
+                from GameOfLife.recording import FrameRecorder
+                frames_log = Path(job["record"])
+                if start_generation:
+                    frames_log = frames_log.with_name(f"{frames_log.stem}-{start_generation:012d}{frames_log.suffix}")
+                frames = FrameRecorder(frames_log)
+                result["frames_log"] = str(frames_log)
+            (callback, callback_every) = _run_callback(game, frames, job["record_every"], history)
+            start = time.perf_counter()
+            grid = game.run(grid, max(job["generations"] - start_generation, 0), job["no_wrapping"],
+                            callback=callback, callback_every=callback_every, detector=detector,
+                            on_stats=recorder, profiler=profiler, checkpointer=checkpointer)
+            seconds = time.perf_counter() - start
+        finally:
+            # Also stops the recording threads and closes the files of a failed job.
+            if recorder:
+                recorder.close()
+            if frames:
+                frames.close()
+        if frames:
+            result.update(frames_recorded=frames.recorded, frames_dropped=frames.dropped)
+        if profiler and job["profile_output"]:
+            profiler.dump(job["profile_output"])
+        if history:
+            result.update(rewound=_save_rewinds(job, game, history), history=history.summary())
+    except Exception as e:
+        logger.error(f"Job {job['name'] or ''} failed: {e}")
+        result["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+        return result
+
+    cycle = detector.cycle if detector else None
+    generations = cycle.start + cycle.period if cycle else max(job["generations"] - start_generation, 0)
+    result.update({
+        "start_generation": start_generation,
+        "generations_run": generations,
+        "cycle_start": cycle.start if cycle else None,
+        "cycle_period": cycle.period if cycle else None,
+        "height": grid.shape[0],
+        "width": grid.shape[1],
+        "rule": str(game.rule),
+        "seconds": seconds,
+        # None rather than an infinite rate, which JSON cannot represent.
+        "generations_per_second": generations / seconds if seconds else None,
+        "cells_per_second": generations * grid.size / seconds if seconds else None,
+        "population": int(np.count_nonzero(grid)),
+    })
+    if profiler:
+        result["latency"] = profiler.summary()
+    if job["output"]:
+        from GameOfLife.snapshot import SNAPSHOT_EXTENSION, save_snapshot
+        if str(job["output"]).endswith(SNAPSHOT_EXTENSION):
+            save_snapshot(job["output"], grid, game.rule, game.generation + generations, job["no_wrapping"])
+        else:
+            Game.save_grid_to_file(grid, job["output"])
+    return result
+
+
+def run_jobs(jobs: Iterable[dict], processes: Optional[int] = None) -> Iterator[dict]:
+    """
+    Runs jobs on a process pool, yielding their results in the order of the jobs.
+
+    Jobs using the "parallel" backend start their own pool of processes, which pool
+    workers are not allowed to do, so they are run in this process after the others,
+    and their results come last.
+
+    Parameters
+    ----------
+    jobs : iterable of dict
+        Jobs to run.
+    processes : int, optional
+        Number of worker processes. Defaults to the CPU count; 1 runs every job in this
+        process.
+
+    Yields
+    ------
+    dict
+        Result of each job, as returned by run_job.
+    """
+    jobs = list(jobs)
+    pooled = [job for job in jobs if job["backend"] != "parallel"]
+    local = [job for job in jobs if job["backend"] == "parallel"]
+    if processes == 1 or len(pooled) <= 1:
+        yield from map(run_job, pooled)
+    else:
+        import multiprocessing
+        with multiprocessing.Pool(min(processes or multiprocessing.cpu_count(), len(pooled))) as pool:
+            yield from pool.imap(run_job, pooled)
+    yield from map(run_job, local)
+
+
+def format_result(result: dict) -> str:
+    """
+    Returns a one-line summary of a job result.
+    """
+    label = _label(result)
+    if "error" in result:
+        return f"{label}: FAILED - {result['error']}"
+    cycle = (f", cycle of period {result['cycle_period']} from generation {result['cycle_start']}"
+             if result["cycle_period"] else "")
+    rates = (f"{result['generations_per_second']:.1f} gen/s, {result['cells_per_second']:.3g} cells/s"
+             if result["seconds"] else "too fast to measure")
+    step = (result.get("latency") or {}).get("step")
+    profile = (f", step p50 {step['p50'] * 1e3:.3f} ms, p99 {step['p99'] * 1e3:.3f} ms,"
+               f" max {step['max'] * 1e3:.3f} ms" if step else "")
+    return (f"{label}: {result['generations_run']} generations of {result['height']}x{result['width']}"
+            f" ({result['backend']}, {result['rule']}) in {result['seconds']:.3f} s -"
+            f" {rates}, population {result['population']}{cycle}{profile}")
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run Game of Life simulations without rendering.")
+    parser.add_argument('--manifest', help='JSON or JSON Lines file of jobs, with the fields below as keys.')
+    parser.add_argument('--processes', type=int, help='Worker processes for the jobs (default: CPU count).')
+    parser.add_argument('--results', help='Write the results of every job to this JSON Lines file.')
+    parser.add_argument('--size', type=int, nargs=2, metavar=('HEIGHT', 'WIDTH'), help='Grid dimensions.')
+    parser.add_argument('--seed', type=int, help='Seed of the random grid.')
+    parser.add_argument('--density', type=float, default=JOB_DEFAULTS["density"],
+                        help='Probability of a cell being alive in the random grid.')
+    parser.add_argument('--pattern', help='Grid file (.txt, .rle or snapshot), centred in the grid if --size is given.')
+    parser.add_argument('--rule', help='Rule in B/S notation or by name, e.g. B36/S23 or highlife.')
+    parser.add_argument('--generations', type=int, default=JOB_DEFAULTS["generations"],
+                        help='Number of generations to compute.')
+    parser.add_argument('--backend', default=JOB_DEFAULTS["backend"], choices=sorted(BACKENDS),
+                        help='Stepping kernel.')
+    parser.add_argument('--workers', type=int, help='Processes of the "parallel" backend.')
+    parser.add_argument('-nw', '--no-wrapping', action='store_true', help='Run without wrapping edges.')
+    parser.add_argument('--output', help='Save the final grid to this file (.txt, or .gols for a snapshot).')
+    parser.add_argument('--stats', help='Write per-generation statistics to this .npz or .csv file.')
+    parser.add_argument('--stop-on-cycle', action='store_true',
+                        help='Stop at the first still life or oscillator found.')
+    parser.add_argument('--cycle-history', type=int, default=JOB_DEFAULTS["cycle_history"],
+                        help='Longest oscillator period detected.')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time every generation and report the step latency percentiles.')
+    parser.add_argument('--profile-output', help='Save the latency histograms to this JSON file.')
+    parser.add_argument('--profile-live', type=float, metavar='SECONDS',
+                        help='Print the latency histograms to stderr every SECONDS while running.')
+    parser.add_argument('--checkpoint-dir', help='Directory of the periodic checkpoints.')
+    parser.add_argument('--checkpoint-every', type=int, metavar='GENERATIONS',
+                        help='Save a checkpoint every GENERATIONS generations.')
+    parser.add_argument('--checkpoint-seconds', type=float, metavar='SECONDS',
+                        help='Save a checkpoint every SECONDS seconds.')
+    parser.add_argument('--checkpoint-keep', type=int, default=JOB_DEFAULTS["checkpoint_keep"],
+                        help='Number of checkpoints kept.')
+    parser.add_argument('--resume', action='store_true',
+                        help='Start from the latest checkpoint of --checkpoint-dir, if any.')
+    parser.add_argument('--record', help='Record the generations to this frame log (.golf).')
+    parser.add_argument('--record-every', type=int, default=JOB_DEFAULTS["record_every"],
+                        help='Generations between two recorded frames.')
+    parser.add_argument('--rewind', type=int, nargs='+', metavar='GENERATION',
+                        help='Keep a history of the run and save these generations as snapshots'
+                             ' (negative ones count back from the last one).')
+    parser.add_argument('--rewind-dir', default=JOB_DEFAULTS["rewind_dir"],
+                        help='Directory of the --rewind snapshots.')
+    parser.add_argument('--history', type=float, default=JOB_DEFAULTS["history"], metavar='MEGABYTES',
+                        help='Memory of the --rewind history; older generations are evicted.')
+    parser.add_argument('--keyframe-interval', type=int, default=JOB_DEFAULTS["keyframe_interval"],
+                        help='Generations between two full copies in the --rewind history (default: 32).')
+    parser.add_argument('--log-dir', default=LOG_DIR, help='Directory of the log file.')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point; returns 1 if any job failed.
+    """
+    args = parse_arguments(argv)
+    setup_logging(args.log_dir)
+    try:
+        if args.manifest:
+            jobs = load_manifest(args.manifest)
+        else:
+            (height, width) = args.size if args.size else (None, None)
+            jobs = [make_job(height=height, width=width, seed=args.seed, density=args.density,
+                             pattern=args.pattern, rule=args.rule, generations=args.generations,
+                             backend=args.backend, workers=args.workers,
+                             no_wrapping=args.no_wrapping, output=args.output,
+                             stop_on_cycle=args.stop_on_cycle, cycle_history=args.cycle_history,
+                             stats_output=args.stats, profile=args.profile,
+                             profile_output=args.profile_output, profile_live=args.profile_live,
+                             checkpoint_dir=args.checkpoint_dir, checkpoint_every=args.checkpoint_every,
+                             checkpoint_seconds=args.checkpoint_seconds, checkpoint_keep=args.checkpoint_keep,
+                             resume=args.resume, record=args.record, record_every=args.record_every,
+                             rewind=args.rewind, rewind_dir=args.rewind_dir, history=args.history,
+                             keyframe_interval=args.keyframe_interval)]
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    failed = False
+    results_file = open(args.results, 'w') if args.results else None
+    try:
+        for result in run_jobs(jobs, args.processes):
+            failed = failed or "error" in result
+            print(format_result(result), flush=True)
+            if results_file:
+                results_file.write(json.dumps(result) + "\n")
+    finally:
+        if results_file:
+            results_file.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Periodic checkpoints of long runs: the current generation is copied into a snapshot
+buffer every N generations or T seconds, and written as a snapshot file by a
+background thread while stepping goes on, so a crashed run resumes from its last
+checkpoint instead of starting over.
+
+Checkpoints are regular snapshot files (see GameOfLife.snapshot) named
+``<prefix>-<generation>.gols``; their header holds the rule, generation number and
+edge mode, plus the state of the game's random generator and any fields given by the
+caller. Only the last ``keep`` checkpoints are kept.
+"""
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from GameOfLife import logger
+from GameOfLife.bitgrid import BitGrid
+from GameOfLife.rules import CONWAY, Rule
+from GameOfLife.snapshot import SNAPSHOT_EXTENSION, save_snapshot
+from GameOfLife.sparse import SparseGrid
+
+CHECKPOINT_PREFIX = "checkpoint"
+# Time-based checkpoints are checked this many times per interval, at the measured step rate.
+CHECKS_PER_INTERVAL = 10
+
+
+def list_checkpoints(directory: Union[str, Path], prefix: str = CHECKPOINT_PREFIX) -> list:
+    """
+    Returns the checkpoint files of a directory, oldest generation first.
+    """
+    pattern = re.compile(rf"^{re.escape(prefix)}-(\d+){re.escape(SNAPSHOT_EXTENSION)}$")
+    found = []
+    if Path(directory).is_dir():
+        for path in Path(directory).iterdir():
+            match = pattern.match(path.name)
+            if match:
+                found.append((int(match.group(1)), path))
+    return [path for (_, path) in sorted(found)]
+
+
+def latest_checkpoint(directory: Union[str, Path], prefix: str = CHECKPOINT_PREFIX) -> Optional[Path]:
+    """
+    Returns the checkpoint of the latest generation in a directory, or None.
+    """
+    checkpoints = list_checkpoints(directory, prefix)
+    return checkpoints[-1] if checkpoints else None
+
+
+class Checkpointer:
+    """
+    Saves checkpoints of a run on a background thread.
+
+    ``update`` is called by the stepping loop after each batch of generations: when a
+    checkpoint is due, the grid is copied into the snapshot buffer and handed to the
+    writer thread, which packs and writes it. The copy is the only cost to the loop; if
+    the previous checkpoint is still being written, the new one is skipped rather than
+    waited for, and counted in ``skipped``.
+
+    Files are written under a temporary name and renamed, so a crash while writing
+    never leaves a truncated checkpoint behind.
+
+    Attributes
+    ----------
+    directory : Path
+        Directory of the checkpoint files, created if needed.
+    every_generations : int or None
+        Generations between two checkpoints.
+    every_seconds : float or None
+        Seconds between two checkpoints.
+    keep : int
+        Number of checkpoints kept; older ones are deleted.
+    prefix : str
+        File name prefix of the checkpoints.
+    metadata : dict
+        Extra header fields saved with every checkpoint.
+    saved, skipped : int
+        Checkpoints written, and skipped because the writer was busy.
+    last_saved : int or None
+        Generation of the last checkpoint handed to the writer since start, if any.
+    error : Exception or None
+        Exception raised by the writer thread, if any; raised again by close.
+    """
+
+    def __init__(self, directory: Union[str, Path], every_generations: Optional[int] = None,
+                 every_seconds: Optional[float] = None, keep: int = 3, prefix: str = CHECKPOINT_PREFIX,
+                 metadata: Optional[dict] = None) -> None:
+        if not every_generations and not every_seconds:
+            logger.error("Checkpoints need an interval in generations or seconds.")
+            raise ValueError("every_generations or every_seconds must be set.")
+        if keep < 1:
+            raise ValueError("keep must be at least 1.")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.every_generations = every_generations
+        self.every_seconds = every_seconds
+        self.keep = keep
+        self.prefix = prefix
+        self.metadata = dict(metadata or {})
+        self.saved = 0
+        self.skipped = 0
+        self.last_saved = None
+        self.error = None
+        self._condition = threading.Condition()
+        self._pending = None
+        self._closed = False
+        self._buffer = None
+        self._writer = None
+        self._last_generation = None
+        self._last_time = None
+        self._rate = None
+
+    def start(self, generation: int) -> None:
+        """
+        Starts the writer thread and the intervals, from the initial generation of a run.
+        """
+        (self._last_generation, self._last_time) = (generation, time.perf_counter())
+        self.last_saved = None
+        self._closed = False
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="GameOfLifeCheckpointer", daemon=True)
+            self._writer.start()
+
+    def generations_until_check(self, generation: int) -> int:
+        """
+        Returns how many generations the loop can advance before calling update again:
+        up to the next multiple of ``every_generations``, and for time-based
+        checkpoints about a tenth of ``every_seconds`` at the step rate measured so far.
+        """
+        counts = []
+        if self.every_generations:
+            counts.append(self.every_generations - generation % self.every_generations)
+        if self.every_seconds:
+            counts.append(max(1, int(self._rate * self.every_seconds / CHECKS_PER_INTERVAL)) if self._rate else 1)
+        return min(counts)
+
+    def update(self, generation: int, grid: Union[np.ndarray, BitGrid, SparseGrid], rule: Rule = CONWAY,
+               no_wrapping: bool = False, **metadata) -> bool:
+        """
+        Hands a checkpoint of ``grid`` to the writer if one is due.
+
+        Parameters
+        ----------
+        generation : int
+            Generation number of ``grid``.
+        grid : np.ndarray, BitGrid or SparseGrid
+            Current grid, copied if a checkpoint is due.
+        rule : Rule
+            Rule the grid is evolving under.
+        no_wrapping : bool
+            Edge mode the grid is evolving under.
+        **metadata
+            Extra header fields of this checkpoint.
+
+        Returns
+        -------
+        bool
+            True if a checkpoint was handed to the writer.
+        """
+        now = time.perf_counter()
+        if generation > self._last_generation and now > self._last_time:
+            self._rate = (generation - self._last_generation) / (now - self._last_time)
+        due = (self.every_generations and generation % self.every_generations == 0
+               or self.every_seconds and now - self._last_time >= self.every_seconds)
+        if not due:
+            return False
+        (self._last_generation, self._last_time) = (generation, now)
+        return self.save(generation, grid, rule, no_wrapping, **metadata)
+
+    def save(self, generation: int, grid: Union[np.ndarray, BitGrid, SparseGrid], rule: Rule = CONWAY,
+             no_wrapping: bool = False, wait: bool = False, **metadata) -> bool:
+        """
+        Hands a checkpoint to the writer now, or skips it if the writer is busy unless
+        ``wait`` is True. Returns True if the checkpoint was handed over.
+        """
+        with self._condition:
+            while wait and self._pending is not None and self.error is None:
+                self._condition.wait()
+            if self._pending is not None:
+                self.skipped += 1
+                logger.info(f"Checkpoint of generation {generation} skipped: the previous one is being written.")
+                return False
+            header = dict(self.metadata, **metadata)
+            self._pending = (generation, self._copy(grid), rule, no_wrapping, header)
+            self.last_saved = generation
+            self._condition.notify_all()
+        return True
+
+    def _copy(self, grid):
+        # The buffer is free: the writer is done with it when nothing is pending.
+        if isinstance(grid, SparseGrid):
+            return grid.to_array(dtype=np.uint8)
+        source = grid.words if isinstance(grid, BitGrid) else grid
+        if self._buffer is None or self._buffer.shape != source.shape or self._buffer.dtype != source.dtype:
+            self._buffer = np.empty_like(source)
+        np.copyto(self._buffer, source)
+        return BitGrid(self._buffer, grid.shape) if isinstance(grid, BitGrid) else self._buffer
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                (generation, grid, rule, no_wrapping, header) = self._pending
+            try:
+                self._write(generation, grid, rule, no_wrapping, header)
+            except Exception as e:
+                logger.error(f"Failed to write checkpoint of generation {generation}: {e}")
+                self.error = e
+            with self._condition:
+                self._pending = None
+                self._condition.notify_all()
+
+    def _write(self, generation: int, grid, rule: Rule, no_wrapping: bool, header: dict) -> None:
+        path = self.directory / f"{self.prefix}-{generation:012d}{SNAPSHOT_EXTENSION}"
+        temporary = path.with_name(path.name + ".tmp")
+        save_snapshot(temporary, grid, rule, generation, no_wrapping, **header)
+        os.replace(temporary, path)
+        self.saved += 1
+        for old in list_checkpoints(self.directory, self.prefix)[:-self.keep]:
+            old.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """
+        Waits for the pending checkpoint to be written and stops the writer thread.
+
+        Raises
+        ------
+        Exception
+            The error of the writer thread, if a checkpoint failed.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,93 @@
+"""
+Detection of still lifes and oscillators: generations are hashed in their bit-packed
+form, and a generation whose hash was seen recently closes a cycle.
+"""
+import hashlib
+from collections import deque
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+from GameOfLife.bitgrid import BitGrid
+from GameOfLife.sparse import SparseGrid
+
+
+class Cycle(NamedTuple):
+    """
+    Cycle found by a CycleDetector: the grid of generation ``start + period`` is the
+    grid of generation ``start``, and so on from there. Still lifes have period 1.
+    """
+    start: int
+    period: int
+
+
+def grid_digest(grid: Union[np.ndarray, BitGrid, SparseGrid]) -> bytes:
+    """
+    Returns a 128-bit hash of a grid, computed on its bit-packed form (its words for a
+    BitGrid, its cell coordinates for a SparseGrid).
+    """
+    if isinstance(grid, BitGrid):
+        data = np.ascontiguousarray(grid.words)
+    elif isinstance(grid, SparseGrid):
+        data = np.ascontiguousarray(grid.cells)
+    else:
+        data = np.packbits(grid, axis=None)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class CycleDetector:
+    """
+    Keeps the hashes of the last ``history`` generations in a ring buffer and reports
+    the first generation repeating one of them.
+
+    Cycles are found one period after they start, for periods up to ``history``;
+    longer cycles go unnoticed. Memory is 16 bytes per generation kept, whatever the
+    grid size.
+
+    Attributes
+    ----------
+    history : int
+        Number of generations kept.
+    cycle : Cycle or None
+        Cycle found, if any.
+    """
+
+    def __init__(self, history: int = 256) -> None:
+        if history < 1:
+            raise ValueError("history must be at least 1.")
+        self.history = history
+        self.reset()
+
+    def reset(self) -> None:
+        self.cycle = None
+        self._digests = deque(maxlen=self.history)
+        self._generations = {}
+
+    def update(self, generation: int, grid: Union[np.ndarray, BitGrid, SparseGrid]) -> Optional[Cycle]:
+        """
+        Records a generation, which must follow the previous one recorded.
+
+        Parameters
+        ----------
+        generation : int
+            Generation number of ``grid``.
+        grid : np.ndarray, BitGrid or SparseGrid
+            Grid of that generation.
+
+        Returns
+        -------
+        Cycle or None
+            The cycle closed by this generation, or the one found before.
+        """
+        if self.cycle is not None:
+            return self.cycle
+        digest = grid_digest(grid)
+        seen = self._generations.get(digest)
+        if seen is not None:
+            self.cycle = Cycle(seen, generation - seen)
+            return self.cycle
+        # No hash repeats before a cycle is found, so each one maps to a single generation.
+        if len(self._digests) == self.history:
+            del self._generations[self._digests[0]]
+        self._digests.append(digest)
+        self._generations[digest] = generation
+        return None
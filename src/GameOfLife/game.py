@@ -1,8 +1,188 @@
-from pathlib import Path
-from typing import Optional
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Sequence, Tuple
 import numpy as np
 import re
 from GameOfLife import logger
+from GameOfLife.kernels import DoubleBuffer, step_numpy, step_reference
+from GameOfLife.rules import CONWAY, Rule
+
+# The other engines, and the run instrumentation, are imported where they are used, so
+# that importing the game only costs numpy and the serial kernels.
+if TYPE_CHECKING:
+    from GameOfLife.checkpoint import Checkpointer
+    from GameOfLife.cycles import CycleDetector
+    from GameOfLife.profiling import Profiler
+
+
+_UNTIMED = nullcontext()
+
+
+def _untimed(name: str) -> nullcontext:
+    """
+    Stands for Profiler.phase when a run is not profiled.
+    """
+    return _UNTIMED
+
+
+def _step_bitpacked(grid, no_wrapping: bool = False, **kwargs):
+    """
+    Imports the "bitpacked" kernel on first use.
+    """
+    from GameOfLife.bitgrid import step_bitpacked
+    return step_bitpacked(grid, no_wrapping, **kwargs)
+
+
+def _step_sparse(grid, no_wrapping: bool = False, **kwargs):
+    """
+    Imports the "sparse" kernel on first use.
+    """
+    from GameOfLife.sparse import step_sparse
+    return step_sparse(grid, no_wrapping, **kwargs)
+
+
+def _step_parallel(grid: np.ndarray, no_wrapping: bool = False, **kwargs) -> np.ndarray:
+    """
+    Imports the "parallel" kernel on first use: multiprocessing and shared memory cost
+    more to import than the rest of the package.
+    """
+    from GameOfLife.parallel import step_parallel
+    return step_parallel(grid, no_wrapping, **kwargs)
+
+
+# Stepping kernels selectable through the ``backend`` argument of Game.
+BACKENDS = {
+    "numpy": step_numpy,
+    "reference": step_reference,
+    "bitpacked": _step_bitpacked,
+    "sparse": _step_sparse,
+    "parallel": _step_parallel,
+    # A single isolated step has no dirty tiles to go by; skipping only happens in Game.run.
+    "active": step_numpy,
+}
+
+# Characters decoded at a time by the RLE parser.
+RLE_CHUNK_SIZE = 1 << 20
+
+def _decode_rle_runs(text: str, row: int, col: int, width: int, height: int, file_path) -> tuple:
+    """
+    Decodes a piece of RLE body, without whitespace and ending with a tag, with array
+    operations instead of a loop over the characters.
+
+    Parameters
+    ----------
+    text : str
+        RLE body, e.g. "2bo$3o".
+    row, col : int
+        Position of the first run of ``text`` in the pattern.
+    width, height : int
+        Pattern dimensions declared in the header.
+    file_path : Path
+        File being decoded, for error messages.
+
+    Returns
+    -------
+    tuple
+        (starts, lengths, row, col): (row, column) starts and lengths of the alive runs,
+        and the position following the last run.
+
+    Raises
+    ------
+    ValueError
+        For invalid characters, or runs outside the declared dimensions.
+    """
+    chars = np.frombuffer(text.encode('ascii', errors='replace'), dtype=np.uint8)
+    is_digit = (chars >= ord('0')) & (chars <= ord('9'))
+    tag_positions = np.flatnonzero(~is_digit)
+    tags = chars[tag_positions]
+    letters = ((tags >= ord('a')) & (tags <= ord('z'))) | ((tags >= ord('A')) & (tags <= ord('Z')))
+    is_row = tags == ord('$')
+    invalid = ~(letters | is_row | (tags == ord('.')))
+    if invalid.any():
+        position = tag_positions[np.argmax(invalid)]
+        logger.error(f"Invalid character '{text[position]}' in {file_path}.")
+        raise ValueError(f"Invalid character '{text[position]}' in RLE file: {file_path}")
+
+    # Run counts: each digit weighs 10^(distance to its tag - 1); no digit means 1.
+    digit_positions = np.flatnonzero(is_digit)
+    owner = np.searchsorted(tag_positions, digit_positions)
+    weights = 10 ** (tag_positions[owner] - 1 - digit_positions).astype(np.int64)
+    counts = np.bincount(owner, weights=(chars[digit_positions] - ord('0')) * weights,
+                         minlength=len(tags)).astype(np.int64)
+    counts[np.diff(tag_positions, prepend=-1) == 1] = 1
+
+    # Rows advance on '$' runs; columns restart from 0 after each of them.
+    row_steps = np.where(is_row, counts, 0)
+    rows = row + np.cumsum(row_steps) - row_steps
+    cell_steps = np.where(is_row, 0, counts)
+    ends = np.cumsum(cell_steps)
+    # Runs before the first '$' continue the line of the previous piece, from ``col``.
+    line_starts = np.maximum.accumulate(np.where(is_row, ends, -col))
+    cols = ends - cell_steps - line_starts
+
+    alive = letters & (tags != ord('b')) & (tags != ord('B'))
+    if alive.any() and ((cols + cell_steps)[alive].max() > width or rows[alive].max() >= height):
+        logger.error(f"Pattern exceeds the {width}x{height} size declared in {file_path}.")
+        raise ValueError(f"Pattern exceeds the size declared in the RLE header: {file_path}")
+
+    if len(tags):
+        (row, col) = (int(rows[-1] + row_steps[-1]), int(cols[-1] + cell_steps[-1]))
+    starts = np.stack([rows[alive], cols[alive]], axis=1)
+    return (starts, cell_steps[alive], row, col)
+
+
+def _native_kernel(backend: str) -> Tuple[Callable, Callable]:
+    """
+    Returns the kernel of a backend and the conversion to the native grid type it steps
+    without conversion, importing its engine.
+    """
+    if backend == "bitpacked":
+        from GameOfLife.bitgrid import BitGrid, step_bitpacked
+        return (step_bitpacked, BitGrid.from_array)
+    if backend == "sparse":
+        from GameOfLife.sparse import SparseGrid, step_sparse
+        return (step_sparse, SparseGrid.from_array)
+    return (BACKENDS[backend], np.asarray)
+
+
+class _KernelStepper:
+    """
+    Adapts a BACKENDS kernel to the load / advance / grid interface of DoubleBuffer.
+    """
+
+    def __init__(self, step: Callable, to_native: Callable = np.asarray, **kwargs) -> None:
+        self._step = step
+        self._to_native = to_native
+        self._kwargs = kwargs
+        self._state = None
+        self._previous = None
+
+    @property
+    def grid(self) -> np.ndarray:
+        return np.asarray(self._state)
+
+    @property
+    def native(self):
+        """
+        Current generation in the backend's native grid type, without conversion.
+        """
+        return self._state
+
+    @property
+    def previous(self):
+        """
+        Generation before the current one, in the native grid type; kernels return new
+        grids, so keeping it costs no copy.
+        """
+        return self._previous
+
+    def load(self, grid: np.ndarray) -> None:
+        self._state = self._to_native(grid)
+        self._previous = None
+
+    def advance(self, generations: int = 1, no_wrapping: bool = False) -> None:
+        for _ in range(generations):
+            self._previous = self._state
+            self._state = self._step(self._state, no_wrapping, **self._kwargs)
 
 class Game:
     """
@@ -16,16 +196,39 @@ class Game:
     random_grid : bool
         True to generate a random grid; False to load from file or initialize dead grid.
     starting_grid_filepath : str, optional
-        Path to a grid file to load (.txt format with 0s and 1s or .rle format).
+        Path to a grid file to load (.txt format with 0s and 1s, .rle format or a binary
+        snapshot, see GameOfLife.snapshot).
     random_seed : int, optional
         Seed for random number generator for reproducible random grids.
+    rng : np.random.Generator
+        Random number generator of the game, seeded with ``random_seed``.
     alive_probability : float
         Probability of a cell being alive at start (for random grids).
+    backend : str
+        Name of the stepping kernel used by update_grid_state (a key of BACKENDS).
+        Defaults to the vectorized "numpy" kernel; "reference" is the cell-by-cell loop,
+        "bitpacked" the SWAR kernel of GameOfLife.bitgrid, "sparse" the live-cell
+        engine of GameOfLife.sparse, "parallel" the multi-core tiled kernel of
+        GameOfLife.parallel and "active" the incremental stepper of GameOfLife.active,
+        which skips tiles that cannot change in Game.run.
+    workers : int, optional
+        Number of processes used by the "parallel" backend. Defaults to the CPU count.
+    rule : Rule
+        Birth and survival rule, given to the constructor in B/S notation (e.g. "B36/S23")
+        or by name (e.g. "highlife"). Defaults to the rule declared in an RLE or snapshot
+        grid file, or to Conway's B3/S23.
+    generation : int
+        Generation number of the initial grid: 0, or the one saved in a snapshot file.
+    active_stats : dict or None
+        Tiles skipped by the last call to run with the "active" backend: the
+        ``tiles_computed`` and ``tiles_skipped`` over the run, their
+        ``skipped_fraction`` and the tile counts of its ``last_generation`` (see
+        ActiveStepper.stats). None before such a run, or after a run with another backend.
 
     Raises
     ------
     ValueError
-        For invalid grid dimensions or missing necessary initialization parameters.
+        For invalid grid dimensions, unknown backend or rule, or missing necessary initialization parameters.
     """
 
     def __init__(
@@ -36,6 +239,9 @@ class Game:
         starting_grid_filepath: Optional[str] = None,
         random_seed: Optional[int] = None,
         alive_probability: float = 0.5,
+        backend: str = "numpy",
+        workers: Optional[int] = None,
+        rule: Optional[str] = None,
     ) -> None:
         if not (grid_height and grid_width) and not starting_grid_filepath:
             logger.error("Either grid dimensions or a file path must be specified.")
@@ -45,111 +251,198 @@ class Game:
             logger.error("Grid dimensions must be positive integers.")
             raise ValueError("Invalid grid dimensions provided.")
 
+        if backend not in BACKENDS:
+            logger.error(f"Unknown backend '{backend}'.")
+            raise ValueError(f"Unknown backend '{backend}', expected one of {sorted(BACKENDS)}.")
+
         self.grid_size = (grid_height, grid_width) if grid_height and grid_width else None
         self.random_grid = random_grid and not starting_grid_filepath
         self.starting_grid_filepath = starting_grid_filepath
-        if random_seed is not None:
-            np.random.seed(random_seed)
+        # A generator per game rather than the global numpy state, so that games can
+        # draw random grids concurrently.
+        self.rng = np.random.default_rng(random_seed)
         self.alive_probability = alive_probability
+        self.backend = backend
+        self.workers = workers
+        try:
+            self.rule = Rule.from_string(rule) if rule else CONWAY
+        except ValueError:
+            logger.error(f"Invalid rule '{rule}'.")
+            raise
+        # A rule given explicitly takes precedence over the one declared in a file.
+        self._rule_from_file = rule is None
+        self.generation = 0
+        self.active_stats = None
         logger.info("Game initialized.")
 
     def _parse_grid_from_txt(self) -> np.ndarray:
         """
         Reads grid configuration from a file and constructs a grid.
 
+        The file is read as bytes and its rows converted and validated as one array,
+        so that only the row splitting is done per line and never per character.
+
         Returns
         -------
         np.ndarray
-            Numpy array representing the initial grid state.
+            uint8 array representing the initial grid state.
 
         Raises
         ------
         ValueError
-            If the file contains invalid characters (not 0 or 1).
+            If the file contains invalid characters (not 0 or 1) or rows of different lengths.
         """
+        from pathlib import Path
         file_path = Path(self.starting_grid_filepath)
         try:
-            with file_path.open('r') as file:
-                grid_lines = [line.strip() for line in file if line.strip()]
+            data = file_path.read_bytes()
         except Exception as e:
             logger.error(f"Failed to read grid file: {e}")
             raise ValueError(f"Error reading grid file: {file_path}") from e
 
-        grid = []
-        for line_no, line in enumerate(grid_lines, start=1):
-            row = []
-            for char_no, char in enumerate(line, start=1):
-                if char not in "01":
-                    logger.error(f"Invalid character '{char}' at line {line_no}, column {char_no}.")
-                    raise ValueError(f"Invalid character '{char}' at line {line_no}, column {char_no}.")
-                row.append(int(char))
-            grid.append(row)
-
-        return np.array(grid, dtype=int)
-    
-    def _parse_grid_from_rle(self, vertical_spacing = 4, horizontal_spacing = 4) -> np.ndarray:
+        # Line numbers and indents of the non-blank lines, to locate errors in the file.
+        (line_numbers, indents, rows) = ([], [], [])
+        for (line_no, line) in enumerate(data.split(b'\n'), start=1):
+            row = line.strip()
+            if row:
+                line_numbers.append(line_no)
+                indents.append(len(line) - len(line.lstrip()))
+                rows.append(row)
+        if not rows:
+            return np.zeros((0, 0), dtype=np.uint8)
+
+        width = len(rows[0])
+        for (line_no, row) in zip(line_numbers, rows):
+            if len(row) != width:
+                logger.error(f"Line {line_no} has {len(row)} cells, expected {width}.")
+                raise ValueError(f"Line {line_no} has {len(row)} cells, expected {width}: {file_path}")
+
+        # Characters below '0' wrap around, so any byte other than '0' or '1' ends up above 1.
+        grid = (np.frombuffer(b''.join(rows), dtype=np.uint8) - np.uint8(ord('0'))).reshape(len(rows), width)
+        invalid = grid > 1
+        if invalid.any():
+            (row_index, col_index) = np.unravel_index(np.argmax(invalid), grid.shape)
+            char = chr(rows[row_index][col_index]) if rows[row_index][col_index] < 128 else '?'
+            (line_no, char_no) = (line_numbers[row_index], indents[row_index] + col_index + 1)
+            logger.error(f"Invalid character '{char}' at line {line_no}, column {char_no}.")
+            raise ValueError(f"Invalid character '{char}' at line {line_no}, column {char_no}.")
+        return grid
+
+    def _parse_rle_header(self, size_line: str) -> dict:
+        """
+        Parses the "x = m, y = n, rule = abc" header line of an RLE file, and adopts
+        the declared rule unless one was given to the constructor.
+
+        Returns
+        -------
+        dict
+            Header fields, with the x and y dimensions as ints.
+        """
+        header = {}
+        for field in size_line.split(','):
+            (key, _, value) = field.partition('=')
+            header[key.strip().lower()] = value.strip()
+        try:
+            header["x"] = int(re.findall(r'[0-9]+', header["x"])[0])
+            header["y"] = int(re.findall(r'[0-9]+', header["y"])[0])
+        except (KeyError, IndexError) as e:
+            logger.error(f"Invalid RLE header: {size_line}")
+            raise ValueError(f"Invalid RLE header: {size_line}") from e
+        if header.get("rule") and self._rule_from_file:
+            self.rule = Rule.from_string(header["rule"])
+        return header
+
+    def _parse_grid_from_rle(self, vertical_spacing: int = 4, horizontal_spacing: int = 4,
+                             chunk_size: int = RLE_CHUNK_SIZE) -> np.ndarray:
+        """
+        Reads an RLE pattern file and constructs a grid, with dead margins around the pattern.
+
+        The file is decoded in chunks of ``chunk_size`` characters, runs being written
+        directly into a uint8 array preallocated from the header dimensions, so that
+        loading time and memory are linear in the file and grid sizes.
+
+        Parameters
+        ----------
+        vertical_spacing, horizontal_spacing : int
+            Number of dead rows / columns added on each side of the pattern.
+        chunk_size : int
+            Number of characters decoded at a time.
+
+        Returns
+        -------
+        np.ndarray
+            uint8 array representing the initial grid state.
+
+        Raises
+        ------
+        ValueError
+            If the file cannot be read, its header is invalid or the pattern does not
+            fit the declared dimensions.
+        """
+        from pathlib import Path
         file_path = Path(self.starting_grid_filepath)
         try:
-            with file_path.open('r') as file:
-                grid_lines = [line.strip() for line in file if line.strip()]
+            file = file_path.open('r')
         except Exception as e:
             logger.error(f"Failed to read grid file: {e}")
             raise ValueError(f"Error reading grid file: {file_path}") from e
-        
-        starting_idx = 0
-        while grid_lines[starting_idx][0] == '#':
-            starting_idx += 1
-
-        size_line = grid_lines[starting_idx]
-        pattern_line = ""
-        for line in grid_lines[starting_idx + 1:]:
-            pattern_line += line
-        width_str, height_str, _ = size_line.split(',')
-        width = int(re.findall(r'[-+]?[0-9]*\.?[0-9]+', width_str)[0])
-        patterns = pattern_line.split('$')
-        total_width = width + 2*horizontal_spacing
-
-        grid = []
-        for _ in range(vertical_spacing):
-            grid.append([0] * total_width)
-        
-        for pattern in patterns:
-            row = [0] * horizontal_spacing
-            nums = "0123456789"
-            cells = "ob"
-            running_num = ""
-            for char in pattern:
-                if char in nums:
-                    running_num += char
-                elif char in cells and running_num != "":
-                    if char == "o":
-                        for _ in range(int(running_num)):
-                            row.append(1)
-                    elif char == "b":
-                        for _ in range(int(running_num)):
-                            row.append(0)
-                    running_num = ""
-                else:
-                    if char == "o":
-                        row.append(1)
-                    elif char == 'b':
-                        row.append(0)
-            for _ in range(horizontal_spacing):
-                row.append(0)
-            if len(row) < total_width:
-                for _ in range(total_width - len(row)):
-                    row.append(0)
-            grid.append(row)
-
-        for _ in range(vertical_spacing):
-            grid.append([0] * total_width)
-
-        return np.array(grid, dtype=int)
+
+        with file:
+            size_line = file.readline()
+            while size_line and (not size_line.strip() or size_line.lstrip().startswith('#')):
+                size_line = file.readline()
+            header = self._parse_rle_header(size_line)
+            (height, width) = (header["y"], header["x"])
+            grid = np.zeros((height + 2 * vertical_spacing, width + 2 * horizontal_spacing), dtype=np.uint8)
+
+            (row, col) = (0, 0)
+            pending = ""
+            finished = False
+            while not finished:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+                text = pending + "".join(chunk.split())
+                end = text.find('!')
+                if end >= 0:
+                    (text, finished) = (text[:end], True)
+                # A run count cut at the end of the chunk is completed by the next one.
+                cut = len(text.rstrip("0123456789"))
+                (text, pending) = (text[:cut], text[cut:])
+                (starts, lengths, row, col) = _decode_rle_runs(text, row, col, width, height, file_path)
+                # Offsets of every alive cell: each run expands to start, start + 1, ...
+                flat = (starts[:, 0] + vertical_spacing) * grid.shape[1] + starts[:, 1] + horizontal_spacing
+                first = np.cumsum(lengths) - lengths
+                cells = np.arange(lengths.sum()) + np.repeat(flat - first, lengths)
+                grid.ravel()[cells] = 1
+
+        return grid
+
+    def _parse_grid_from_snapshot(self) -> np.ndarray:
+        """
+        Reads a binary snapshot file, adopting its rule unless one was given to the
+        constructor, and its generation number.
+
+        Returns
+        -------
+        np.ndarray
+            uint8 array representing the initial grid state.
+        """
+        from GameOfLife.snapshot import load_snapshot
+        snapshot = load_snapshot(self.starting_grid_filepath)
+        if self._rule_from_file:
+            self.rule = snapshot.rule
+        self.generation = snapshot.generation
+        rng_state = snapshot.metadata.get("rng_state")
+        if rng_state and rng_state.get("bit_generator") == type(self.rng.bit_generator).__name__:
+            self.rng.bit_generator.state = rng_state
+        return snapshot.grid.to_array(dtype=np.uint8)
 
     @staticmethod
     def save_grid_to_file(grid: np.ndarray, path: str) -> None:
         """
-        Saves the grid state to a file.
+        Saves the grid state to a file, as a binary snapshot if the path ends with the
+        snapshot extension (.gols) and as text otherwise.
 
         Parameters
         ----------
@@ -158,8 +451,18 @@ class Game:
         path : str
             Destination file path.
         """
+        from GameOfLife.snapshot import SNAPSHOT_EXTENSION, save_snapshot
+        if str(path).endswith(SNAPSHOT_EXTENSION):
+            save_snapshot(path, grid)
+            return
+        # Each row is written as its digit bytes followed by a newline, in a single write.
+        cells = np.asarray(grid)
+        text = np.empty((cells.shape[0], cells.shape[1] + 1), dtype=np.uint8)
+        np.add(cells, ord('0'), out=text[:, :-1], casting='unsafe')
+        text[:, -1] = ord('\n')
         try:
-            np.savetxt(path, grid, fmt='%i', delimiter='')
+            with open(path, 'wb') as file:
+                file.write(text.data)
             logger.info(f"Grid successfully saved to {path}.")
         except Exception as e:
             logger.error(f"Failed to save grid to file: {e}")
@@ -180,6 +483,9 @@ class Game:
             If the initialization conditions are not met.
         """
         if self.starting_grid_filepath:
+            from GameOfLife.snapshot import SNAPSHOT_EXTENSION, is_snapshot
+            if self.starting_grid_filepath.endswith(SNAPSHOT_EXTENSION) or is_snapshot(self.starting_grid_filepath):
+                return self._parse_grid_from_snapshot()
             if self.starting_grid_filepath.split('.')[-1] == 'txt':
                 return self._parse_grid_from_txt()
             else:
@@ -187,7 +493,7 @@ class Game:
 
         if self.grid_size:
             if self.random_grid:
-                return np.random.choice([0, 1], size=self.grid_size, p=[1 - self.alive_probability, self.alive_probability])
+                return (self.rng.random(self.grid_size) < self.alive_probability).astype(int)
             else:
                 return np.zeros(self.grid_size, dtype=int)
 
@@ -196,55 +502,298 @@ class Game:
 
     def update_grid_state(self, grid: np.ndarray, no_wrapping: bool = False) -> np.ndarray:
         """
-        Creates the next grid from a given grid using the rules of the game:
+        Creates the next grid from a given grid using the rules of the game, by default:
         1. Any dead cell with exactly 3 living neighbors becomes a living cell.
         2. Any living cell with 2 or 3 living neighbors stays alive, otherwise it dies.
+        Other birth / survival counts can be set with the ``rule`` constructor argument.
 
         Parameters
         ----------
         grid: np.ndarray
             Numpy array containing 0s and 1s corresponding to dead cells and alive cells.
+            The "bitpacked" and "sparse" backends also accept their native BitGrid and
+            SparseGrid types, which avoids a conversion on every generation.
         no_wrapping: bool
             If True, no edge wrapping applied - edge cells have less than 8 neighbours
 
         Returns
         -------
         updated_grid: np.ndarray
-            Numpy array containing 0s and 1s corresponding to dead cells and alive cells, after update.
-        """
-        (grid_height, grid_width) = grid.shape
-        updated_grid = grid.copy()
-        
-        ## Combining the two following helper functions makes the code less readable
-        def _check_neighbours(i, j):
-            alive_neighbours_count = 0
-            for k in range(i-1, i+2):
-                    for l in range(j-1, j+2):
-                        if (k, l) != (i, j) and grid[(k % grid_height, l % grid_width)]:
-                            alive_neighbours_count += 1
-            return alive_neighbours_count
-
-        def _check_neighbours_no_wrapping(i, j):
-            alive_neighbours_count = 0
-            for k in range(max(0, i-1), min(i+2, grid_height)):
-                    for l in range(max(0, j-1), min(j+2, grid_width)):
-                        if (k, l) != (i, j) and grid[k, l]:
-                            alive_neighbours_count += 1
-            return alive_neighbours_count
-
-        def _apply_rules(updated_grid, i, j, alive_neighbours_count):
-            if not grid[i, j] and alive_neighbours_count == 3:
-                updated_grid[i, j] = 1
-            if grid[i, j] and alive_neighbours_count not in [2, 3]:
-                updated_grid[i, j] = 0
-
-        for i in range(grid_height):
-            for j in range(grid_width):
-                if no_wrapping:
-                    alive_neighbours_count = _check_neighbours_no_wrapping(i, j)
-                else:
-                    alive_neighbours_count = _check_neighbours(i, j)
-                _apply_rules(updated_grid, i, j, alive_neighbours_count)
-                
-        return updated_grid
+            Numpy array containing 0s and 1s corresponding to dead cells and alive cells, after update,
+            or the backend's native grid type if one was given.
+        """
+        return BACKENDS[self.backend](grid, no_wrapping, **self._backend_kwargs())
+
+    def _backend_kwargs(self) -> dict:
+        """
+        Returns the keyword arguments passed to the backend kernel besides the grid.
+        """
+        kwargs = {"rule": self.rule}
+        if self.backend == "parallel":
+            kwargs["workers"] = self.workers
+        return kwargs
+
+    def create_stepper(self, shape: tuple):
+        """
+        Creates a stateful stepper for the backend, holding a grid between generations.
+
+        Steppers expose ``load(grid)``, ``advance(generations, no_wrapping)`` and a
+        ``grid`` property with the current generation. Each call returns a new stepper,
+        owned by the caller; the ParallelStepper of the "parallel" backend holds worker
+        processes and shared memory until it is closed (see close_stepper).
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Dimensions of the grids to step.
+
+        Returns
+        -------
+        DoubleBuffer, ActiveStepper, ParallelStepper or a kernel adapter
+            Stepper for the backend.
+        """
+        if self.backend == "numpy":
+            return DoubleBuffer(shape, self.rule)
+        if self.backend == "active":
+            from GameOfLife.active import ActiveStepper
+            return ActiveStepper(shape, rule=self.rule)
+        if self.backend == "parallel":
+            from GameOfLife.parallel import ParallelStepper
+            return ParallelStepper(shape, self.workers, rule=self.rule)
+        return _KernelStepper(*_native_kernel(self.backend), **self._backend_kwargs())
+
+    @staticmethod
+    def close_stepper(stepper) -> None:
+        """
+        Releases the resources of a stepper from create_stepper, if it holds any.
+        """
+        close = getattr(stepper, "close", None)
+        if close is not None:
+            close()
+
+    def run(
+        self,
+        grid: np.ndarray,
+        generations: int,
+        no_wrapping: bool = False,
+        out: Optional[np.ndarray] = None,
+        callback: Optional[Callable[[int, np.ndarray], None]] = None,
+        callback_every: int = 1,
+        detector: Optional["CycleDetector"] = None,
+        on_stats: Optional[Callable[[int, dict], None]] = None,
+        metrics: Optional[Sequence[str]] = None,
+        profiler: Optional["Profiler"] = None,
+        checkpointer: Optional["Checkpointer"] = None,
+    ) -> np.ndarray:
+        """
+        Advances a grid by many generations in one call.
+
+        The "numpy", "active" and "parallel" backends ping-pong between two preallocated
+        buffers, so no grid is allocated per generation; the "bitpacked" and "sparse"
+        backends step their native grid type and only convert at the ends and for the
+        callback.
+
+        Parameters
+        ----------
+        grid: np.ndarray
+            Numpy array containing 0s and 1s corresponding to dead cells and alive cells.
+        generations: int
+            Number of generations to compute.
+        no_wrapping: bool
+            If True, no edge wrapping applied - edge cells have less than 8 neighbours
+        out: np.ndarray, optional
+            Array of the same shape receiving the final generation. A new array with the
+            dtype of ``grid`` is returned if None.
+        callback: callable, optional
+            Called as ``callback(generation, grid)`` every ``callback_every`` generations.
+            ``grid`` may be a view of an internal buffer, valid only during the call.
+        callback_every: int
+            Number of generations between two callback calls.
+        detector: CycleDetector, optional
+            Detector, reset then fed every generation, numbered from 0 for ``grid``; the run stops
+            early at the generation closing a cycle, found in ``detector.cycle``.
+        on_stats: callable, optional
+            Called as ``on_stats(generation, stats)`` for the initial grid and every
+            generation, ``stats`` holding the ``metrics`` computed by StatsCollector
+            from the two buffers of the stepper. Nothing is computed if None.
+        metrics: sequence of str, optional
+            Statistics passed to ``on_stats``, from GameOfLife.stats.METRICS (all of them
+            if None).
+        profiler: Profiler, optional
+            Profiler timing every generation as the "step" phase, and the "stats",
+            "cycles" and "callback" phases when used. Generations are then advanced one
+            at a time.
+        checkpointer: Checkpointer, optional
+            Saves checkpoints at its intervals while the run goes on, numbered from
+            ``self.generation`` for ``grid``, with the state returned by resume_state,
+            and a last one at the end of the run unless one was just saved. It is closed
+            when the run ends.
+
+        With the "active" backend, the tiles skipped during the run are then counted in
+        ``active_stats``.
 
+        Returns
+        -------
+        np.ndarray
+            The grid after ``generations`` generations (``out`` if given), or at the
+            end of the first cycle found by ``detector``.
+        """
+        if generations < 0 or callback_every <= 0:
+            logger.error("Invalid number of generations or callback interval.")
+            raise ValueError("generations must be non-negative and callback_every positive.")
+
+        stepper = self.create_stepper(grid.shape)
+        try:
+            stepper.load(grid)
+
+            def _state():
+                # Hashing the native grid avoids converting bit-packed or sparse ones.
+                return stepper.native if isinstance(stepper, _KernelStepper) else stepper.grid
+
+            if detector is not None:
+                detector.reset()
+                detector.update(0, _state())
+            collector = None
+            if on_stats is not None:
+                from GameOfLife.stats import METRICS, StatsCollector
+                collector = StatsCollector(METRICS if metrics is None else metrics)
+                on_stats(0, collector.start(_state()))
+            single = detector is not None or collector is not None or profiler is not None
+            phase = profiler.phase if profiler is not None else _untimed
+            if checkpointer is not None:
+                checkpointer.start(self.generation)
+            done = 0
+            try:
+                while done < generations:
+                    if single:
+                        chunk = 1
+                    else:
+                        # Up to the next callback, even after a chunk shortened by the checkpointer.
+                        chunk = generations - done
+                        if callback:
+                            chunk = min(chunk, callback_every - done % callback_every)
+                    if checkpointer is not None:
+                        chunk = min(chunk, checkpointer.generations_until_check(self.generation + done))
+                    with phase("step"):
+                        stepper.advance(chunk, no_wrapping)
+                    done += chunk
+                    if collector is not None:
+                        with phase("stats"):
+                            on_stats(done, collector.update(stepper.previous, _state()))
+                    if callback and done % callback_every == 0:
+                        with phase("callback"):
+                            callback(done, stepper.grid)
+                    if checkpointer is not None:
+                        with phase("checkpoint"):
+                            checkpointer.update(self.generation + done, _state(), self.rule, no_wrapping,
+                                                **self.resume_state())
+                    if detector is not None:
+                        with phase("cycles"):
+                            cycle = detector.update(done, _state())
+                        if cycle is not None:
+                            break
+                # Unless the last interval checkpoint was of the final generation.
+                if checkpointer is not None and checkpointer.last_saved != self.generation + done:
+                    checkpointer.save(self.generation + done, _state(), self.rule, no_wrapping, wait=True,
+                                      **self.resume_state())
+            finally:
+                if checkpointer is not None:
+                    checkpointer.close()
+
+            if out is None:
+                return stepper.grid.astype(grid.dtype)
+            out[...] = stepper.grid
+            return out
+        finally:
+            self.active_stats = self._active_stats(stepper)
+            self.close_stepper(stepper)
+
+    @staticmethod
+    def _active_stats(stepper) -> Optional[dict]:
+        """
+        Returns the tile counts of an ActiveStepper for active_stats, or None for the
+        steppers of the other backends.
+        """
+        if not hasattr(stepper, "tiles_skipped"):
+            return None
+        total = stepper.tiles_computed + stepper.tiles_skipped
+        return {
+            "tiles_computed": stepper.tiles_computed,
+            "tiles_skipped": stepper.tiles_skipped,
+            "skipped_fraction": stepper.tiles_skipped / total if total else 0.0,
+            "last_generation": dict(stepper.stats),
+        }
+
+    def run_stack(
+        self,
+        grids: Sequence[np.ndarray],
+        generations: int,
+        no_wrapping: Sequence[bool] = False,
+    ) -> Sequence[np.ndarray]:
+        """
+        Advances many small independent grids together under the rule of the game,
+        whatever the backend: see GameOfLife.stacked.step_stack.
+
+        Parameters
+        ----------
+        grids: np.ndarray or sequence of np.ndarray
+            A (count, height, width) array, or a sequence of grids of any sizes.
+        generations: int
+            Number of generations to compute.
+        no_wrapping: bool or sequence of bool
+            Edge mode of all the grids, or of each grid.
+
+        Returns
+        -------
+        np.ndarray or list of np.ndarray
+            The grids after ``generations`` generations, in the order of ``grids``.
+        """
+        from GameOfLife.stacked import step_stack
+        return step_stack(grids, generations, no_wrapping, self.rule)
+
+    def resume_state(self) -> dict:
+        """
+        Returns the state saved in checkpoints besides the grid, rule, generation and
+        edge mode: the backend and the state of the random generator, restored when
+        the checkpoint is loaded as the starting grid of a game.
+        """
+        return {"backend": self.backend, "rng_state": self.rng.bit_generator.state}
+
+    def iter_stats(
+        self,
+        grid: np.ndarray,
+        generations: int,
+        no_wrapping: bool = False,
+        metrics: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[int, dict]]:
+        """
+        Advances a grid generation by generation, yielding its statistics.
+
+        Parameters
+        ----------
+        grid: np.ndarray
+            Numpy array containing 0s and 1s corresponding to dead cells and alive cells.
+        generations: int
+            Number of generations to compute.
+        no_wrapping: bool
+            If True, no edge wrapping applied - edge cells have less than 8 neighbours
+        metrics: sequence of str
+            Statistics computed, from GameOfLife.stats.METRICS (all of them if None).
+
+        Yields
+        ------
+        tuple
+            (generation, stats) for the initial grid (generation 0) and each generation.
+        """
+        stepper = self.create_stepper(grid.shape)
+        try:
+            stepper.load(grid)
+            from GameOfLife.stats import METRICS, StatsCollector
+            collector = StatsCollector(METRICS if metrics is None else metrics)
+            native = isinstance(stepper, _KernelStepper)
+            yield (0, collector.start(stepper.native if native else stepper.grid))
+            for generation in range(1, generations + 1):
+                stepper.advance(1, no_wrapping)
+                yield (generation, collector.update(stepper.previous, stepper.native if native else stepper.grid))
+        finally:
+            self.close_stepper(stepper)
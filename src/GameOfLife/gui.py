@@ -8,6 +8,20 @@ from curses.textpad import Textbox, rectangle
 import numpy as np
 from GameOfLife import logger
 from GameOfLife.game import Game
+from GameOfLife.profiling import Profiler
+from GameOfLife.render import changed_runs, fit_zoom, glyph_text, glyphs, window_shape
+from GameOfLife.simulation import SimulationThread
+
+# Runs of changed characters separated by at most this many unchanged ones are redrawn
+# with a single write.
+RUN_MERGE_GAP = 4
+# Highest zoom level chosen for the first frame (braille); larger grids start in a viewport.
+MAX_INITIAL_ZOOM = 2
+# Frames drawn per second by run_game, whatever the simulation speed.
+FRAME_RATE = 30
+# Simulation speeds selectable with < and >, in generations per second (None: as fast as possible).
+SPEEDS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, None]
+DEFAULT_SPEED_INDEX = 3
 
 
 class TerminalGUI:
@@ -20,10 +34,23 @@ class TerminalGUI:
         The main window object provided by curses.
     no_wrapping: bool
         Determines if neighbour wrapping is applied during the game
+    detect_cycles: bool
+        If True, the game pauses once the grid settles into still lifes and oscillators
+    profiler : Profiler
+        Times the phases of each frame of run_game ("input", "render", "io", "sleep" and
+        the whole "frame" before sleeping) and of the simulation thread; disabled by default.
+    recorder : FrameRecorder or None
+        Recorder receiving every generation computed by run_game.
+    history : GenerationHistory or None
+        History of the generations computed by run_game, which b and B step back in.
     options : list of str
         List of options presented in the main menu.
     scr_height, scr_width : int
         Dimensions of the terminal screen.
+    zoom : int
+        Zoom level of the grid display (see GameOfLife.render).
+    viewport : tuple of int
+        Grid coordinates (row, column) of the top-left cell displayed.
     size_param_content, path_param_content : dict
         Dictionaries containing messages displayed during parameter selection.
 
@@ -35,7 +62,13 @@ class TerminalGUI:
         Displays an input box for parameters like grid size or file path, with an error message
         for wrong input.
     display_grid(grid)
-        Displays the current state of the game grid.
+        Displays the part of the game grid in the viewport, redrawing only the changed cells.
+    fit_view(grid_shape)
+        Chooses the initial zoom level and viewport for a grid.
+    handle_view_key(key, grid_shape)
+        Scrolls or zooms the viewport.
+    reset_display()
+        Makes the next display_grid call draw the whole grid.
     retry_size_input(size)
         Handles retrying input for grid size after format error.
     retry_path_input(path)
@@ -44,7 +77,8 @@ class TerminalGUI:
         Starts the game loop, updating and displaying the grid continuously.
     """
 
-    def __init__(self, stdscr, no_wrapping = False) -> None:
+    def __init__(self, stdscr, no_wrapping = False, detect_cycles = False, profiler = None, recorder = None,
+                 history = None) -> None:
         self.options = [
             "Generate a random grid",
             "Grid from a file",
@@ -52,6 +86,10 @@ class TerminalGUI:
         ]
         self.stdscr = stdscr
         self.no_wrapping = no_wrapping
+        self.detect_cycles = detect_cycles
+        self.profiler = profiler if profiler is not None else Profiler(enabled=False)
+        self.recorder = recorder
+        self.history = history
         self.scr_height, self.scr_width = self.stdscr.getmaxyx()
         exit_msg = "Press CTRL+C to exit"
         confirmation_msg = "ENTER to confirm"
@@ -67,6 +105,11 @@ class TerminalGUI:
             "confirmation": confirmation_msg,
             "error_msg": "File not found. Try again."
         }
+        # Last frame drawn by display_grid, compared with the next one.
+        self._frame = None
+        # Zoom level (None until the first frame) and top-left cell of the viewport.
+        self.zoom = None
+        self.viewport = (0, 0)
         self._ensure_window_size()
         curses.curs_set(0)
         # Selected menu option
@@ -200,27 +243,119 @@ class TerminalGUI:
             logger.info("User initiated exit during parameter selection.")
             exit(0)
 
-    def display_grid(self, grid: np.ndarray):
+    def _frame_area(self) -> Tuple[int, int]:
         """
-        Displays the current state of the game grid.
+        Returns the (rows, columns) of screen characters available for the grid, inside
+        its border and below the status line.
+        """
+        return (max(self.scr_height - 4, 1), max(self.scr_width - 5, 1))
+
+    def _clamp_viewport(self, grid_shape: Tuple[int, int]):
+        """
+        Keeps the viewport inside the grid for the current zoom level.
+        """
+        (height, width) = window_shape(self._frame_area(), self.zoom)
+        (top, left) = self.viewport
+        self.viewport = (max(0, min(top, grid_shape[0] - height)), max(0, min(left, grid_shape[1] - width)))
+
+    def fit_view(self, grid_shape: Tuple[int, int]):
+        """
+        Resets the viewport to the top-left corner, at the lowest zoom level showing the
+        whole grid, or at the braille level with a viewport for larger grids.
+        """
+        self.zoom = min(fit_zoom(grid_shape, self._frame_area()), MAX_INITIAL_ZOOM)
+        self.viewport = (0, 0)
+
+    def handle_view_key(self, key: int, grid_shape: Tuple[int, int]) -> bool:
+        """
+        Scrolls the viewport by a quarter of the window with the arrow keys, and zooms
+        in or out with + and -.
 
         Parameters
         ----------
-        grid : numpy.ndarray
-            The game grid to display.
+        key : int
+            Key code returned by getch.
+        grid_shape : tuple of int
+            Dimensions of the displayed grid.
+
+        Returns
+        -------
+        bool
+            True if the key changed the view.
         """
-        self.stdscr.addstr(0, 0, self.path_param_content["exit"])
+        (height, width) = window_shape(self._frame_area(), self.zoom)
+        (top, left) = self.viewport
+        moves = {
+            curses.KEY_UP: (-max(height // 4, 1), 0),
+            curses.KEY_DOWN: (max(height // 4, 1), 0),
+            curses.KEY_LEFT: (0, -max(width // 4, 1)),
+            curses.KEY_RIGHT: (0, max(width // 4, 1)),
+        }
+        if key in moves:
+            self.viewport = (top + moves[key][0], left + moves[key][1])
+        elif key in (ord('+'), ord('=')) and self.zoom > 0:
+            self.zoom -= 1
+        elif key in (ord('-'), ord('_')) and self.zoom < fit_zoom(grid_shape, self._frame_area()):
+            self.zoom += 1
+        else:
+            return False
+        if key not in moves:
+            # Zoom around the centre of the window.
+            (new_height, new_width) = window_shape(self._frame_area(), self.zoom)
+            self.viewport = (top + (height - new_height) // 2, left + (width - new_width) // 2)
+        self._clamp_viewport(grid_shape)
+        return True
+
+    def display_grid(self, grid: np.ndarray, info: str = ""):
+        """
+        Displays the part of the game grid inside the viewport.
 
-        start_y = self.scr_height // 2 - grid.shape[0] // 2
-        start_x = self.scr_width // 2 - grid.shape[1] * 2 // 2
+        Grids larger than the screen are shown through a viewport, drawn zoomed out
+        with half-block or braille characters at the higher zoom levels. The first frame
+        is drawn at the lowest zoom level showing the whole grid. Only the window of
+        cells on screen is read and reduced into characters, and only the runs of
+        characters that differ from the previous frame are rewritten, one write per run,
+        so that drawing time follows the number of changes rather than the grid size.
 
-        rectangle(self.stdscr, start_y - 1, start_x - 2, start_y +
-                  grid.shape[0], start_x + grid.shape[1] * 2)
+        Parameters
+        ----------
+        grid : numpy.ndarray
+            The game grid to display.
+        info : str
+            Text added to the status line.
+        """
+        if self.zoom is None:
+            self.fit_view(grid.shape)
+        (height, width) = window_shape(self._frame_area(), self.zoom)
+        (top, left) = self.viewport
+        frame = glyphs(np.asarray(grid[top:top + height, left:left + width]), self.zoom)
+
+        (rows, cols) = self._frame_area()
+        start_y = 2 + (rows - frame.shape[0]) // 2
+        start_x = 2 + (cols - frame.shape[1]) // 2
+        status = (f"{self.path_param_content['exit']} - arrows: scroll, +/-: zoom"
+                  f" - rows {top}-{top + min(height, grid.shape[0])}, columns {left}-{left + min(width, grid.shape[1])}"
+                  f" of {grid.shape[0]}x{grid.shape[1]}" + (f" - {info}" if info else ""))
+
+        if self._frame is None or self._frame.shape != frame.shape:
+            self.stdscr.clear()
+            rectangle(self.stdscr, start_y - 1, start_x - 2, start_y +
+                      frame.shape[0], start_x + frame.shape[1] + 1)
+            for y in range(frame.shape[0]):
+                self.stdscr.addstr(start_y + y, start_x, glyph_text(frame[y]))
+        else:
+            (rows, starts, stops) = changed_runs(self._frame, frame, merge_gap=RUN_MERGE_GAP)
+            for (y, x0, x1) in zip(rows.tolist(), starts.tolist(), stops.tolist()):
+                self.stdscr.addstr(start_y + y, start_x + x0, glyph_text(frame[y, x0:x1]))
+        self.stdscr.addstr(0, 0, status[:self.scr_width - 1].ljust(self.scr_width - 1))
+        self._frame = frame
 
-        for y in range(grid.shape[0]):
-            for x in range(grid.shape[1]):
-                char = 'o' if grid[y, x] == 1 else ' '
-                self.stdscr.addstr(start_y + y, start_x + x * 2, char)
+    def reset_display(self):
+        """
+        Forgets the last frame drawn, so that the next one is drawn in full, e.g. after
+        the screen was cleared or resized.
+        """
+        self._frame = None
 
     def retry_size_input(self, size: str) -> Tuple[int, int]:
         """
@@ -281,33 +416,86 @@ class TerminalGUI:
         Starts the main game loop, updating and displaying the grid state continuously
         until the user chooses to exit.
 
+        Generations are computed on a SimulationThread at the selected speed, while
+        this loop draws the latest completed one FRAME_RATE times per second, so slow
+        drawing never slows the simulation down. Space pauses or resumes, n computes a
+        single generation while paused, < and > change the speed. With a history, b
+        pauses and goes back one generation, and B goes back a keyframe interval.
+
         Parameters
         ----------
         game : Game
             An instance of the Game class, used to initialize and update the game's grid state.
         """
         grid = game.initialize_grid()
+        self.reset_display()
+        self.fit_view(grid.shape)
+        detector = None
+        if self.detect_cycles:
+            from GameOfLife.cycles import CycleDetector
+            detector = CycleDetector()
+        simulation = SimulationThread(game, grid, self.no_wrapping, speed=SPEEDS[DEFAULT_SPEED_INDEX],
+                                      detector=detector, profiler=self.profiler, recorder=self.recorder,
+                                      history=self.history)
+        speed_index = DEFAULT_SPEED_INDEX
+        simulation.start()
+        profiler = self.profiler
 
         while True:
             try:
-                self.stdscr.nodelay(True)  # Non-blocking mode
-                key = self.stdscr.getch()
-                if key == 3: #ASCII code for CTRL+C
-                    logger.info("User requested exit.")
-                    raise KeyboardInterrupt
-                self.display_grid(grid)
-                grid = game.update_grid_state(grid, self.no_wrapping)
-                time.sleep(0.1)
-                self.stdscr.refresh()
+                frame_start = time.perf_counter()
+                with profiler.phase("input"):
+                    self.stdscr.nodelay(True)  # Non-blocking mode
+                    key = self.stdscr.getch()
+                    while key != -1:
+                        if key == 3: #ASCII code for CTRL+C
+                            logger.info("User requested exit.")
+                            raise KeyboardInterrupt
+                        if key == curses.KEY_RESIZE:
+                            self.scr_height, self.scr_width = self.stdscr.getmaxyx()
+                            self._clamp_viewport(grid.shape)
+                            self.reset_display()
+                        elif key == ord(' '):
+                            if simulation.paused:
+                                simulation.resume()
+                            else:
+                                simulation.pause()
+                        elif key == ord('n') and simulation.paused:
+                            simulation.step_once()
+                        elif key in (ord('b'), ord('B')) and self.history is not None:
+                            simulation.step_back(1 if key == ord('b') else self.history.keyframe_interval)
+                        elif key in (ord('>'), ord('<')):
+                            speed_index = min(max(speed_index + (1 if key == ord('>') else -1), 0), len(SPEEDS) - 1)
+                            simulation.speed = SPEEDS[speed_index]
+                        self.handle_view_key(key, grid.shape)
+                        key = self.stdscr.getch()
+
+                # Only the latest generation is drawn; the ones computed in between are skipped.
+                with profiler.phase("render"):
+                    (generation, grid) = simulation.latest()
+                    speed = "max" if simulation.speed is None else f"{simulation.speed:g}"
+                    state = "paused - n: step" if simulation.paused else f"{speed} gen/s"
+                    if self.history is not None:
+                        state += f", b/B: back to {self.history.oldest}"
+                    if detector is not None and detector.cycle is not None:
+                        state += f", period {detector.cycle.period} from generation {detector.cycle.start}"
+                    if self.recorder is not None:
+                        state += f", rec {self.recorder.recorded} ({self.recorder.dropped} dropped)"
+                    self.display_grid(grid, info=f"generation {generation} ({state}) - space: pause, </>: speed")
+                with profiler.phase("io"):
+                    self.stdscr.refresh()
+                if simulation.error:
+                    raise simulation.error
+                elapsed = time.perf_counter() - frame_start
+                profiler.record("frame", elapsed)
+                with profiler.phase("sleep"):
+                    time.sleep(max(0, 1 / FRAME_RATE - elapsed))
             except KeyboardInterrupt:
+                simulation.stop()
                 exit(0)
             except curses.error:
-                # Handle the case where the grid cannot be displayed due to screen size limitations
-                self.stdscr.nodelay(False)
-                self.stdscr.clear()
-                error_txt = "Grid larger than the terminal screen. Press a key to exit."
-                self._print_centered(self.scr_height // 2,
-                                     error_txt, curses.A_REVERSE)
-                logger.error(error_txt)
-                key = self.stdscr.getch()
-                exit(-1)
+                # The terminal shrank below the frame being drawn: redraw for its new size.
+                self.scr_height, self.scr_width = self.stdscr.getmaxyx()
+                self._clamp_viewport(grid.shape)
+                self.reset_display()
+                time.sleep(0.1)
@@ -0,0 +1,392 @@
+"""
+HashLife engine: advances patterns on the unbounded plane by 2^k generations per jump,
+using a quadtree of canonicalised nodes and a memoized, size-bounded result cache.
+"""
+import sys
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from GameOfLife import logger
+from GameOfLife.rules import CONWAY, Rule
+
+
+class Node:
+    """
+    Canonical quadtree node of level ``k``, covering a square of 2^k by 2^k cells.
+
+    Nodes are only ever created through HashLife.join, so two nodes describing the
+    same square of cells are the same object and compare by identity.
+
+    Attributes
+    ----------
+    k : int
+        Level of the node; leaves (single cells) have level 0.
+    nw, ne, sw, se : Node or None
+        Quadrants of the node, None for leaves.
+    pop : int
+        Number of alive cells in the square.
+    """
+    __slots__ = ("k", "nw", "ne", "sw", "se", "pop")
+
+    def __init__(self, k, nw, ne, sw, se, pop) -> None:
+        self.k = k
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.pop = pop
+
+
+class HashLife:
+    """
+    Unbounded universe stepped with the HashLife algorithm.
+
+    Attributes
+    ----------
+    root : Node
+        Quadtree holding the current generation.
+    origin : tuple of int
+        Plane coordinates (y, x) of the top-left cell of the root node.
+    generation : int
+        Number of generations advanced since the pattern was loaded.
+    shape : tuple of int
+        Shape of the array the pattern was loaded from, used as default export window.
+    max_cache_size : int
+        Maximum number of memoized results kept; least recently used ones are evicted.
+    max_nodes : int
+        Node count above which unreachable nodes are collected after a jump.
+    rule : Rule
+        Birth and survival rule of the universe.
+
+    Raises
+    ------
+    ValueError
+        If the rule has birth on 0 neighbours, which would fill the infinite background.
+    """
+
+    def __init__(self, max_cache_size: int = 1_000_000, max_nodes: int = 4_000_000, rule: Rule = CONWAY) -> None:
+        if 0 in rule.birth:
+            logger.error(f"HashLife cannot run rule {rule}.")
+            raise ValueError(f"HashLife cannot run rule {rule}: B0 fills the empty background.")
+        self.rule = rule
+        self.max_cache_size = max_cache_size
+        self.max_nodes = max_nodes
+        self._nodes = {}
+        self._cache = OrderedDict()
+        self._zeros = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self.off = Node(0, None, None, None, None, 0)
+        self.on = Node(0, None, None, None, None, 1)
+        self.root = self.zero(3)
+        self.origin = (0, 0)
+        self.generation = 0
+        self.shape = (0, 0)
+
+    # -- Node construction -------------------------------------------------
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """
+        Returns the canonical node made of four quadrants of the same level.
+        """
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.k + 1, nw, ne, sw, se, nw.pop + ne.pop + sw.pop + se.pop)
+            self._nodes[key] = node
+        return node
+
+    def zero(self, k: int) -> Node:
+        """
+        Returns the empty node of level ``k``.
+        """
+        while len(self._zeros) <= k:
+            if not self._zeros:
+                self._zeros.append(self.off)
+            else:
+                z = self._zeros[-1]
+                self._zeros.append(self.join(z, z, z, z))
+        return self._zeros[k]
+
+    def _centre(self, node: Node) -> Node:
+        """
+        Returns the level k-1 node at the centre of a level k node.
+        """
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _pad(self, node: Node) -> Node:
+        """
+        Returns the level k+1 node with ``node`` at its centre, surrounded by dead cells.
+        """
+        z = self.zero(node.k - 1)
+        return self.join(
+            self.join(z, z, z, node.nw), self.join(z, z, node.ne, z),
+            self.join(z, node.sw, z, z), self.join(node.se, z, z, z))
+
+    # -- Evolution ---------------------------------------------------------
+
+    def _life_4x4(self, node: Node) -> Node:
+        """
+        Brute-forces one generation of the central 2x2 cells of a level 2 node.
+        """
+        cells = [[0] * 4 for _ in range(4)]
+        for (qy, qx, quad) in ((0, 0, node.nw), (0, 2, node.ne), (2, 0, node.sw), (2, 2, node.se)):
+            cells[qy][qx] = quad.nw.pop
+            cells[qy][qx + 1] = quad.ne.pop
+            cells[qy + 1][qx] = quad.sw.pop
+            cells[qy + 1][qx + 1] = quad.se.pop
+
+        def _next(y, x):
+            count = sum(cells[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - cells[y][x]
+            return self.on if self.rule.table[cells[y][x], count] else self.off
+
+        return self.join(_next(1, 1), _next(1, 2), _next(2, 1), _next(2, 2))
+
+    def _successor(self, node: Node, j: int) -> Node:
+        """
+        Returns the level k-1 centre of ``node`` advanced by 2^j generations, 0 <= j <= k-2.
+        """
+        if node.pop == 0:
+            return self.zero(node.k - 1)
+        key = (node, j)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return result
+        self.cache_misses += 1
+
+        if node.k == 2:
+            result = self._life_4x4(node)
+        else:
+            (nw, ne, sw, se) = (node.nw, node.ne, node.sw, node.se)
+            quads = [
+                nw, self.join(nw.ne, ne.nw, nw.se, ne.sw), ne,
+                self.join(nw.sw, nw.se, sw.nw, sw.ne), self.join(nw.se, ne.sw, sw.ne, se.nw),
+                self.join(ne.sw, ne.se, se.nw, se.ne),
+                sw, self.join(sw.ne, se.nw, sw.se, se.sw), se,
+            ]
+            if j == node.k - 2:
+                # Two half-jumps of 2^(k-3) generations each.
+                c = [self._successor(q, j - 1) for q in quads]
+                inner = j - 1
+            else:
+                # No time passes in the first stage; the second stage does the whole jump.
+                c = [self._centre(q) for q in quads]
+                inner = j
+            result = self.join(
+                self._successor(self.join(c[0], c[1], c[3], c[4]), inner),
+                self._successor(self.join(c[1], c[2], c[4], c[5]), inner),
+                self._successor(self.join(c[3], c[4], c[6], c[7]), inner),
+                self._successor(self.join(c[4], c[5], c[7], c[8]), inner))
+
+        self._cache[key] = result
+        if len(self._cache) > self.max_cache_size:
+            self._cache.popitem(last=False)
+            self.cache_evictions += 1
+        return result
+
+    def _jump(self, j: int) -> None:
+        """
+        Advances the root by 2^j generations.
+        """
+        root = self.root
+        (y, x) = self.origin
+        # Light speed is one cell per generation: with the population confined to the
+        # central quarter and 2^j <= 2^(k-3), nothing escapes the returned centre.
+        while root.k < j + 3 or self._centre(self._centre(root)).pop != root.pop:
+            half = 1 << (root.k - 1)
+            (y, x) = (y - half, x - half)
+            root = self._pad(root)
+        quarter = 1 << (root.k - 2)
+        self.root = self._successor(root, j)
+        self.origin = (y + quarter, x + quarter)
+        self.generation += 1 << j
+
+    def advance(self, n: int) -> None:
+        """
+        Advances the pattern by ``n`` generations, jumping 2^j generations for each set bit j of n.
+
+        Parameters
+        ----------
+        n : int
+            Number of generations to advance (non-negative).
+        """
+        if n < 0:
+            raise ValueError("HashLife cannot advance a negative number of generations.")
+        j = 0
+        while n:
+            if n & 1:
+                self._jump(j)
+                if len(self._nodes) > self.max_nodes:
+                    self.collect()
+            n >>= 1
+            j += 1
+        logger.info(f"HashLife advanced to generation {self.generation}: {self.memory_usage()}.")
+
+    def step(self) -> None:
+        """
+        Advances the pattern by one generation.
+        """
+        self.advance(1)
+
+    # -- Memory ------------------------------------------------------------
+
+    def collect(self) -> None:
+        """
+        Drops the result cache and every node unreachable from the root.
+        """
+        reachable = {}
+        stack = [self.root] + self._zeros[1:]
+        while stack:
+            node = stack.pop()
+            if node.k == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in reachable:
+                reachable[key] = node
+                stack.extend(key)
+        self._nodes = reachable
+        self._cache.clear()
+        logger.info(f"HashLife collected nodes: {self.memory_usage()}.")
+
+    def memory_usage(self) -> dict:
+        """
+        Reports the size of the node table and result cache.
+
+        Returns
+        -------
+        dict
+            Node and cache entry counts, cache statistics and an estimate of the bytes
+            held by nodes and the two hash tables.
+        """
+        # A node costs its own slots plus the quadrant tuple keying it in the node table;
+        # a cache entry costs its (node, j) key plus the OrderedDict link pointers.
+        node_bytes = sys.getsizeof(self.root) + sys.getsizeof((None,) * 4)
+        entry_bytes = sys.getsizeof((None, 0)) + 2 * 8
+        estimated = (len(self._nodes) * node_bytes + sys.getsizeof(self._nodes)
+                     + len(self._cache) * entry_bytes + sys.getsizeof(self._cache))
+        return {
+            "nodes": len(self._nodes),
+            "cache_entries": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_evictions": self.cache_evictions,
+            "estimated_bytes": estimated,
+        }
+
+    # -- Import / export -----------------------------------------------------
+
+    @property
+    def population(self) -> int:
+        return self.root.pop
+
+    @classmethod
+    def from_array(cls, grid: np.ndarray, **kwargs) -> "HashLife":
+        """
+        Builds a universe from a grid, placing its top-left cell at plane coordinates (0, 0).
+
+        Parameters
+        ----------
+        grid : np.ndarray
+            Numpy array containing 0s and 1s corresponding to dead cells and alive cells.
+        **kwargs
+            Forwarded to the HashLife constructor (max_cache_size, max_nodes, rule).
+
+        Returns
+        -------
+        HashLife
+            Universe holding the pattern at generation 0.
+        """
+        life = cls(**kwargs)
+        k = max(3, int(np.ceil(np.log2(max(grid.shape + (1,))))))
+        size = 1 << k
+        padded = np.zeros((size, size), dtype=bool)
+        padded[:grid.shape[0], :grid.shape[1]] = grid != 0
+
+        def _build(level, y, x):
+            if level == 0:
+                return life.on if padded[y, x] else life.off
+            half = 1 << (level - 1)
+            if not padded[y:y + 2 * half, x:x + 2 * half].any():
+                return life.zero(level)
+            return life.join(
+                _build(level - 1, y, x), _build(level - 1, y, x + half),
+                _build(level - 1, y + half, x), _build(level - 1, y + half, x + half))
+
+        life.root = _build(k, 0, 0)
+        life.shape = grid.shape
+        return life
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "HashLife":
+        """
+        Builds a universe from a .txt or .rle grid file, read with the Game loaders.
+        The rule declared in an RLE header is used unless a ``rule`` is given.
+        """
+        from GameOfLife.game import Game
+        game = Game(starting_grid_filepath=path)
+        grid = game.initialize_grid()
+        kwargs.setdefault("rule", game.rule)
+        return cls.from_array(grid, **kwargs)
+
+    def bounding_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Returns the (top, left, height, width) window enclosing every alive cell, or None if empty.
+        """
+        if self.root.pop == 0:
+            return None
+        (top, left, bottom, right) = (None, None, None, None)
+        stack = [(self.root, self.origin[0], self.origin[1])]
+        while stack:
+            (node, y, x) = stack.pop()
+            if node.pop == 0:
+                continue
+            size = 1 << node.k
+            # Skip nodes that cannot extend the box found so far.
+            if top is not None and y >= top and x >= left and y + size - 1 <= bottom and x + size - 1 <= right:
+                continue
+            if node.k == 0:
+                top = y if top is None else min(top, y)
+                left = x if left is None else min(left, x)
+                bottom = y if bottom is None else max(bottom, y)
+                right = x if right is None else max(right, x)
+                continue
+            half = size // 2
+            stack.extend([(node.nw, y, x), (node.ne, y, x + half), (node.sw, y + half, x), (node.se, y + half, x + half)])
+        return (top, left, bottom - top + 1, right - left + 1)
+
+    def to_array(self, window: Optional[Tuple[int, int, int, int]] = None, dtype=int) -> np.ndarray:
+        """
+        Exports a rectangular window of the plane as a dense grid.
+
+        Parameters
+        ----------
+        window : tuple of int, optional
+            (top, left, height, width) in plane coordinates. Defaults to the window
+            the pattern was loaded from.
+        dtype : data-type
+            Dtype of the returned array.
+
+        Returns
+        -------
+        np.ndarray
+            Numpy array of shape (height, width) containing 0s and 1s.
+        """
+        (top, left, height, width) = window if window is not None else (0, 0) + tuple(self.shape)
+        grid = np.zeros((height, width), dtype=dtype)
+        stack = [(self.root, self.origin[0], self.origin[1])]
+        while stack:
+            (node, y, x) = stack.pop()
+            size = 1 << node.k
+            if (node.pop == 0 or y >= top + height or x >= left + width
+                    or y + size <= top or x + size <= left):
+                continue
+            if node.k == 0:
+                grid[y - top, x - left] = 1
+                continue
+            half = size // 2
+            stack.extend([(node.nw, y, x), (node.ne, y, x + half), (node.sw, y + half, x), (node.se, y + half, x + half)])
+        return grid
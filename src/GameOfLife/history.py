@@ -0,0 +1,248 @@
+"""
+In-memory history of a run, to go back to earlier generations without recomputing them
+from the start.
+
+Generations are stored bit-packed and zlib-compressed: every ``keyframe_interval``-th
+one in full, the others as the XOR with the generation stored before, which is zero
+wherever the grid did not change and compresses the better the calmer the grid is (to
+almost nothing for still lifes and small oscillators). A keyframe and the deltas
+following it form a segment. When the history outgrows its memory budget, its oldest
+segments are evicted, so the recent past is always kept. Restoring a generation
+decompresses the keyframe of its segment and applies at most ``keyframe_interval - 1``
+deltas.
+"""
+from bisect import bisect_left, bisect_right
+import zlib
+from typing import List, Optional
+
+import numpy as np
+from GameOfLife import logger
+
+DEFAULT_KEYFRAME_INTERVAL = 32
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+
+
+class _Segment:
+    """
+    A keyframe and the deltas following it, with their generation numbers.
+    """
+
+    __slots__ = ("generations", "payloads", "nbytes")
+
+    def __init__(self) -> None:
+        self.generations: List[int] = []
+        self.payloads: List[bytes] = []
+        self.nbytes = 0
+
+
+class GenerationHistory:
+    """
+    Bounded store of the generations of a run, appended in increasing order.
+
+    A history is a callback like a FrameRecorder: ``history(generation, grid)`` appends
+    a generation, so it can be given to Game.run or a SimulationThread.
+
+    Attributes
+    ----------
+    keyframe_interval : int
+        Generations per segment: one keyframe followed by deltas.
+    max_bytes : int
+        Memory budget of the compressed generations; the newest segment is kept even if
+        it alone exceeds it.
+    compression : int
+        zlib compression level, from 1 (fastest) to 9.
+    nbytes : int
+        Size of the compressed generations stored.
+    evicted : int
+        Number of generations evicted so far.
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL, max_bytes: int = DEFAULT_MAX_BYTES,
+                 compression: int = 1) -> None:
+        if keyframe_interval < 1 or max_bytes < 1:
+            logger.error("Invalid history keyframe interval or memory budget.")
+            raise ValueError("keyframe_interval and max_bytes must be at least 1.")
+        self.keyframe_interval = keyframe_interval
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.nbytes = 0
+        self.evicted = 0
+        self._segments: List[_Segment] = []
+        # First generation of each segment, searched to find the segment of a generation.
+        self._starts: List[int] = []
+        self._shape = None
+        # Bit-packed last generation appended, which the next delta is computed against.
+        self._last = None
+        # (segment, index, bit-packed generation) last restored, from which later
+        # generations of the same segment are restored without going back to its keyframe.
+        self._cursor = None
+
+    def __len__(self) -> int:
+        return sum(len(segment.generations) for segment in self._segments)
+
+    def __contains__(self, generation: int) -> bool:
+        return self._locate(generation) is not None
+
+    @property
+    def oldest(self) -> Optional[int]:
+        """
+        Oldest generation stored, or None if the history is empty.
+        """
+        return self._starts[0] if self._starts else None
+
+    @property
+    def newest(self) -> Optional[int]:
+        """
+        Newest generation stored, or None if the history is empty.
+        """
+        return self._segments[-1].generations[-1] if self._segments else None
+
+    def __call__(self, generation: int, grid: np.ndarray) -> None:
+        self.append(generation, grid)
+
+    def append(self, generation: int, grid: np.ndarray) -> None:
+        """
+        Stores a generation, then evicts the oldest segments if over the memory budget.
+
+        Parameters
+        ----------
+        generation : int
+            Generation number, greater than the newest one stored.
+        grid : np.ndarray
+            Grid of that generation; non-zero cells are alive.
+
+        Raises
+        ------
+        ValueError
+            If the generation is not after the newest one, or the grid shape changed.
+        """
+        grid = np.asarray(grid)
+        if self._shape is None:
+            self._shape = grid.shape
+        elif grid.shape != self._shape:
+            logger.error(f"Grid of shape {grid.shape} appended to a history of shape {self._shape}.")
+            raise ValueError("All the generations of a history must have the same shape.")
+        if self._segments and generation <= self.newest:
+            logger.error(f"Generation {generation} appended after generation {self.newest}.")
+            raise ValueError("Generations must be appended in increasing order.")
+        packed = np.packbits(grid, axis=None)
+        if not self._segments or len(self._segments[-1].generations) >= self.keyframe_interval:
+            self._segments.append(_Segment())
+            self._starts.append(generation)
+            payload = packed
+        else:
+            payload = np.bitwise_xor(packed, self._last)
+        data = zlib.compress(payload.tobytes(), self.compression)
+        segment = self._segments[-1]
+        segment.generations.append(generation)
+        segment.payloads.append(data)
+        segment.nbytes += len(data)
+        self.nbytes += len(data)
+        self._last = packed
+        while self.nbytes > self.max_bytes and len(self._segments) > 1:
+            self._evict()
+
+    def _evict(self) -> None:
+        segment = self._segments.pop(0)
+        self._starts.pop(0)
+        self.nbytes -= segment.nbytes
+        self.evicted += len(segment.generations)
+        if self._cursor is not None and self._cursor[0] is segment:
+            self._cursor = None
+
+    def _locate(self, generation: int):
+        """
+        Returns the segment of a generation and its index there, or None if not stored.
+        """
+        position = bisect_right(self._starts, generation) - 1
+        if position < 0:
+            return None
+        segment = self._segments[position]
+        index = bisect_left(segment.generations, generation)
+        if index == len(segment.generations) or segment.generations[index] != generation:
+            return None
+        return (segment, index)
+
+    def seek(self, generation: int) -> np.ndarray:
+        """
+        Restores a stored generation.
+
+        Parameters
+        ----------
+        generation : int
+            Generation number, as appended.
+
+        Returns
+        -------
+        np.ndarray
+            uint8 grid of that generation.
+
+        Raises
+        ------
+        ValueError
+            If the generation is not stored, e.g. because it was evicted.
+        """
+        location = self._locate(generation)
+        if location is None:
+            logger.error(f"Generation {generation} is not in the history ({self.oldest} to {self.newest}).")
+            raise ValueError(f"Generation {generation} is not stored.")
+        (segment, index) = location
+        if self._cursor is not None and self._cursor[0] is segment and self._cursor[1] <= index:
+            (_, start, packed) = self._cursor
+        else:
+            (start, packed) = (0, np.frombuffer(bytearray(zlib.decompress(segment.payloads[0])), dtype=np.uint8))
+        for payload in segment.payloads[start + 1:index + 1]:
+            np.bitwise_xor(packed, np.frombuffer(zlib.decompress(payload), dtype=np.uint8), out=packed)
+        self._cursor = (segment, index, packed)
+        return np.unpackbits(packed, count=int(np.prod(self._shape))).reshape(self._shape)
+
+    def previous(self, generation: int, count: int = 1) -> Optional[int]:
+        """
+        Returns the stored generation ``count`` positions before ``generation`` (which
+        need not be stored), the oldest one if fewer are stored, or None if none is.
+        """
+        position = bisect_left(self._starts, generation) - 1
+        if position < 0:
+            return None
+        index = bisect_left(self._segments[position].generations, generation) - count
+        while index < 0 and position > 0:
+            position -= 1
+            index += len(self._segments[position].generations)
+        return self._segments[position].generations[max(index, 0)]
+
+    def truncate(self, generation: int) -> None:
+        """
+        Forgets the generations after ``generation``, e.g. before running again from it.
+        """
+        position = bisect_right(self._starts, generation)
+        for segment in self._segments[position:]:
+            self.nbytes -= segment.nbytes
+        del self._segments[position:]
+        del self._starts[position:]
+        if not self._segments:
+            (self._shape, self._last, self._cursor) = (None, None, None)
+            return
+        segment = self._segments[-1]
+        keep = bisect_right(segment.generations, generation)
+        self.nbytes -= sum(len(payload) for payload in segment.payloads[keep:])
+        segment.nbytes = sum(len(payload) for payload in segment.payloads[:keep])
+        del segment.generations[keep:]
+        del segment.payloads[keep:]
+        if self._cursor is not None and self._cursor[0] is segment and self._cursor[1] >= keep:
+            self._cursor = None
+        self.seek(segment.generations[-1])
+        self._last = self._cursor[2].copy()
+
+    def summary(self) -> dict:
+        """
+        Returns the range of generations stored, their number and size, and the number
+        of generations evicted.
+        """
+        return {
+            "oldest": self.oldest,
+            "newest": self.newest,
+            "generations": len(self),
+            "keyframes": len(self._segments),
+            "bytes": self.nbytes,
+            "evicted": self.evicted,
+        }
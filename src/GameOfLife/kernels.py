@@ -0,0 +1,199 @@
+"""
+Stepping kernels computing one generation of the Game of Life on a dense grid.
+
+Every kernel takes a grid of 0s and 1s and returns the next generation as a new
+array with the same shape and dtype, for both the wrapping (torus) and the
+``no_wrapping`` (bounded) edge modes, under a given Rule (B3/S23 by default).
+"""
+import numpy as np
+from GameOfLife.rules import CONWAY, Rule
+
+# Offsets of the eight neighbours of a cell, as (row, column) shifts.
+NEIGHBOUR_OFFSETS = [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if (di, dj) != (0, 0)]
+
+
+def count_neighbours(grid: np.ndarray, no_wrapping: bool = False) -> np.ndarray:
+    """
+    Counts the alive neighbours of every cell with whole-array operations.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Numpy array containing 0s and 1s corresponding to dead cells and alive cells.
+    no_wrapping : bool
+        If True, cells outside the grid are dead; otherwise edges wrap around.
+
+    Returns
+    -------
+    np.ndarray
+        uint8 array holding the number of alive neighbours (0 to 8) of each cell.
+    """
+    cells = grid.astype(np.uint8, copy=False)
+    counts = np.zeros(cells.shape, dtype=np.uint8)
+    if no_wrapping:
+        (height, width) = cells.shape
+        padded = np.pad(cells, 1)
+        for (di, dj) in NEIGHBOUR_OFFSETS:
+            counts += padded[1 + di:1 + di + height, 1 + dj:1 + dj + width]
+    else:
+        # Rolling rows once and reusing them for the three column shifts saves rolls.
+        for di in (-1, 0, 1):
+            rows = np.roll(cells, -di, axis=0) if di else cells
+            for dj in (-1, 0, 1):
+                if (di, dj) != (0, 0):
+                    counts += np.roll(rows, -dj, axis=1) if dj else rows
+    return counts
+
+
+def step_numpy(grid: np.ndarray, no_wrapping: bool = False, rule: Rule = CONWAY) -> np.ndarray:
+    """
+    Vectorized step: neighbour counts are computed as whole arrays.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Numpy array containing 0s and 1s corresponding to dead cells and alive cells.
+    no_wrapping : bool
+        If True, no edge wrapping applied - edge cells have less than 8 neighbours.
+    rule : Rule
+        Birth and survival rule applied to the neighbour counts.
+
+    Returns
+    -------
+    np.ndarray
+        Next generation, with the same dtype as ``grid``.
+    """
+    counts = count_neighbours(grid, no_wrapping)
+    return rule.apply(counts, grid).astype(grid.dtype)
+
+
+def step_reference(grid: np.ndarray, no_wrapping: bool = False, rule: Rule = CONWAY) -> np.ndarray:
+    """
+    Reference cell-by-cell implementation, kept to check the other kernels against.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Numpy array containing 0s and 1s corresponding to dead cells and alive cells.
+    no_wrapping : bool
+        If True, no edge wrapping applied - edge cells have less than 8 neighbours.
+    rule : Rule
+        Birth and survival rule applied to the neighbour counts.
+
+    Returns
+    -------
+    np.ndarray
+        Next generation, with the same dtype as ``grid``.
+    """
+    (grid_height, grid_width) = grid.shape
+    updated_grid = grid.copy()
+
+    ## Combining the two following helper functions makes the code less readable
+    def _check_neighbours(i, j):
+        alive_neighbours_count = 0
+        for k in range(i-1, i+2):
+            for l in range(j-1, j+2):
+                if (k, l) != (i, j) and grid[(k % grid_height, l % grid_width)]:
+                    alive_neighbours_count += 1
+        return alive_neighbours_count
+
+    def _check_neighbours_no_wrapping(i, j):
+        alive_neighbours_count = 0
+        for k in range(max(0, i-1), min(i+2, grid_height)):
+            for l in range(max(0, j-1), min(j+2, grid_width)):
+                if (k, l) != (i, j) and grid[k, l]:
+                    alive_neighbours_count += 1
+        return alive_neighbours_count
+
+    def _apply_rules(updated_grid, i, j, alive_neighbours_count):
+        if not grid[i, j] and alive_neighbours_count in rule.birth:
+            updated_grid[i, j] = 1
+        if grid[i, j] and alive_neighbours_count not in rule.survival:
+            updated_grid[i, j] = 0
+
+    for i in range(grid_height):
+        for j in range(grid_width):
+            if no_wrapping:
+                alive_neighbours_count = _check_neighbours_no_wrapping(i, j)
+            else:
+                alive_neighbours_count = _check_neighbours(i, j)
+            _apply_rules(updated_grid, i, j, alive_neighbours_count)
+
+    return updated_grid
+
+
+class DoubleBuffer:
+    """
+    Pair of preallocated grids the vectorized kernel ping-pongs between, so that
+    advancing many generations allocates no memory per step.
+
+    Each buffer holds the grid surrounded by a one-cell border, refreshed before every
+    step with the opposite edges (torus) or dead cells (``no_wrapping``).
+
+    Attributes
+    ----------
+    shape : tuple of int
+        Dimensions of the grid (height, width).
+    rule : Rule
+        Birth and survival rule applied to the neighbour counts.
+    """
+
+    def __init__(self, shape: tuple, rule: Rule = CONWAY) -> None:
+        (height, width) = shape
+        self.shape = (height, width)
+        self.rule = rule
+        self._buffers = [np.zeros((height + 2, width + 2), dtype=np.uint8) for _ in range(2)]
+        self._counts = np.zeros(self.shape, dtype=np.uint8)
+        self._scratch = np.zeros(self.shape, dtype=bool)
+        self._current = 0
+
+    @property
+    def grid(self) -> np.ndarray:
+        """
+        View of the current generation, valid until the next call to advance.
+        """
+        return self._buffers[self._current][1:-1, 1:-1]
+
+    @property
+    def previous(self) -> np.ndarray:
+        """
+        View of the generation before the current one, valid after a call to advance.
+        """
+        return self._buffers[1 - self._current][1:-1, 1:-1]
+
+    def load(self, grid: np.ndarray) -> None:
+        """
+        Copies a grid into the current buffer.
+        """
+        self.grid[...] = grid
+
+    def advance(self, generations: int = 1, no_wrapping: bool = False) -> None:
+        """
+        Steps the loaded grid ``generations`` times.
+
+        Parameters
+        ----------
+        generations : int
+            Number of generations to compute.
+        no_wrapping : bool
+            If True, no edge wrapping applied - edge cells have less than 8 neighbours.
+        """
+        (height, width) = self.shape
+        counts = self._counts
+        for _ in range(generations):
+            src = self._buffers[self._current]
+            dst = self._buffers[1 - self._current]
+            if no_wrapping:
+                src[0] = src[-1] = 0
+                src[:, 0] = src[:, -1] = 0
+            else:
+                src[0, 1:-1] = src[-2, 1:-1]
+                src[-1, 1:-1] = src[1, 1:-1]
+                src[:, 0] = src[:, -2]
+                src[:, -1] = src[:, 1]
+
+            counts.fill(0)
+            for (di, dj) in NEIGHBOUR_OFFSETS:
+                np.add(counts, src[1 + di:1 + di + height, 1 + dj:1 + dj + width], out=counts)
+            self.rule.apply(counts, src[1:-1, 1:-1], out=dst[1:-1, 1:-1], scratch=self._scratch)
+            self._current = 1 - self._current
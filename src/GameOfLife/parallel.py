@@ -0,0 +1,268 @@
+"""
+Multi-core stepping: the grid lives in two shared-memory buffers split into horizontal
+tiles, which a process pool steps in parallel from one buffer into the other.
+"""
+import os
+import time
+import atexit
+from collections import OrderedDict
+from multiprocessing import Pool, shared_memory
+from typing import Optional
+
+import numpy as np
+from GameOfLife import logger
+from GameOfLife.kernels import NEIGHBOUR_OFFSETS
+from GameOfLife.rules import CONWAY, Rule
+
+# Shared buffers attached by each worker process, set by _attach_buffers.
+_worker_buffers = None
+# Steppers kept for step_parallel calls; the least recently used one is closed beyond this.
+MAX_CACHED_STEPPERS = 2
+
+
+def step_rows(src: np.ndarray, dst: np.ndarray, start: int, stop: int, no_wrapping: bool = False,
+              rule: Rule = CONWAY) -> None:
+    """
+    Computes rows ``start`` to ``stop`` of the next generation of ``src`` into ``dst``.
+
+    Only the tile rows plus one halo row above and below are read from ``src``.
+
+    Parameters
+    ----------
+    src : np.ndarray
+        Current generation, containing 0s and 1s.
+    dst : np.ndarray
+        Array of the same shape receiving the next generation of the tile.
+    start, stop : int
+        Row range of the tile.
+    no_wrapping : bool
+        If True, no edge wrapping applied - edge cells have less than 8 neighbours.
+    rule : Rule
+        Birth and survival rule applied to the neighbour counts.
+    """
+    (height, width) = src.shape
+    n_rows = stop - start
+    # Tile with its halo rows and one extra column on each side.
+    band = np.zeros((n_rows + 2, width + 2), dtype=np.uint8)
+    if no_wrapping:
+        (lo, hi) = (max(start - 1, 0), min(stop + 1, height))
+        band[lo - start + 1:hi - start + 1, 1:-1] = src[lo:hi]
+    else:
+        band[:, 1:-1] = src[np.arange(start - 1, stop + 1) % height]
+        band[:, 0] = band[:, -2]
+        band[:, -1] = band[:, 1]
+
+    counts = np.zeros((n_rows, width), dtype=np.uint8)
+    for (di, dj) in NEIGHBOUR_OFFSETS:
+        counts += band[1 + di:1 + di + n_rows, 1 + dj:1 + dj + width]
+    rule.apply(counts, band[1:-1, 1:-1], out=dst[start:stop])
+
+
+def _attach_buffers(names, shape) -> None:
+    """
+    Pool initializer: maps the two shared buffers into the worker process.
+    """
+    global _worker_buffers
+    shms = [shared_memory.SharedMemory(name=name) for name in names]
+    _worker_buffers = (shms, [np.ndarray(shape, dtype=np.uint8, buffer=shm.buf) for shm in shms])
+
+
+def _step_tile(args) -> None:
+    (src, start, stop, no_wrapping, rule) = args
+    buffers = _worker_buffers[1]
+    step_rows(buffers[src], buffers[1 - src], start, stop, no_wrapping, rule)
+
+
+class ParallelStepper:
+    """
+    Process pool stepping a grid held in two shared-memory buffers, swapped every generation.
+
+    Attributes
+    ----------
+    shape : tuple of int
+        Dimensions of the grid (height, width).
+    workers : int
+        Number of worker processes.
+    tiles : list of tuple of int
+        Row ranges (start, stop) stepped as independent tasks.
+    rule : Rule
+        Birth and survival rule applied to the neighbour counts.
+    """
+
+    def __init__(self, shape: tuple, workers: Optional[int] = None, tiles: Optional[int] = None,
+                 rule: Rule = CONWAY) -> None:
+        (height, width) = shape
+        self.shape = (height, width)
+        self.rule = rule
+        self.workers = workers or os.cpu_count() or 1
+        n_tiles = max(1, min(tiles or self.workers, height))
+        bounds = np.linspace(0, height, n_tiles + 1).astype(int)
+        self.tiles = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+        self._shms = [shared_memory.SharedMemory(create=True, size=max(1, height * width)) for _ in range(2)]
+        self._buffers = [np.ndarray(self.shape, dtype=np.uint8, buffer=shm.buf) for shm in self._shms]
+        self._current = 0
+        self._pool = Pool(self.workers, initializer=_attach_buffers,
+                          initargs=([shm.name for shm in self._shms], self.shape))
+        logger.info(f"Parallel stepper started: {self.workers} workers, {len(self.tiles)} tiles.")
+
+    @property
+    def grid(self) -> np.ndarray:
+        """
+        View of the current generation in shared memory.
+        """
+        return self._buffers[self._current]
+
+    @property
+    def previous(self) -> np.ndarray:
+        """
+        View of the generation before the current one, valid after a call to advance.
+        """
+        return self._buffers[1 - self._current]
+
+    def load(self, grid: np.ndarray) -> None:
+        """
+        Copies a grid into the current buffer.
+        """
+        self._buffers[self._current][...] = grid
+
+    def advance(self, generations: int = 1, no_wrapping: bool = False) -> None:
+        """
+        Steps the loaded grid ``generations`` times without leaving shared memory.
+
+        Parameters
+        ----------
+        generations : int
+            Number of generations to compute.
+        no_wrapping : bool
+            If True, no edge wrapping applied - edge cells have less than 8 neighbours.
+        """
+        for _ in range(generations):
+            self._pool.map(_step_tile, [(self._current, start, stop, no_wrapping, self.rule)
+                                        for (start, stop) in self.tiles])
+            self._current = 1 - self._current
+
+    def step(self, grid: np.ndarray, no_wrapping: bool = False) -> np.ndarray:
+        """
+        Returns the next generation of ``grid``, with the same dtype.
+        """
+        self.load(grid)
+        self.advance(1, no_wrapping)
+        return self.grid.astype(grid.dtype)
+
+    def close(self) -> None:
+        """
+        Stops the workers and releases the shared buffers.
+        """
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+        self._buffers = None
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> "ParallelStepper":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Steppers reused across step_parallel calls, keyed by (shape, workers, rule), least
+# recently used first.
+_steppers = OrderedDict()
+
+
+@atexit.register
+def _close_steppers() -> None:
+    for stepper in _steppers.values():
+        stepper.close()
+    _steppers.clear()
+
+
+def get_stepper(shape: tuple, workers: Optional[int] = None, rule: Rule = CONWAY) -> ParallelStepper:
+    """
+    Returns the cached ParallelStepper of step_parallel for a grid shape, worker count
+    and rule, starting it if needed and closing the least recently used one beyond
+    MAX_CACHED_STEPPERS.
+
+    The stepper is shared by every step_parallel call and reloaded by each of them, so
+    it must not hold a grid between calls: runs create their own with Game.create_stepper.
+    """
+    key = (tuple(shape), workers, rule)
+    if key in _steppers:
+        _steppers.move_to_end(key)
+    else:
+        _steppers[key] = ParallelStepper(shape, workers, rule=rule)
+        while len(_steppers) > MAX_CACHED_STEPPERS:
+            _steppers.popitem(last=False)[1].close()
+    return _steppers[key]
+
+
+def step_parallel(grid: np.ndarray, no_wrapping: bool = False, workers: Optional[int] = None,
+                  rule: Rule = CONWAY) -> np.ndarray:
+    """
+    Steps a grid on a process pool, reusing the pool and buffers of previous calls.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Numpy array containing 0s and 1s corresponding to dead cells and alive cells.
+    no_wrapping : bool
+        If True, no edge wrapping applied - edge cells have less than 8 neighbours.
+    workers : int, optional
+        Number of worker processes; defaults to the CPU count.
+    rule : Rule
+        Birth and survival rule applied to the neighbour counts.
+
+    Returns
+    -------
+    np.ndarray
+        Next generation, with the same dtype as ``grid``.
+    """
+    return get_stepper(grid.shape, workers, rule).step(grid, no_wrapping)
+
+
+def measure_scaling(shape: tuple = (4096, 4096), generations: int = 10,
+                    max_workers: Optional[int] = None, no_wrapping: bool = False) -> list:
+    """
+    Times ParallelStepper.advance on a random grid for 1 to ``max_workers`` workers.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Dimensions of the grid.
+    generations : int
+        Generations timed for each worker count.
+    max_workers : int, optional
+        Largest worker count measured; defaults to the CPU count.
+    no_wrapping : bool
+        Edge mode used for the measurement.
+
+    Returns
+    -------
+    list of dict
+        One entry per worker count with the elapsed seconds, cell updates per second,
+        speedup over one worker and parallel efficiency.
+    """
+    grid = np.random.default_rng(0).integers(0, 2, size=shape, dtype=np.uint8)
+    curve = []
+    for workers in range(1, (max_workers or os.cpu_count() or 1) + 1):
+        with ParallelStepper(shape, workers) as stepper:
+            stepper.load(grid)
+            stepper.advance(1, no_wrapping)  # Warm up the workers.
+            start = time.perf_counter()
+            stepper.advance(generations, no_wrapping)
+            seconds = time.perf_counter() - start
+        speedup = curve[0]["seconds"] / seconds if curve else 1.0
+        curve.append({
+            "workers": workers,
+            "seconds": seconds,
+            "cells_per_second": shape[0] * shape[1] * generations / seconds,
+            "speedup": speedup,
+            "efficiency": speedup / workers,
+        })
+        logger.info(f"Parallel scaling: {curve[-1]}.")
+    return curve
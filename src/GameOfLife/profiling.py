@@ -0,0 +1,246 @@
+"""
+Lightweight instrumentation: per-phase timers feeding latency histograms, and a
+sampling profiler recording where a thread spends its time.
+
+Timers cost two clock reads and a few arithmetic operations per phase. A disabled
+Profiler hands out a shared no-op context manager, so instrumented loops can keep
+their ``with profiler.phase(...)`` blocks at no measurable cost.
+"""
+import json
+import math
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+from GameOfLife import logger
+
+# Histogram buckets: BUCKETS_PER_OCTAVE per doubling of the latency, from MIN_LATENCY
+# seconds up to MIN_LATENCY * 2 ** OCTAVES (about 2 minutes).
+MIN_LATENCY = 1e-6
+BUCKETS_PER_OCTAVE = 4
+OCTAVES = 27
+_DISABLED = nullcontext()
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations over logarithmic buckets, so that its precision is relative
+    (about 19% per bucket) from microseconds to minutes, in constant memory.
+
+    Attributes
+    ----------
+    counts : np.ndarray
+        Number of durations in each bucket.
+    count : int
+        Number of durations recorded.
+    total, minimum, maximum : float
+        Exact sum, minimum and maximum of the durations, in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.counts = np.zeros(BUCKETS_PER_OCTAVE * OCTAVES, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds > MIN_LATENCY:
+            bucket = min(int(math.log2(seconds / MIN_LATENCY) * BUCKETS_PER_OCTAVE), len(self.counts) - 1)
+        else:
+            bucket = 0
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.minimum:
+            self.minimum = seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Returns an upper bound of the ``q``-th percentile (0 to 100): the upper edge of
+        the bucket holding it, capped by the maximum.
+        """
+        if not self.count:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.counts), math.ceil(q / 100 * self.count) or 1))
+        return min(MIN_LATENCY * 2 ** ((bucket + 1) / BUCKETS_PER_OCTAVE), self.maximum)
+
+    def summary(self) -> dict:
+        """
+        Returns the count, mean, extremes and main percentiles, in seconds.
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.minimum if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.maximum,
+        }
+
+
+class _Phase:
+    """
+    Reusable context manager timing one phase of a Profiler.
+    """
+
+    __slots__ = ("_profiler", "_histogram", "_start")
+
+    def __init__(self, profiler: "Profiler", histogram: LatencyHistogram) -> None:
+        self._profiler = profiler
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "_Phase":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        now = time.perf_counter()
+        self._histogram.record(now - self._start)
+        if self._profiler.on_report is not None:
+            self._profiler._maybe_report(now)
+
+
+class Profiler:
+    """
+    Times named phases of a loop into one LatencyHistogram per phase.
+
+    Each phase has a single timer, so a phase must not be nested in itself; different
+    phases may be timed from different threads.
+
+    Attributes
+    ----------
+    enabled : bool
+        If False, phase returns a no-op context manager and nothing is recorded.
+    histograms : dict of str to LatencyHistogram
+        Histogram of each phase timed so far.
+    on_report : callable, optional
+        Called as ``on_report(profiler)`` after a phase ends, at most every
+        ``report_interval`` seconds, e.g. to show the histograms live.
+    report_interval : float
+        Seconds between two calls to ``on_report``.
+    """
+
+    def __init__(self, enabled: bool = True, on_report: Optional[Callable[["Profiler"], None]] = None,
+                 report_interval: float = 1.0) -> None:
+        self.enabled = enabled
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.on_report = on_report
+        self.report_interval = report_interval
+        self._phases: Dict[str, _Phase] = {}
+        self._last_report = time.perf_counter()
+
+    def phase(self, name: str):
+        """
+        Returns a context manager timing the ``name`` phase.
+        """
+        if not self.enabled:
+            return _DISABLED
+        timer = self._phases.get(name)
+        if timer is None:
+            timer = self._phases[name] = _Phase(self, self.histograms.setdefault(name, LatencyHistogram()))
+        return timer
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Records a duration measured elsewhere for the ``name`` phase.
+        """
+        if self.enabled:
+            self.histograms.setdefault(name, LatencyHistogram()).record(seconds)
+
+    def _maybe_report(self, now: float) -> None:
+        if now - self._last_report >= self.report_interval:
+            self._last_report = now
+            self.on_report(self)
+
+    def summary(self) -> dict:
+        """
+        Returns the summary of the histogram of each phase.
+        """
+        return {name: histogram.summary() for (name, histogram) in self.histograms.items()}
+
+    def report(self) -> str:
+        """
+        Returns a table of the phases with their count, mean and percentiles in milliseconds.
+        """
+        lines = [f"{'phase':<12} {'count':>8} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+        for (name, stats) in self.summary().items():
+            lines.append(f"{name:<12} {stats['count']:>8}" + "".join(
+                f" {stats[key] * 1e3:>9.3f}" for key in ("mean", "p50", "p90", "p99", "max")))
+        return "\n".join(lines)
+
+    def dump(self, path: Union[str, Path]) -> None:
+        """
+        Writes the summaries and the bucket counts of every phase as JSON.
+        """
+        data = {
+            "bucket_edges": (MIN_LATENCY * 2 ** (np.arange(BUCKETS_PER_OCTAVE * OCTAVES + 1)
+                                                 / BUCKETS_PER_OCTAVE)).tolist(),
+            "phases": {name: dict(histogram.summary(), counts=histogram.counts.tolist())
+                       for (name, histogram) in self.histograms.items()},
+        }
+        with open(path, 'w') as file:
+            json.dump(data, file, indent=1)
+        logger.info(f"Profile saved to {path}.")
+
+
+class StackSampler(threading.Thread):
+    """
+    Sampling profiler: a daemon thread recording the call stack of another thread every
+    ``interval`` seconds, which costs the sampled thread nothing but the GIL hand-offs.
+
+    Stacks are counted in the collapsed format of flame graph tools (one
+    ``outer;...;inner count`` line per distinct stack).
+
+    Attributes
+    ----------
+    target : int
+        Identifier of the sampled thread.
+    interval : float
+        Seconds between two samples.
+    stacks : Counter
+        Number of samples of each collapsed stack.
+    """
+
+    def __init__(self, target: Optional[int] = None, interval: float = 0.005) -> None:
+        super().__init__(name="GameOfLifeSampler", daemon=True)
+        self.target = threading.main_thread().ident if target is None else target
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            if frame is None:
+                return
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+
+    def dump(self, path: Union[str, Path]) -> None:
+        """
+        Writes the collapsed stacks, most sampled first.
+        """
+        with open(path, 'w') as file:
+            for (stack, count) in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        logger.info(f"{sum(self.stacks.values())} stack samples saved to {path}.")
@@ -0,0 +1,410 @@
+"""
+Recording of runs: a FrameRecorder takes generations from the stepping loop through a
+bounded queue and a worker thread appends them to a delta-compressed frame log, which
+can then be exported as an animated GIF or a sequence of PNG images.
+
+Frame log layout: the 8 magic bytes, the header length as a little-endian uint32 and
+a UTF-8 JSON header (frame shape, keyframe interval), then one record per frame: the
+generation as a little-endian uint64, a kind byte (0 for a keyframe, 1 for a delta),
+the payload length as a uint32 and the payload, the zlib-compressed bit-packed frame
+or XOR with the previous frame. Unchanged regions pack to zero bytes, which zlib
+reduces to almost nothing.
+
+Usage::
+
+    python -m GameOfLife.recording run.golf run.gif --scale 4 --fps 20
+    python -m GameOfLife.recording run.golf frames/ --format png --window 0 0 128 128
+"""
+import argparse
+import json
+import queue
+import struct
+import sys
+import threading
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from GameOfLife import logger
+
+FRAME_LOG_MAGIC = b"GOLFRAME"
+FRAME_LOG_EXTENSION = ".golf"
+_RECORD = struct.Struct('<QBI')
+# Colours of dead and alive cells in the exported images.
+DEAD_COLOUR = (255, 255, 255)
+ALIVE_COLOUR = (0, 0, 0)
+
+
+def transform_frame(frame: np.ndarray, window: Optional[Tuple[int, int, int, int]] = None,
+                    pool: int = 1, scale: int = 1) -> np.ndarray:
+    """
+    Crops, shrinks and enlarges a frame with whole-array operations.
+
+    Parameters
+    ----------
+    frame : np.ndarray
+        Grid of 0s and 1s.
+    window : tuple of int, optional
+        (top, left, height, width) region kept, clipped to the frame.
+    pool : int
+        Side of the square blocks of cells merged into one pixel, alive if any of its
+        cells is; the frame is padded with dead cells to a multiple of it.
+    scale : int
+        Side of the square of pixels drawn for each cell (or block).
+
+    Returns
+    -------
+    np.ndarray
+        bool image.
+    """
+    image = np.asarray(frame, dtype=bool)
+    if window is not None:
+        (top, left, height, width) = window
+        image = image[max(top, 0):top + height, max(left, 0):left + width]
+    if pool > 1:
+        (height, width) = image.shape
+        padded = np.zeros((-(-height // pool) * pool, -(-width // pool) * pool), dtype=bool)
+        padded[:height, :width] = image
+        image = padded.reshape(padded.shape[0] // pool, pool, padded.shape[1] // pool, pool).any(axis=(1, 3))
+    if scale > 1:
+        (height, width) = image.shape
+        image = np.broadcast_to(image[:, None, :, None], (height, scale, width, scale)).reshape(
+            height * scale, width * scale)
+    return image
+
+
+class FrameRecorder:
+    """
+    Callback recording generations to a frame log without ever blocking the caller.
+
+    Calling the recorder copies the grid (cropped to ``window``) into a free buffer
+    and queues it; the worker thread packs, diffs against the previous frame,
+    compresses and writes it, then frees the buffer. When all ``queue_size`` buffers
+    are in use the frame is dropped and counted instead of waited for, so a slow disk
+    or encoder costs frames, never simulation speed.
+
+    Attributes
+    ----------
+    path : Path
+        Frame log file.
+    window : tuple of int or None
+        (top, left, height, width) region of the grids recorded, or None for all of it.
+    keyframe_interval : int
+        Frames between two keyframes; the others are stored as deltas.
+    recorded, dropped : int
+        Frames written, and frames dropped because the queue was full.
+    error : Exception or None
+        Exception raised by the worker thread, if any; raised again by close.
+    """
+
+    def __init__(self, path: Union[str, Path], window: Optional[Tuple[int, int, int, int]] = None,
+                 queue_size: int = 32, keyframe_interval: int = 100, compression: int = 1) -> None:
+        if queue_size < 1 or keyframe_interval < 1:
+            raise ValueError("queue_size and keyframe_interval must be at least 1.")
+        self.path = Path(path)
+        self.window = window
+        self.keyframe_interval = keyframe_interval
+        self.recorded = 0
+        self.dropped = 0
+        self.error = None
+        self._queue_size = queue_size
+        self._compression = compression
+        self._queue = queue.Queue()
+        self._free = queue.SimpleQueue()
+        self._shape = None
+        self._worker = None
+        self._file = None
+        self._last_dropped = None
+
+    def __call__(self, generation: int, grid: np.ndarray) -> bool:
+        """
+        Queues a generation, returning False if it was dropped.
+        """
+        if self.window is not None:
+            (top, left, height, width) = self.window
+            grid = grid[max(top, 0):top + height, max(left, 0):left + width]
+        if self._worker is None:
+            self._start(grid.shape)
+        elif grid.shape != self._shape:
+            logger.error(f"Frame of shape {grid.shape} recorded in a log of shape {self._shape}.")
+            raise ValueError("All the frames of a recording must have the same shape.")
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            self._last_dropped = generation
+            return False
+        np.copyto(buffer, grid, casting='unsafe')
+        self._queue.put((generation, buffer))
+        return True
+
+    def _start(self, shape: Tuple[int, int]) -> None:
+        self._shape = tuple(shape)
+        for _ in range(self._queue_size):
+            self._free.put(np.empty(self._shape, dtype=bool))
+        header = json.dumps({"version": 1, "shape": list(self._shape), "window": self.window,
+                             "keyframe_interval": self.keyframe_interval}).encode('utf-8')
+        self._file = open(self.path, 'wb')
+        self._file.write(FRAME_LOG_MAGIC + struct.pack('<I', len(header)) + header)
+        self._worker = threading.Thread(target=self._encode_loop, name="GameOfLifeRecorder", daemon=True)
+        self._worker.start()
+
+    def _encode_loop(self) -> None:
+        previous = None
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            (generation, buffer) = item
+            try:
+                packed = np.packbits(buffer, axis=None)
+                self._free.put(buffer)
+                if self.error is not None:
+                    continue
+                # Frames are numbered by their position, so deltas survive dropped frames.
+                if previous is None or self.recorded % self.keyframe_interval == 0:
+                    (kind, payload) = (0, packed)
+                else:
+                    (kind, payload) = (1, np.bitwise_xor(packed, previous))
+                data = zlib.compress(payload.tobytes(), self._compression)
+                self._file.write(_RECORD.pack(generation, kind, len(data)) + data)
+                previous = packed
+                self.recorded += 1
+            except Exception as e:
+                logger.error(f"Recording stopped: {e}")
+                self.error = e
+
+    def close(self) -> None:
+        """
+        Writes the queued frames, closes the log and reports the dropped frames.
+
+        Raises
+        ------
+        Exception
+            The error of the worker thread, if encoding or writing failed.
+        """
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+            self._file.close()
+        if self.dropped:
+            logger.info(f"Recording {self.path}: {self.recorded} frames written, {self.dropped} dropped"
+                        f" (last one at generation {self._last_dropped}).")
+        else:
+            logger.info(f"Recording {self.path}: {self.recorded} frames written.")
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> "FrameRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_frames(path: Union[str, Path]) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Reads back a frame log.
+
+    Yields
+    ------
+    tuple
+        (generation, frame) of each recorded frame, the frame as a bool array.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a frame log.
+    """
+    with open(path, 'rb') as file:
+        prefix = file.read(len(FRAME_LOG_MAGIC) + 4)
+        if prefix[:len(FRAME_LOG_MAGIC)] != FRAME_LOG_MAGIC:
+            logger.error(f"{path} is not a frame log.")
+            raise ValueError(f"Error reading frame log: {path}")
+        (header_size,) = struct.unpack('<I', prefix[len(FRAME_LOG_MAGIC):])
+        header = json.loads(file.read(header_size).decode('utf-8'))
+        (height, width) = header["shape"]
+        packed = None
+        while True:
+            record = file.read(_RECORD.size)
+            if len(record) < _RECORD.size:
+                return
+            (generation, kind, size) = _RECORD.unpack(record)
+            payload = np.frombuffer(zlib.decompress(file.read(size)), dtype=np.uint8)
+            packed = payload if kind == 0 else np.bitwise_xor(packed, payload)
+            yield (generation, np.unpackbits(packed, count=height * width).reshape(height, width).astype(bool))
+
+
+def _lzw_encode(indices: bytes, min_code_size: int) -> bytes:
+    """
+    GIF variant of LZW: variable code width from min_code_size + 1 to 12 bits, codes
+    packed least significant bit first, table reset with a clear code when full.
+    """
+    clear = 1 << min_code_size
+    end = clear + 1
+    out = bytearray()
+    (bits, nbits) = (0, 0)
+    code_size = min_code_size + 1
+    next_code = end + 1
+    table = {}
+
+    def emit(code, width):
+        nonlocal bits, nbits
+        bits |= code << nbits
+        nbits += width
+        while nbits >= 8:
+            out.append(bits & 0xFF)
+            bits >>= 8
+            nbits -= 8
+
+    emit(clear, code_size)
+    prefix = indices[0]
+    for byte in indices[1:]:
+        key = (prefix << 8) | byte
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix, code_size)
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+            # Decoders add their entry one code later, hence the + 1.
+            if next_code > (1 << code_size) and code_size < 12:
+                code_size += 1
+        else:
+            emit(clear, code_size)
+            table.clear()
+            (code_size, next_code) = (min_code_size + 1, end + 1)
+        prefix = byte
+    emit(prefix, code_size)
+    emit(end, code_size)
+    if nbits:
+        out.append(bits & 0xFF)
+    return bytes(out)
+
+
+def _sub_blocks(data: bytes) -> bytes:
+    return b"".join(bytes([len(data[i:i + 255])]) + data[i:i + 255] for i in range(0, len(data), 255)) + b"\x00"
+
+
+def export_gif(frames: Iterator[Tuple[int, np.ndarray]], path: Union[str, Path], fps: float = 10) -> int:
+    """
+    Writes frames as a looping animated GIF.
+
+    Each frame after the first only encodes the bounding box of the pixels that
+    changed, drawn over the previous one.
+
+    Parameters
+    ----------
+    frames : iterator of tuple
+        (generation, image) pairs, images being bool arrays of the same shape.
+    path : str or Path
+        Destination file.
+    fps : float
+        Frames per second of the animation (GIF delays are in hundredths of a second).
+
+    Returns
+    -------
+    int
+        Number of frames written.
+    """
+    delay = max(int(round(100 / fps)), 1)
+    count = 0
+    previous = None
+    with open(path, 'wb') as file:
+        for (_, image) in frames:
+            (height, width) = image.shape
+            if previous is None:
+                file.write(b"GIF89a" + struct.pack('<HHBBB', width, height, 0x80, 0, 0)
+                           + bytes(DEAD_COLOUR) + bytes(ALIVE_COLOUR)
+                           + b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00")
+                (top, left, bottom, right) = (0, 0, height, width)
+            else:
+                changed = image != previous
+                rows = np.flatnonzero(changed.any(axis=1))
+                if len(rows):
+                    cols = np.flatnonzero(changed[rows[0]:rows[-1] + 1].any(axis=0))
+                    (top, left, bottom, right) = (rows[0], cols[0], rows[-1] + 1, cols[-1] + 1)
+                else:
+                    (top, left, bottom, right) = (0, 0, 1, 1)
+            # Graphic control extension: keep the previous frame under this one.
+            file.write(b"\x21\xF9\x04" + struct.pack('<BHBB', 0x04, delay, 0, 0))
+            file.write(b"\x2C" + struct.pack('<HHHHB', left, top, right - left, bottom - top, 0))
+            indices = image[top:bottom, left:right].astype(np.uint8).tobytes()
+            file.write(b"\x02" + _sub_blocks(_lzw_encode(indices, 2)))
+            previous = image
+            count += 1
+        if previous is None:
+            raise ValueError("No frame to export.")
+        file.write(b"\x3B")
+    return count
+
+
+def _png_bytes(image: np.ndarray) -> bytes:
+    """
+    Encodes a bool image as a 1-bit grayscale PNG, alive cells black.
+    """
+    (height, width) = image.shape
+    rows = np.packbits(~image, axis=1)
+    raw = np.zeros((height, rows.shape[1] + 1), dtype=np.uint8)
+    raw[:, 1:] = rows
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + chunk(b"IEND", b""))
+
+
+def export_png(frames: Iterator[Tuple[int, np.ndarray]], directory: Union[str, Path]) -> int:
+    """
+    Writes frames as PNG images named after their generation in a directory.
+
+    Returns
+    -------
+    int
+        Number of frames written.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for (generation, image) in frames:
+        (directory / f"frame-{generation:09d}.png").write_bytes(_png_bytes(image))
+        count += 1
+    return count
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export a Game of Life frame log as a GIF or PNG images.")
+    parser.add_argument('log', help='Frame log recorded by FrameRecorder.')
+    parser.add_argument('output', help='GIF file, or directory of PNG images.')
+    parser.add_argument('--format', choices=['gif', 'png'], help='Output format (default: from the extension).')
+    parser.add_argument('--window', type=int, nargs=4, metavar=('TOP', 'LEFT', 'HEIGHT', 'WIDTH'),
+                        help='Region of the frames exported.')
+    parser.add_argument('--pool', type=int, default=1, help='Merge square blocks of cells into one pixel.')
+    parser.add_argument('--scale', type=int, default=1, help='Pixels per cell.')
+    parser.add_argument('--every', type=int, default=1, help='Export one recorded frame out of EVERY.')
+    parser.add_argument('--fps', type=float, default=10, help='Frames per second of a GIF.')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point exporting a frame log.
+    """
+    args = parse_arguments(argv)
+    frames = ((generation, transform_frame(frame, args.window, args.pool, args.scale))
+              for (i, (generation, frame)) in enumerate(read_frames(args.log)) if i % args.every == 0)
+    if (args.format or ('gif' if args.output.lower().endswith('.gif') else 'png')) == 'gif':
+        count = export_gif(frames, args.output, args.fps)
+    else:
+        count = export_png(frames, args.output)
+    print(f"{count} frames exported to {args.output}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
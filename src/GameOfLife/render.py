@@ -0,0 +1,174 @@
+"""
+Frame computations for the terminal interface, kept free of curses: what has to be
+drawn is worked out with array operations, and the interface only issues the writes.
+
+A frame is a 2D array of Unicode code points, one per screen character. At zoom level
+0 each cell is drawn as a character followed by a blank; zooming out packs 1x2 cells
+into half-block characters (level 1), then 2x4 cells into braille characters (level 2),
+cells being first merged into 2x2, 4x4, ... blocks, alive if any of their cells is, at
+the following levels.
+"""
+from typing import Tuple
+
+import numpy as np
+
+ALIVE_CHAR = 'o'
+DEAD_CHAR = ' '
+# Half-block characters indexed by top cell + 2 * bottom cell.
+HALF_BLOCKS = np.array([ord(' '), ord('▀'), ord('▄'), ord('█')], dtype=np.uint32)
+# Bit of each of the 4x2 dots of a braille character, added to U+2800.
+BRAILLE_BASE = 0x2800
+BRAILLE_DOTS = np.array([[0x01, 0x08],
+                         [0x02, 0x10],
+                         [0x04, 0x20],
+                         [0x40, 0x80]], dtype=np.uint32)
+
+
+def _cells_per_glyph(zoom: int) -> Tuple[int, int]:
+    """
+    Returns the (rows, columns) of cells drawn by one screen character at a zoom level above 0.
+    """
+    if zoom == 1:
+        return (2, 1)
+    factor = 2 ** (zoom - 2)
+    return (4 * factor, 2 * factor)
+
+
+def window_shape(screen_shape: Tuple[int, int], zoom: int) -> Tuple[int, int]:
+    """
+    Returns the dimensions of the largest window of cells fitting a screen area.
+
+    Parameters
+    ----------
+    screen_shape : tuple of int
+        (rows, columns) of screen characters available.
+    zoom : int
+        Zoom level.
+
+    Returns
+    -------
+    tuple of int
+        (height, width) in cells.
+    """
+    (rows, cols) = screen_shape
+    if zoom == 0:
+        return (rows, (cols + 1) // 2)
+    (cell_rows, cell_cols) = _cells_per_glyph(zoom)
+    return (rows * cell_rows, cols * cell_cols)
+
+
+def fit_zoom(grid_shape: Tuple[int, int], screen_shape: Tuple[int, int]) -> int:
+    """
+    Returns the lowest zoom level at which a whole grid fits a screen area.
+    """
+    zoom = 0
+    while True:
+        (height, width) = window_shape(screen_shape, zoom)
+        if height >= grid_shape[0] and width >= grid_shape[1]:
+            return zoom
+        zoom += 1
+
+
+def _pad_to(cells: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    (height, width) = cells.shape
+    return np.pad(cells, ((0, -height % rows), (0, -width % cols)))
+
+
+def glyphs(window: np.ndarray, zoom: int = 0) -> np.ndarray:
+    """
+    Draws a window of cells as screen characters.
+
+    Only ``window`` is read, with whole-array reductions over its blocks of cells, so
+    the cost depends on the size of the window and not on the grid it is taken from.
+
+    Parameters
+    ----------
+    window : np.ndarray
+        2D array containing 0s and 1s.
+    zoom : int
+        Zoom level.
+
+    Returns
+    -------
+    np.ndarray
+        uint32 array of code points, one per screen character.
+    """
+    cells = np.asarray(window) != 0
+    (height, width) = cells.shape
+    if zoom == 0:
+        codes = np.full((height, max(2 * width - 1, 0)), ord(DEAD_CHAR), dtype=np.uint32)
+        codes[:, ::2] = np.where(cells, ord(ALIVE_CHAR), ord(DEAD_CHAR))
+        return codes
+    if zoom == 1:
+        cells = _pad_to(cells, 2, 1)
+        return HALF_BLOCKS[cells[0::2].astype(np.intp) + 2 * cells[1::2]]
+
+    factor = 2 ** (zoom - 2)
+    if factor > 1:
+        cells = _pad_to(cells, factor, factor)
+        (height, width) = cells.shape
+        cells = cells.reshape(height // factor, factor, width // factor, factor).any(axis=(1, 3))
+    cells = _pad_to(cells, 4, 2)
+    (height, width) = cells.shape
+    dots = cells.reshape(height // 4, 4, width // 2, 2) * BRAILLE_DOTS[None, :, None, :]
+    return BRAILLE_BASE + dots.sum(axis=(1, 3), dtype=np.uint32)
+
+
+def glyph_text(codes: np.ndarray) -> str:
+    """
+    Returns the text of a row of code points.
+    """
+    return np.ascontiguousarray(codes, dtype='<u4').tobytes().decode('utf-32-le')
+
+
+def render_cells(cells: np.ndarray) -> str:
+    """
+    Returns the text of a row of cells at zoom level 0, one character per cell
+    separated by blanks.
+
+    Parameters
+    ----------
+    cells : np.ndarray
+        1D array containing 0s and 1s.
+
+    Returns
+    -------
+    str
+        Text spanning ``2 * len(cells) - 1`` columns.
+    """
+    return glyph_text(glyphs(np.asarray(cells)[None, :])[0])
+
+
+def changed_runs(previous: np.ndarray, current: np.ndarray,
+                 merge_gap: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the horizontal runs of cells that differ between two frames.
+
+    The frames are compared as a whole (``previous != current``, the XOR of two 0/1
+    grids), so the cost of the Python work left to the caller is proportional to the
+    number of runs, not to the grid size.
+
+    Parameters
+    ----------
+    previous, current : np.ndarray
+        Frames of the same shape.
+    merge_gap : int
+        Runs on the same row separated by at most this many unchanged cells are merged,
+        trading a few redrawn cells for fewer writes.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (rows, starts, stops): each run covers ``current[row, start:stop]``.
+    """
+    width = current.shape[1]
+    changed = np.flatnonzero(np.not_equal(previous, current))
+    if not len(changed):
+        empty = np.zeros(0, dtype=np.intp)
+        return (empty, empty, empty)
+
+    # A run ends where the next changed cell is too far away or on another row.
+    breaks = np.flatnonzero((np.diff(changed) > merge_gap + 1) | (np.diff(changed // width) != 0))
+    firsts = changed[np.concatenate([[0], breaks + 1])]
+    lasts = changed[np.concatenate([breaks, [len(changed) - 1]])]
+    return (firsts // width, firsts % width, lasts % width + 1)
@@ -0,0 +1,145 @@
+"""
+Outer-totalistic rules in B/S notation (e.g. B3/S23 for Conway's Game of Life), compiled
+into birth/survival lookup tables for the stepping kernels.
+"""
+import re
+from typing import Iterable, Optional
+
+import numpy as np
+
+# Common rules that can be given by name instead of B/S notation.
+NAMED_RULES = {
+    "life": "B3/S23",
+    "conway": "B3/S23",
+    "highlife": "B36/S23",
+    "daynight": "B3678/S34678",
+    "seeds": "B2/S",
+}
+
+_BS_PATTERN = re.compile(r'^B([0-8]*)/?S([0-8]*)$', re.IGNORECASE)
+_SB_PATTERN = re.compile(r'^S([0-8]*)/?B([0-8]*)$', re.IGNORECASE)
+# Legacy "survival/birth" notation, e.g. 23/3.
+_LEGACY_PATTERN = re.compile(r'^([0-8]*)/([0-8]*)$')
+
+
+class Rule:
+    """
+    Outer-totalistic rule: a dead cell is born if its count of alive neighbours is in
+    ``birth``, an alive cell survives if it is in ``survival``.
+
+    Attributes
+    ----------
+    birth, survival : frozenset of int
+        Neighbour counts (0 to 8) giving birth to a dead cell / keeping an alive cell alive.
+    table : np.ndarray
+        uint8 lookup table of shape (2, 9): ``table[state, count]`` is the next state of
+        a cell in ``state`` with ``count`` alive neighbours.
+    terms : tuple of (int, bool or None)
+        The table compiled for whole-array evaluation: one ``(count, state)`` term per
+        count leading to an alive cell, ``state`` being the state the cell must be in,
+        or None if any state works.
+    """
+
+    def __init__(self, birth: Iterable[int], survival: Iterable[int]) -> None:
+        self.birth = frozenset(birth)
+        self.survival = frozenset(survival)
+        if not self.birth | self.survival <= set(range(9)):
+            raise ValueError("Neighbour counts of a rule must be between 0 and 8.")
+        self.table = np.zeros((2, 9), dtype=np.uint8)
+        self.table[0, sorted(self.birth)] = 1
+        self.table[1, sorted(self.survival)] = 1
+
+        terms = []
+        for count in range(9):
+            (born, survives) = self.table[:, count]
+            if born and survives:
+                terms.append((count, None))
+            elif born:
+                terms.append((count, False))
+            elif survives:
+                terms.append((count, True))
+        self.terms = tuple(terms)
+
+    @classmethod
+    def from_string(cls, notation: str) -> "Rule":
+        """
+        Parses a rule given in B/S notation ("B36/S23"), S/B notation ("S23/B36"),
+        legacy survival/birth notation ("23/36") or by name ("highlife").
+
+        Raises
+        ------
+        ValueError
+            If the notation is not recognised.
+        """
+        text = re.sub(r'\s+', '', notation)
+        text = NAMED_RULES.get(text.lower(), text)
+        match = _BS_PATTERN.match(text)
+        if match:
+            (birth, survival) = match.groups()
+        elif _SB_PATTERN.match(text):
+            (survival, birth) = _SB_PATTERN.match(text).groups()
+        elif _LEGACY_PATTERN.match(text):
+            (survival, birth) = _LEGACY_PATTERN.match(text).groups()
+        else:
+            raise ValueError(f"Invalid rule '{notation}', expected B/S notation such as B3/S23.")
+        return cls((int(c) for c in birth), (int(c) for c in survival))
+
+    def __str__(self) -> str:
+        return "B{}/S{}".format(''.join(map(str, sorted(self.birth))), ''.join(map(str, sorted(self.survival))))
+
+    def __repr__(self) -> str:
+        return f"Rule('{self}')"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return (self.birth, self.survival) == (other.birth, other.survival)
+
+    def __hash__(self) -> int:
+        return hash((self.birth, self.survival))
+
+    def apply(self, counts: np.ndarray, alive: np.ndarray, out: Optional[np.ndarray] = None,
+              scratch: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Computes the next states from neighbour counts with whole-array comparisons.
+
+        Each term costs one comparison, plus one mask with the current state and one OR
+        when needed, so B3/S23 compiles to exactly the operations of a hard-coded kernel.
+
+        Parameters
+        ----------
+        counts : np.ndarray
+            Number of alive neighbours of each cell.
+        alive : np.ndarray
+            Current states (0 or 1), same shape as ``counts``.
+        out : np.ndarray, optional
+            Array receiving the next states; a new bool array is returned if None.
+        scratch : np.ndarray, optional
+            Preallocated bool array of the same shape, to avoid temporary allocations.
+
+        Returns
+        -------
+        np.ndarray
+            ``out``, holding 1 for alive cells in the next generation.
+        """
+        if out is None:
+            out = np.empty(counts.shape, dtype=bool)
+        if not self.terms:
+            out[...] = 0
+            return out
+        if scratch is None and len(self.terms) > 1:
+            scratch = np.empty(counts.shape, dtype=bool)
+        for (i, (count, state)) in enumerate(self.terms):
+            target = scratch if i else out
+            np.equal(counts, count, out=target)
+            if state is True:
+                np.logical_and(target, alive, out=target)
+            elif state is False:
+                # For 0/1 values, a > b is a & ~b.
+                np.greater(target, alive, out=target)
+            if i:
+                np.logical_or(out, scratch, out=out)
+        return out
+
+
+CONWAY = Rule.from_string("B3/S23")
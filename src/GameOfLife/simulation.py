@@ -0,0 +1,215 @@
+"""
+Background simulation thread, so that the simulation speed does not depend on how fast
+generations can be displayed.
+"""
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+import numpy as np
+from GameOfLife import logger
+from GameOfLife.game import Game
+from GameOfLife.profiling import Profiler
+
+# Only given by the caller, so only imported by it.
+if TYPE_CHECKING:
+    from GameOfLife.cycles import CycleDetector
+    from GameOfLife.history import GenerationHistory
+
+# Seconds between two publications of the current generation when running unthrottled.
+PUBLISH_INTERVAL = 1 / 60
+
+
+class SimulationThread(threading.Thread):
+    """
+    Daemon thread stepping a grid with a stepper of the game, at a target speed or as
+    fast as possible, and publishing the latest completed generation.
+
+    The stepper is only used by this thread. Publishing copies the grid, so readers
+    get a stable array; when unthrottled, a copy is only made every PUBLISH_INTERVAL
+    seconds and the generations in between are never copied.
+
+    Attributes
+    ----------
+    speed : float or None
+        Target number of generations per second, or None for as fast as possible.
+    paused : bool
+        True while the simulation is paused.
+    detector : CycleDetector or None
+        Detector fed every generation; the simulation pauses once it finds a cycle.
+    error : Exception or None
+        Exception that stopped the thread, if any.
+    profiler : Profiler
+        Profiler timing the "step" and "publish" phases of the thread; disabled by default.
+    recorder : callable or None
+        Called as ``recorder(generation, grid)`` after every step, e.g. a FrameRecorder;
+        ``grid`` is only valid during the call.
+    history : GenerationHistory or None
+        History storing every generation, which step_back restores generations from.
+    """
+
+    def __init__(self, game, grid: np.ndarray, no_wrapping: bool = False, speed: Optional[float] = None,
+                 detector: Optional["CycleDetector"] = None, profiler: Optional[Profiler] = None,
+                 recorder: Optional[Callable[[int, np.ndarray], None]] = None,
+                 history: Optional["GenerationHistory"] = None) -> None:
+        super().__init__(name="GameOfLifeSimulation", daemon=True)
+        self._stepper = game.create_stepper(grid.shape)
+        self._stepper.load(grid)
+        self._no_wrapping = no_wrapping
+        self._condition = threading.Condition()
+        self._speed = speed
+        self._paused = False
+        self._pending_steps = 0
+        self._pending_back = 0
+        self._stopped = False
+        self._generation = game.generation
+        self._latest = (game.generation, np.array(grid, copy=True))
+        self.detector = detector
+        if detector is not None:
+            detector.update(self._generation, self._stepper.grid)
+        self.error = None
+        self.profiler = profiler if profiler is not None else Profiler(enabled=False)
+        self.recorder = recorder
+        self.history = history
+        if history is not None:
+            history.truncate(self._generation - 1)
+            history.append(self._generation, grid)
+
+    @property
+    def speed(self) -> Optional[float]:
+        return self._speed
+
+    @speed.setter
+    def speed(self, value: Optional[float]) -> None:
+        if value is not None and value <= 0:
+            raise ValueError("speed must be positive, or None for as fast as possible.")
+        with self._condition:
+            self._speed = value
+            self._condition.notify()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def pause(self) -> None:
+        with self._condition:
+            self._paused = True
+
+    def resume(self) -> None:
+        with self._condition:
+            self._paused = False
+            self._condition.notify()
+
+    def step_once(self) -> None:
+        """
+        Computes a single generation while paused.
+        """
+        with self._condition:
+            self._pending_steps += 1
+            self._condition.notify()
+
+    def step_back(self, count: int = 1) -> None:
+        """
+        Pauses and goes back ``count`` generations in the history, or to the oldest one
+        stored. The generations after it are forgotten, and computed again when stepping on.
+        """
+        if self.history is None:
+            logger.error("Stepping back without a history.")
+            raise ValueError("step_back needs a history.")
+        with self._condition:
+            self._paused = True
+            self._pending_back += count
+            self._condition.notify()
+
+    def _rewind(self, count: int) -> None:
+        generation = self.history.previous(self._generation, count)
+        if generation is None:
+            return
+        grid = self.history.seek(generation)
+        self.history.truncate(generation)
+        self._stepper.load(grid)
+        self._generation = generation
+        if self.detector is not None:
+            self.detector.reset()
+            self.detector.update(generation, self._stepper.grid)
+        self._publish()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the thread and waits for the current generation to complete. The stepper
+        is closed once the thread is done with it.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self.ident is None:
+            Game.close_stepper(self._stepper)
+        elif self.is_alive():
+            self.join(timeout)
+
+    def latest(self) -> Tuple[int, np.ndarray]:
+        """
+        Returns the generation number and a copy of the latest generation published.
+        """
+        return self._latest
+
+    def _publish(self) -> None:
+        with self.profiler.phase("publish"):
+            self._latest = (self._generation, np.array(self._stepper.grid, copy=True))
+
+    def run(self) -> None:
+        # Time the last step was due, which paces the next one at the target speed.
+        last_step = time.perf_counter()
+        last_publish = last_step
+        try:
+            while True:
+                with self._condition:
+                    while not self._stopped and self._paused and not self._pending_steps and not self._pending_back:
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+                    (back, self._pending_back) = (self._pending_back, 0)
+                    if back:
+                        with self.profiler.phase("seek"):
+                            self._rewind(back)
+                        continue
+                    if self._paused:
+                        self._pending_steps -= 1
+                    elif self._speed is not None:
+                        # Sleep until the step is due, waking up early on speed changes.
+                        delay = last_step + 1 / self._speed - time.perf_counter()
+                        if delay > 0:
+                            self._condition.wait(delay)
+                            continue
+                    speed = None if self._paused else self._speed
+
+                with self.profiler.phase("step"):
+                    self._stepper.advance(1, self._no_wrapping)
+                self._generation += 1
+                if self.recorder is not None:
+                    with self.profiler.phase("record"):
+                        self.recorder(self._generation, self._stepper.grid)
+                if self.history is not None:
+                    with self.profiler.phase("history"):
+                        self.history.append(self._generation, self._stepper.grid)
+                if self.detector is not None and self.detector.cycle is None:
+                    if self.detector.update(self._generation, self._stepper.grid) is not None:
+                        logger.info(f"Cycle found: {self.detector.cycle}.")
+                        self.pause()
+                        speed = None
+                now = time.perf_counter()
+                if speed is None:
+                    last_step = now
+                    if self._paused or now - last_publish >= PUBLISH_INTERVAL:
+                        self._publish()
+                        last_publish = now
+                else:
+                    # Late steps are not made up for, to avoid bursts after a slow one.
+                    last_step = max(last_step + 1 / speed, now - 1 / speed)
+                    self._publish()
+        except Exception as e:
+            logger.error(f"Simulation stopped: {e}")
+            self.error = e
+        finally:
+            self._publish()
+            Game.close_stepper(self._stepper)
@@ -0,0 +1,168 @@
+"""
+Binary snapshot format: a small JSON header (shape, rule, generation, edge mode) followed
+by the bit-packed grid, which is memory-mapped on loading instead of being read.
+
+Layout: the 8 magic bytes, the header length as a little-endian uint32, the UTF-8 JSON
+header padded with spaces to a multiple of 64 bytes, then the BitGrid words as
+little-endian uint64, row by row.
+"""
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+from GameOfLife import logger
+from GameOfLife.bitgrid import WORD_DTYPE, BitGrid
+from GameOfLife.rules import CONWAY, Rule
+
+SNAPSHOT_MAGIC = b"GOLSNAP\x01"
+SNAPSHOT_EXTENSION = ".gols"
+_HEADER_ALIGNMENT = 64
+
+
+class Snapshot:
+    """
+    Grid loaded from a snapshot file, with the state saved alongside it.
+
+    Attributes
+    ----------
+    grid : BitGrid
+        Packed grid; its words are memory-mapped from the file when loaded with mmap.
+    rule : Rule
+        Rule the grid was evolving under.
+    generation : int
+        Generation number of the grid.
+    no_wrapping : bool
+        Edge mode the grid was evolving under.
+    metadata : dict
+        Every header field, including ones added by newer writers.
+    """
+
+    def __init__(self, grid: BitGrid, rule: Rule, generation: int, no_wrapping: bool, metadata: dict) -> None:
+        self.grid = grid
+        self.rule = rule
+        self.generation = generation
+        self.no_wrapping = no_wrapping
+        self.metadata = metadata
+
+    @property
+    def shape(self) -> tuple:
+        return self.grid.shape
+
+
+def is_snapshot(path: Union[str, Path]) -> bool:
+    """
+    Returns True if the file starts with the snapshot magic bytes.
+    """
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+    except OSError:
+        return False
+
+
+def save_snapshot(path: Union[str, Path], grid: Union[np.ndarray, BitGrid], rule: Rule = CONWAY,
+                  generation: int = 0, no_wrapping: bool = False, **metadata) -> None:
+    """
+    Writes a grid and its state to a snapshot file.
+
+    Parameters
+    ----------
+    path : str or Path
+        Destination file path.
+    grid : np.ndarray or BitGrid
+        Grid to save; dense grids are packed first.
+    rule : Rule
+        Rule the grid is evolving under.
+    generation : int
+        Generation number of the grid.
+    no_wrapping : bool
+        Edge mode the grid is evolving under.
+    **metadata
+        Extra JSON-serialisable header fields.
+    """
+    packed = grid if isinstance(grid, BitGrid) else BitGrid.from_array(grid)
+    header = dict(metadata, version=1, shape=list(packed.shape), rule=str(rule),
+                  generation=int(generation), no_wrapping=bool(no_wrapping))
+    encoded = json.dumps(header).encode('utf-8')
+    prefix_size = len(SNAPSHOT_MAGIC) + 4
+    padded_size = -(-(prefix_size + len(encoded)) // _HEADER_ALIGNMENT) * _HEADER_ALIGNMENT - prefix_size
+    encoded = encoded.ljust(padded_size, b' ')
+    try:
+        with open(path, 'wb') as file:
+            file.write(SNAPSHOT_MAGIC + struct.pack('<I', len(encoded)) + encoded)
+            np.ascontiguousarray(packed.words, dtype=WORD_DTYPE).tofile(file)
+        logger.info(f"Snapshot of generation {generation} saved to {path}.")
+    except Exception as e:
+        logger.error(f"Failed to save snapshot: {e}")
+        raise
+
+
+def load_snapshot(path: Union[str, Path], mmap: bool = True) -> Snapshot:
+    """
+    Opens a snapshot file.
+
+    Parameters
+    ----------
+    path : str or Path
+        Snapshot file path.
+    mmap : bool
+        If True, the grid words are a read-only memory map of the file, so opening
+        costs the same whatever the grid size; otherwise they are read into memory.
+
+    Returns
+    -------
+    Snapshot
+        The grid and its saved state.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a valid snapshot.
+    """
+    try:
+        with open(path, 'rb') as file:
+            prefix = file.read(len(SNAPSHOT_MAGIC) + 4)
+            if prefix[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError("missing magic bytes")
+            (header_size,) = struct.unpack('<I', prefix[len(SNAPSHOT_MAGIC):])
+            header = json.loads(file.read(header_size).decode('utf-8'))
+        _check_header(header)
+        rule = Rule.from_string(header["rule"])
+        (height, width) = header["shape"]
+        words_shape = (height, -(-width // 64))
+        offset = len(prefix) + header_size
+        expected_size = offset + height * words_shape[1] * WORD_DTYPE.itemsize
+        if os.path.getsize(path) < expected_size:
+            raise ValueError(f"file truncated, {expected_size} bytes expected")
+    except (OSError, ValueError, struct.error) as e:
+        logger.error(f"Failed to read snapshot {path}: {e}")
+        raise ValueError(f"Error reading snapshot file: {path}") from e
+
+    if mmap and height * words_shape[1]:
+        words = np.memmap(path, dtype=WORD_DTYPE, mode='r', offset=offset, shape=words_shape)
+    else:
+        words = np.fromfile(path, dtype=WORD_DTYPE, offset=offset).reshape(words_shape)
+    return Snapshot(BitGrid(words, (height, width)), rule, header["generation"], header["no_wrapping"], header)
+
+
+def _check_header(header) -> None:
+    """
+    Raises ValueError if a decoded header lacks a field read by load_snapshot, or has
+    one of the wrong type.
+    """
+    if not isinstance(header, dict):
+        raise ValueError("header is not a JSON object")
+    shape = header.get("shape")
+    if not (isinstance(shape, list) and len(shape) == 2
+            and all(isinstance(side, int) and not isinstance(side, bool) and side >= 0 for side in shape)):
+        raise ValueError(f"invalid shape {shape!r}")
+    if not isinstance(header.get("rule"), str):
+        raise ValueError(f"invalid rule {header.get('rule')!r}")
+    generation = header.get("generation")
+    if not isinstance(generation, int) or isinstance(generation, bool):
+        raise ValueError(f"invalid generation {generation!r}")
+    if not isinstance(header.get("no_wrapping"), bool):
+        raise ValueError(f"invalid no_wrapping {header.get('no_wrapping')!r}")
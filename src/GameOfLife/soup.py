@@ -0,0 +1,294 @@
+"""
+Soup search: runs many random soups on a process pool until each one stabilises into
+still lifes and oscillators or hits a generation cap, and collects their lifespans
+and final populations.
+
+Results are appended to a JSON Lines checkpoint as soups finish, so an interrupted
+search resumes by skipping the soups already in the file. The first line of the file
+holds the parameters of the search, and a search with other parameters refuses to
+resume from it.
+
+Usage::
+
+    python -m GameOfLife.soup --soups 10000 --size 64 64 --density 0.35 --checkpoint soups.jsonl
+"""
+import argparse
+import json
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import numpy as np
+from GameOfLife import LOG_DIR, logger, setup_logging
+from GameOfLife.game import BACKENDS, Game
+from GameOfLife.rules import CONWAY, Rule
+
+# Soups sent to a worker at a time.
+CHUNK_SIZE = 16
+
+
+def soup_grid(seed: int, index: int, shape: Tuple[int, int], density: float) -> np.ndarray:
+    """
+    Returns soup ``index`` of a search, drawn from its own np.random.Generator seeded
+    with (seed, index), so that a soup is the same whichever worker runs it.
+    """
+    rng = np.random.default_rng([seed, index])
+    return (rng.random(shape) < density).astype(np.uint8)
+
+
+def run_soup(index: int, seed: int = 0, shape: Tuple[int, int] = (64, 64), density: float = 0.35,
+             rule: Optional[str] = None, max_generations: int = 10_000, no_wrapping: bool = False,
+             backend: str = "bitpacked", cycle_history: int = 256) -> dict:
+    """
+    Runs one soup until it stabilises or reaches ``max_generations``.
+
+    Parameters
+    ----------
+    index : int
+        Index of the soup in the search.
+    seed : int
+        Seed of the search.
+    shape : tuple of int
+        Dimensions of the soup.
+    density : float
+        Probability of a cell being alive at start.
+    rule : str, optional
+        Rule in B/S notation or by name; Conway's B3/S23 if None.
+    max_generations : int
+        Generation cap.
+    no_wrapping : bool
+        If True, no edge wrapping applied - edge cells have less than 8 neighbours.
+    backend : str
+        Stepping kernel (a key of BACKENDS).
+    cycle_history : int
+        Longest oscillator period detected.
+
+    Returns
+    -------
+    dict
+        ``index``, ``lifespan`` (generation where the final cycle starts, None if the
+        soup did not stabilise), ``period``, ``initial_population`` and
+        ``final_population``.
+    """
+    from GameOfLife.cycles import CycleDetector
+    grid = soup_grid(seed, index, shape, density)
+    game = Game(*shape, random_grid=False, rule=rule, backend=backend)
+    detector = CycleDetector(cycle_history)
+    final = game.run(grid, max_generations, no_wrapping, detector=detector)
+    cycle = detector.cycle
+    return {
+        "index": index,
+        "lifespan": cycle.start if cycle else None,
+        "period": cycle.period if cycle else None,
+        "initial_population": int(np.count_nonzero(grid)),
+        "final_population": int(np.count_nonzero(final)),
+    }
+
+
+def search_parameters(seed: int = 0, **soup_options) -> dict:
+    """
+    Returns the parameters of a search which its results depend on, as recorded in the
+    first line of its checkpoint: the seed and the arguments of run_soup, with their
+    defaults filled in and the rule in B/S notation.
+    """
+    from inspect import signature
+    parameters = {name: parameter.default for (name, parameter) in signature(run_soup).parameters.items()
+                  if parameter.default is not parameter.empty}
+    parameters.update(soup_options, seed=seed)
+    rule = parameters["rule"]
+    parameters["rule"] = str(rule if isinstance(rule, Rule) else Rule.from_string(rule) if rule else CONWAY)
+    # Through JSON, so that tuples compare equal to the lists read back.
+    return json.loads(json.dumps(parameters))
+
+
+def read_checkpoint(checkpoint: Union[str, Path]) -> Tuple[Optional[dict], List[dict]]:
+    """
+    Reads a checkpoint file, ignoring a last line cut by an interruption.
+
+    Returns
+    -------
+    tuple
+        The search parameters of its first line (None if the file is empty or missing)
+        and the soup results recorded.
+    """
+    (parameters, results) = (None, [])
+    path = Path(checkpoint)
+    if not path.exists():
+        return (parameters, results)
+    for (number, line) in enumerate(path.read_text().splitlines()):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            logger.error(f"Skipping an invalid checkpoint line in {checkpoint}.")
+            continue
+        if number == 0 and "search" in entry:
+            parameters = entry["search"]
+        elif "index" in entry:
+            results.append(entry)
+        else:
+            logger.error(f"Skipping an invalid checkpoint line in {checkpoint}.")
+    return (parameters, results)
+
+
+def completed_soups(checkpoint: Union[str, Path], parameters: Optional[dict] = None) -> Set[int]:
+    """
+    Returns the indices of the soups recorded in a checkpoint file.
+
+    Raises
+    ------
+    ValueError
+        If ``parameters`` is given and the file holds results of a search with other
+        parameters (see search_parameters).
+    """
+    (recorded, results) = read_checkpoint(checkpoint)
+    if parameters is not None and results and recorded != parameters:
+        logger.error(f"Checkpoint {checkpoint} belongs to another search: {recorded}, not {parameters}.")
+        raise ValueError(f"Checkpoint {checkpoint} was written by a search with other parameters.")
+    return {result["index"] for result in results}
+
+
+def search_soups(count: int, seed: int = 0, processes: Optional[int] = None,
+                 checkpoint: Optional[str] = None, **soup_options) -> Iterator[dict]:
+    """
+    Runs soups 0 to ``count - 1`` of a search on a process pool.
+
+    Parameters
+    ----------
+    count : int
+        Number of soups of the search.
+    seed : int
+        Seed of the search; each soup has its own generator derived from it.
+    processes : int, optional
+        Number of worker processes. Defaults to the CPU count; 1 runs the soups in this
+        process.
+    checkpoint : str, optional
+        JSON Lines file receiving each result as soon as it is available, after a first
+        line with the search parameters. Soups already recorded in it are skipped.
+    **soup_options
+        Other arguments of run_soup.
+
+    Yields
+    ------
+    dict
+        Result of each soup run, in completion order.
+
+    Raises
+    ------
+    ValueError
+        If the checkpoint holds results of a search with other parameters.
+    """
+    parameters = search_parameters(seed, **soup_options)
+    done = completed_soups(checkpoint, parameters) if checkpoint else set()
+    pending = [index for index in range(count) if index not in done]
+    if done:
+        logger.info(f"Resuming soup search: {len(done)} soups done, {len(pending)} left.")
+    work = partial(run_soup, seed=seed, **soup_options)
+    if processes == 1 or len(pending) <= 1:
+        (pool, results) = (None, map(work, pending))
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes)
+        results = pool.imap_unordered(work, pending, chunksize=CHUNK_SIZE)
+    file = open(checkpoint, 'a+') if checkpoint else None
+    try:
+        if file and file.tell():
+            # Terminates a line cut by an interruption, which completed_soups ignored.
+            file.seek(file.tell() - 1)
+            if file.read(1) != "\n":
+                file.write("\n")
+        elif file:
+            file.write(json.dumps({"search": parameters}) + "\n")
+            file.flush()
+        for result in results:
+            if file:
+                file.write(json.dumps(result) + "\n")
+                file.flush()
+            yield result
+    finally:
+        if file:
+            file.close()
+        if pool:
+            # Also stops the workers when the caller stops iterating early.
+            pool.terminate()
+            pool.join()
+
+
+def summarize(results: Iterable[dict], top: int = 10) -> dict:
+    """
+    Aggregates soup results.
+
+    Parameters
+    ----------
+    results : iterable of dict
+        Results of run_soup, e.g. read back from a checkpoint.
+    top : int
+        Number of longest-lived soups listed.
+
+    Returns
+    -------
+    dict
+        Counts of soups and of unstabilised ones, lifespan and final population
+        statistics, a histogram of periods and the longest-lived soups.
+    """
+    results = list(results)
+    settled = [result for result in results if result["lifespan"] is not None]
+    lifespans = np.array([result["lifespan"] for result in settled], dtype=np.int64)
+    populations = np.array([result["final_population"] for result in settled], dtype=np.int64)
+    periods = {}
+    for result in settled:
+        periods[result["period"]] = periods.get(result["period"], 0) + 1
+    return {
+        "soups": len(results),
+        "unstabilised": len(results) - len(settled),
+        "mean_lifespan": float(lifespans.mean()) if len(settled) else None,
+        "median_lifespan": float(np.median(lifespans)) if len(settled) else None,
+        "max_lifespan": int(lifespans.max()) if len(settled) else None,
+        "mean_final_population": float(populations.mean()) if len(settled) else None,
+        "periods": dict(sorted(periods.items())),
+        "longest": sorted(settled, key=lambda result: -result["lifespan"])[:top],
+    }
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search Game of Life soups over many random seeds.")
+    parser.add_argument('--soups', type=int, default=1000, help='Number of soups.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the search.')
+    parser.add_argument('--size', type=int, nargs=2, default=(64, 64), metavar=('HEIGHT', 'WIDTH'))
+    parser.add_argument('--density', type=float, default=0.35, help='Probability of a cell being alive at start.')
+    parser.add_argument('--rule', help='Rule in B/S notation or by name, e.g. B36/S23 or highlife.')
+    parser.add_argument('--max-generations', type=int, default=10_000, help='Generation cap per soup.')
+    parser.add_argument('--cycle-history', type=int, default=256, help='Longest oscillator period detected.')
+    parser.add_argument('--backend', default="bitpacked", choices=sorted(set(BACKENDS) - {"parallel"}),
+                        help='Stepping kernel.')
+    parser.add_argument('-nw', '--no-wrapping', action='store_true', help='Run without wrapping edges.')
+    parser.add_argument('--processes', type=int, help='Worker processes (default: CPU count).')
+    parser.add_argument('--checkpoint', help='JSON Lines file of results, resumed if it exists.')
+    parser.add_argument('--log-dir', default=LOG_DIR, help='Directory of the log file.')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point: runs a search and prints its summary as JSON.
+    """
+    args = parse_arguments(argv)
+    setup_logging(args.log_dir)
+    try:
+        results = list(search_soups(args.soups, args.seed, args.processes, args.checkpoint,
+                                    shape=tuple(args.size), density=args.density, rule=args.rule,
+                                    max_generations=args.max_generations, no_wrapping=args.no_wrapping,
+                                    backend=args.backend, cycle_history=args.cycle_history))
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.checkpoint:
+        # The summary covers the soups of previous runs of the search too, but not those
+        # of a longer search resumed with fewer --soups.
+        results = [result for result in read_checkpoint(args.checkpoint)[1] if result["index"] < args.soups]
+    print(json.dumps(summarize(results), indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Sparse engine storing only the coordinates of alive cells, so that memory and step time
+scale with the population rather than with the grid area.
+"""
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from GameOfLife.kernels import NEIGHBOUR_OFFSETS
+from GameOfLife.rules import CONWAY, Rule
+
+_OFFSETS = np.array(NEIGHBOUR_OFFSETS, dtype=np.int64)
+
+
+class SparseGrid:
+    """
+    Set of alive cell coordinates, stepped by counting neighbours around alive cells only.
+
+    Attributes
+    ----------
+    cells : np.ndarray
+        int64 array of shape (population, 2) holding the (y, x) coordinates of alive
+        cells, unique and sorted in row-major order.
+    shape : tuple of int
+        Dimensions of the grid (height, width). On the unbounded plane, only used as
+        the default export window.
+    unbounded : bool
+        If True, the universe is the infinite plane and coordinates may leave ``shape``.
+    """
+
+    def __init__(self, cells: np.ndarray, shape: Tuple[int, int], unbounded: bool = False) -> None:
+        self.cells = cells
+        self.shape = tuple(shape)
+        self.unbounded = unbounded
+
+    @classmethod
+    def from_array(cls, grid: np.ndarray, unbounded: bool = False) -> "SparseGrid":
+        """
+        Collects the alive cells of a grid.
+
+        Parameters
+        ----------
+        grid : np.ndarray
+            Numpy array containing 0s and 1s corresponding to dead cells and alive cells.
+        unbounded : bool
+            If True, the pattern evolves on the infinite plane instead of the grid.
+
+        Returns
+        -------
+        SparseGrid
+            Sparse copy of the grid.
+        """
+        return cls(np.argwhere(grid != 0).astype(np.int64), grid.shape, unbounded)
+
+    def to_array(self, window: Optional[Tuple[int, int, int, int]] = None, dtype=int) -> np.ndarray:
+        """
+        Exports a rectangular window as a dense grid.
+
+        Parameters
+        ----------
+        window : tuple of int, optional
+            (top, left, height, width) in grid coordinates. Defaults to the whole grid.
+        dtype : data-type
+            Dtype of the returned array.
+
+        Returns
+        -------
+        np.ndarray
+            Numpy array of shape (height, width) containing 0s and 1s.
+        """
+        (top, left, height, width) = window if window is not None else (0, 0) + self.shape
+        grid = np.zeros((height, width), dtype=dtype)
+        ys = self.cells[:, 0] - top
+        xs = self.cells[:, 1] - left
+        inside = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+        grid[ys[inside], xs[inside]] = 1
+        return grid
+
+    def __array__(self, dtype=None, copy=None):
+        return self.to_array(dtype=dtype if dtype is not None else int)
+
+    @property
+    def population(self) -> int:
+        return len(self.cells)
+
+    def bounding_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Returns the (top, left, height, width) window enclosing every alive cell, or None if empty.
+        """
+        if not len(self.cells):
+            return None
+        (top, left) = self.cells.min(axis=0)
+        (bottom, right) = self.cells.max(axis=0)
+        return (int(top), int(left), int(bottom - top + 1), int(right - left + 1))
+
+    def step(self, no_wrapping: bool = False, rule: Rule = CONWAY) -> "SparseGrid":
+        """
+        Computes the next generation.
+
+        Parameters
+        ----------
+        no_wrapping : bool
+            If True, no edge wrapping applied - edge cells have less than 8 neighbours.
+            Ignored on the unbounded plane.
+        rule : Rule
+            Birth and survival rule applied to the neighbour counts. Rules with birth on
+            0 neighbours would bring the whole background to life and are rejected.
+
+        Returns
+        -------
+        SparseGrid
+            Next generation.
+
+        Raises
+        ------
+        ValueError
+            If the rule has birth on 0 neighbours.
+        """
+        if 0 in rule.birth:
+            raise ValueError(f"The sparse engine cannot run rule {rule}: B0 fills the empty background.")
+        cells = self.cells
+        if not len(cells):
+            return SparseGrid(cells, self.shape, self.unbounded)
+
+        # Every alive cell adds one to the count of each of its eight neighbours.
+        candidates = (cells[:, None, :] + _OFFSETS[None, :, :]).reshape(-1, 2)
+        if self.unbounded:
+            origin = cells.min(axis=0) - 1
+            span = int(cells[:, 1].max() - origin[1] + 2)
+        else:
+            (height, width) = self.shape
+            if no_wrapping:
+                inside = ((candidates[:, 0] >= 0) & (candidates[:, 0] < height)
+                          & (candidates[:, 1] >= 0) & (candidates[:, 1] < width))
+                candidates = candidates[inside]
+            else:
+                candidates %= np.array([height, width], dtype=np.int64)
+            origin = np.zeros(2, dtype=np.int64)
+            span = width
+
+        def _encode(coords):
+            return (coords[:, 0] - origin[0]) * span + (coords[:, 1] - origin[1])
+
+        # Alive cells are counted once more so that isolated ones still show up (S0 rules).
+        live_keys = _encode(cells)
+        keys, counts = np.unique(np.concatenate([_encode(candidates), live_keys]), return_counts=True)
+        alive = np.isin(keys, live_keys, assume_unique=True)
+        next_keys = keys[rule.table[alive.astype(np.intp), counts - alive] != 0]
+        next_cells = np.stack([next_keys // span + origin[0], next_keys % span + origin[1]], axis=1)
+        return SparseGrid(next_cells, self.shape, self.unbounded)
+
+
+def step_sparse(grid: Union[np.ndarray, SparseGrid], no_wrapping: bool = False,
+                rule: Rule = CONWAY) -> Union[np.ndarray, SparseGrid]:
+    """
+    Steps a grid through the sparse engine.
+
+    SparseGrid instances are stepped natively and returned as such; dense grids are
+    converted on every call, so long runs should keep a SparseGrid.
+
+    Parameters
+    ----------
+    grid : np.ndarray or SparseGrid
+        Grid to step.
+    no_wrapping : bool
+        If True, no edge wrapping applied - edge cells have less than 8 neighbours.
+    rule : Rule
+        Birth and survival rule applied to the neighbour counts.
+
+    Returns
+    -------
+    np.ndarray or SparseGrid
+        Next generation, in the same representation as ``grid``.
+    """
+    if isinstance(grid, SparseGrid):
+        return grid.step(no_wrapping, rule)
+    return SparseGrid.from_array(grid).step(no_wrapping, rule).to_array(dtype=grid.dtype)
@@ -0,0 +1,189 @@
+"""
+Stepping of many small independent grids at once: grids are stacked into an array of
+shape (N, H, W) and every generation of the whole stack is one set of whole-array
+operations, so the Python overhead of a step is paid once per stack instead of once
+per grid.
+
+Grids of different sizes are padded into buckets of power-of-two dimensions; each grid
+keeps its own size and edge mode inside its bucket.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from GameOfLife import logger
+from GameOfLife.kernels import NEIGHBOUR_OFFSETS
+from GameOfLife.rules import CONWAY, Rule
+
+# Smallest bucket side: below it, padding is cheaper than one more bucket.
+MIN_BUCKET_SIDE = 8
+
+
+def bucket_shape(shape: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Returns the bucket holding grids of a given shape: each dimension rounded up to a
+    power of two, at least MIN_BUCKET_SIDE.
+    """
+    return tuple(max(MIN_BUCKET_SIDE, 1 << (side - 1).bit_length()) for side in shape)
+
+
+class StackedStepper:
+    """
+    Double buffer holding a stack of grids, stepped together.
+
+    Each buffer holds the stack with a one-cell border around every grid. Grids smaller
+    than the stack are stored in its top-left corner: before every step the border of
+    each grid, at its own size, is refreshed with its opposite edges or with dead cells
+    depending on its edge mode, and the padding is cleared after the step.
+
+    Attributes
+    ----------
+    shape : tuple of int
+        Dimensions of the stack (count, height, width).
+    rule : Rule
+        Birth and survival rule applied to the neighbour counts.
+    sizes : np.ndarray
+        (count, 2) array with the height and width of each grid.
+    """
+
+    def __init__(self, shape: tuple, sizes: Optional[np.ndarray] = None, rule: Rule = CONWAY) -> None:
+        (count, height, width) = shape
+        self.shape = (count, height, width)
+        self.rule = rule
+        self.sizes = np.tile((height, width), (count, 1)) if sizes is None else np.asarray(sizes, dtype=np.intp)
+        if self.sizes.shape != (count, 2) or (self.sizes < 1).any() or (self.sizes > (height, width)).any():
+            logger.error(f"Invalid grid sizes for a stack of shape {self.shape}.")
+            raise ValueError("sizes must hold a height and width per grid, within the stack dimensions.")
+        self._buffers = [np.zeros((count, height + 2, width + 2), dtype=np.uint8) for _ in range(2)]
+        self._counts = np.zeros(self.shape, dtype=np.uint8)
+        self._scratch = np.zeros(self.shape, dtype=bool)
+        self._current = 0
+        self._index = np.arange(count)
+        (heights, widths) = self.sizes.T
+        self._padded = bool((heights < height).any() or (widths < width).any())
+        self._inside = None
+        if self._padded:
+            self._inside = ((np.arange(height)[None, :, None] < heights[:, None, None])
+                            & (np.arange(width)[None, None, :] < widths[:, None, None]))
+
+    @property
+    def grids(self) -> np.ndarray:
+        """
+        View of the current generation of the stack, valid until the next call to advance.
+        """
+        return self._buffers[self._current][:, 1:-1, 1:-1]
+
+    @property
+    def previous(self) -> np.ndarray:
+        """
+        View of the generation before the current one, valid after a call to advance.
+        """
+        return self._buffers[1 - self._current][:, 1:-1, 1:-1]
+
+    def load(self, grids: Union[np.ndarray, Sequence[np.ndarray]]) -> None:
+        """
+        Copies grids into the current buffer: a (count, height, width) array, or a
+        sequence of 2D grids of the sizes given to the constructor.
+        """
+        for buffer in self._buffers:
+            buffer.fill(0)
+        if isinstance(grids, np.ndarray) and grids.ndim == 3:
+            self.grids[...] = grids
+            return
+        stack = self.grids
+        for (i, grid) in enumerate(grids):
+            stack[i, :grid.shape[0], :grid.shape[1]] = grid
+
+    def advance(self, generations: int = 1, no_wrapping: Union[bool, Sequence[bool]] = False) -> None:
+        """
+        Steps the loaded stack ``generations`` times.
+
+        Parameters
+        ----------
+        generations : int
+            Number of generations to compute.
+        no_wrapping : bool or sequence of bool
+            Edge mode of all the grids, or of each grid: if True, no edge wrapping
+            applied - edge cells have less than 8 neighbours.
+        """
+        (count, height, width) = self.shape
+        wrap = ~np.broadcast_to(np.asarray(no_wrapping, dtype=bool), (count,))
+        uniform = not self._padded and (wrap.all() or not wrap.any())
+        (heights, widths) = self.sizes.T
+        index = self._index
+        counts = self._counts
+        for _ in range(generations):
+            src = self._buffers[self._current]
+            dst = self._buffers[1 - self._current]
+            if uniform and not wrap.any():
+                src[:, 0] = src[:, -1] = 0
+                src[:, :, 0] = src[:, :, -1] = 0
+            elif uniform:
+                src[:, 0, 1:-1] = src[:, -2, 1:-1]
+                src[:, -1, 1:-1] = src[:, 1, 1:-1]
+                src[:, :, 0] = src[:, :, -2]
+                src[:, :, -1] = src[:, :, 1]
+            else:
+                # Rows then columns, so that the corners come from the refreshed rows.
+                src[:, 0] = src[index, heights] * wrap[:, None]
+                src[index, heights + 1] = src[:, 1] * wrap[:, None]
+                src[:, :, 0] = src[index, :, widths] * wrap[:, None]
+                src[index, :, widths + 1] = src[:, :, 1] * wrap[:, None]
+
+            counts.fill(0)
+            for (di, dj) in NEIGHBOUR_OFFSETS:
+                np.add(counts, src[:, 1 + di:1 + di + height, 1 + dj:1 + dj + width], out=counts)
+            cells = dst[:, 1:-1, 1:-1]
+            self.rule.apply(counts, src[:, 1:-1, 1:-1], out=cells, scratch=self._scratch)
+            if self._padded:
+                np.multiply(cells, self._inside, out=cells)
+            self._current = 1 - self._current
+
+
+def step_stack(grids: Union[np.ndarray, Sequence[np.ndarray]], generations: int = 1,
+               no_wrapping: Union[bool, Sequence[bool]] = False,
+               rule: Rule = CONWAY) -> Union[np.ndarray, List[np.ndarray]]:
+    """
+    Advances many independent grids, stepping each bucket of grids in one call.
+
+    Parameters
+    ----------
+    grids : np.ndarray or sequence of np.ndarray
+        A (count, height, width) array of grids of the same size, or a sequence of 2D
+        grids of any sizes, grouped into buckets by bucket_shape.
+    generations : int
+        Number of generations to compute.
+    no_wrapping : bool or sequence of bool
+        Edge mode of all the grids, or of each grid.
+    rule : Rule
+        Birth and survival rule applied to the neighbour counts.
+
+    Returns
+    -------
+    np.ndarray or list of np.ndarray
+        The grids after ``generations`` generations: an array like ``grids`` if it was
+        one, otherwise a list in the order of ``grids``, each with its dtype.
+    """
+    if generations < 0:
+        logger.error("Invalid number of generations.")
+        raise ValueError("generations must be non-negative.")
+    if isinstance(grids, np.ndarray) and grids.ndim == 3:
+        stepper = StackedStepper(grids.shape, rule=rule)
+        stepper.load(grids)
+        stepper.advance(generations, no_wrapping)
+        return stepper.grids.astype(grids.dtype)
+
+    wrap_modes = np.broadcast_to(np.asarray(no_wrapping, dtype=bool), (len(grids),))
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    for (i, grid) in enumerate(grids):
+        buckets.setdefault(bucket_shape(grid.shape), []).append(i)
+    results = [None] * len(grids)
+    for (shape, members) in buckets.items():
+        sizes = np.array([grids[i].shape for i in members])
+        stepper = StackedStepper((len(members), *shape), sizes, rule)
+        stepper.load([grids[i] for i in members])
+        stepper.advance(generations, wrap_modes[members])
+        stack = stepper.grids
+        for (j, i) in enumerate(members):
+            (height, width) = grids[i].shape
+            results[i] = stack[j, :height, :width].astype(grids[i].dtype)
+    return results
@@ -0,0 +1,201 @@
+"""
+Per-generation statistics (population, births, deaths, changed cells, bounding box),
+computed from the two generations a stepper already holds after each step, and a
+recorder writing them to a columnar file.
+"""
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+from GameOfLife import logger
+from GameOfLife.bitgrid import BitGrid
+from GameOfLife.sparse import SparseGrid
+
+METRICS = ("population", "births", "deaths", "changed", "bounding_box")
+_DIFF_METRICS = {"births", "deaths", "changed"}
+
+
+def _popcount(words: np.ndarray) -> int:
+    """
+    Number of set bits of an array of words.
+    """
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(np.unpackbits(np.ascontiguousarray(words).view(np.uint8)).sum(dtype=np.int64))
+
+
+def _dense_bounding_box(grid: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    rows = np.flatnonzero(grid.any(axis=1))
+    if not len(rows):
+        return None
+    (top, bottom) = (rows[0], rows[-1] + 1)
+    cols = np.flatnonzero(grid[top:bottom].any(axis=0))
+    return (int(top), int(cols[0]), int(bottom - top), int(cols[-1] + 1 - cols[0]))
+
+
+def _bitgrid_bounding_box(grid: BitGrid) -> Optional[Tuple[int, int, int, int]]:
+    rows = np.flatnonzero(grid.words.any(axis=1))
+    if not len(rows):
+        return None
+    (top, bottom) = (rows[0], rows[-1] + 1)
+    # Columns holding an alive cell in any row: the OR of the rows, unpacked.
+    merged = np.bitwise_or.reduce(grid.words[top:bottom], axis=0)
+    cols = np.flatnonzero(np.unpackbits(merged.astype('<u8').view(np.uint8), bitorder='little'))
+    return (int(top), int(cols[0]), int(bottom - top), int(cols[-1] + 1 - cols[0]))
+
+
+class StatsCollector:
+    """
+    Computes the requested statistics of each generation from the previous and the
+    current grid, with no other pass over the grids than the metrics need.
+
+    Dense grids cost one comparison into a preallocated scratch array and two counts,
+    births and deaths being derived from the number of changed cells and the change of
+    population; BitGrid instances are compared word by word, and SparseGrid instances
+    through their coordinates only.
+
+    Attributes
+    ----------
+    metrics : tuple of str
+        Names of the statistics computed, from METRICS.
+    population : int or None
+        Population of the last generation seen.
+    """
+
+    def __init__(self, metrics: Sequence[str] = METRICS) -> None:
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            logger.error(f"Unknown metrics: {sorted(unknown)}.")
+            raise ValueError(f"Unknown metrics {sorted(unknown)}, expected some of {METRICS}.")
+        self.metrics = tuple(metric for metric in METRICS if metric in metrics)
+        self.population = None
+        self._scratch = None
+
+    def start(self, grid: Union[np.ndarray, BitGrid, SparseGrid]) -> dict:
+        """
+        Returns the statistics of the first generation: births, deaths and changed
+        cells are 0.
+        """
+        stats = {}
+        if self.metrics:
+            self.population = self._population(grid)
+        for metric in self.metrics:
+            if metric == "population":
+                stats[metric] = self.population
+            elif metric == "bounding_box":
+                stats[metric] = self._bounding_box(grid)
+            else:
+                stats[metric] = 0
+        return stats
+
+    def update(self, previous: Union[np.ndarray, BitGrid, SparseGrid],
+               current: Union[np.ndarray, BitGrid, SparseGrid]) -> dict:
+        """
+        Returns the statistics of ``current``, the generation following ``previous``.
+        """
+        stats = {}
+        if _DIFF_METRICS.intersection(self.metrics):
+            if self.population is None:
+                self.population = self._population(previous)
+            (births, deaths) = self._births_deaths(previous, current)
+            self.population += births - deaths
+            stats.update(births=births, deaths=deaths, changed=births + deaths)
+        elif "population" in self.metrics:
+            self.population = self._population(current)
+        if "population" in self.metrics:
+            stats["population"] = self.population
+        if "bounding_box" in self.metrics:
+            stats["bounding_box"] = self._bounding_box(current)
+        return {metric: stats[metric] for metric in self.metrics}
+
+    @staticmethod
+    def _population(grid) -> int:
+        if isinstance(grid, BitGrid):
+            return _popcount(grid.words)
+        if isinstance(grid, SparseGrid):
+            return grid.population
+        return int(np.count_nonzero(grid))
+
+    @staticmethod
+    def _bounding_box(grid) -> Optional[Tuple[int, int, int, int]]:
+        if isinstance(grid, SparseGrid):
+            return grid.bounding_box()
+        if isinstance(grid, BitGrid):
+            return _bitgrid_bounding_box(grid)
+        return _dense_bounding_box(grid)
+
+    def _births_deaths(self, previous, current) -> Tuple[int, int]:
+        if isinstance(current, BitGrid):
+            changed = previous.words ^ current.words
+            births = _popcount(changed & current.words)
+            return (births, _popcount(changed) - births)
+        if isinstance(current, SparseGrid):
+            # Coordinates are unique and sorted, so cells alive in both are found by key.
+            low = np.minimum(previous.cells.min(axis=0, initial=0), current.cells.min(axis=0, initial=0))
+            span = int(max(previous.cells[:, 1].max(initial=0), current.cells[:, 1].max(initial=0)) - low[1] + 1)
+            kept = np.count_nonzero(np.isin((current.cells[:, 0] - low[0]) * span + current.cells[:, 1] - low[1],
+                                            (previous.cells[:, 0] - low[0]) * span + previous.cells[:, 1] - low[1],
+                                            assume_unique=True))
+            return (len(current.cells) - kept, len(previous.cells) - kept)
+
+        # Births - deaths is the population change, births + deaths the changed cells.
+        if self._scratch is None or self._scratch.shape != current.shape:
+            self._scratch = np.empty(current.shape, dtype=bool)
+        np.not_equal(previous, current, out=self._scratch)
+        changed = int(np.count_nonzero(self._scratch))
+        growth = int(np.count_nonzero(current)) - self.population
+        return ((changed + growth) // 2, (changed - growth) // 2)
+
+
+class StatsRecorder:
+    """
+    Callback storing the statistics of every generation in columns, written to a
+    file on close: an .npz archive with one array per column, or CSV.
+
+    The bounding box is stored as the bbox_top, bbox_left, bbox_height and bbox_width
+    columns, with a height and width of 0 for empty grids.
+
+    Attributes
+    ----------
+    path : str or Path
+        Destination file.
+    columns : dict of str to list
+        Values recorded so far, including the ``generation`` column.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = path
+        self.columns = {"generation": []}
+
+    def __call__(self, generation: int, stats: dict) -> None:
+        columns = self.columns
+        columns["generation"].append(generation)
+        for (metric, value) in stats.items():
+            if metric == "bounding_box":
+                for (name, coordinate) in zip(("bbox_top", "bbox_left", "bbox_height", "bbox_width"),
+                                              value or (0, 0, 0, 0)):
+                    columns.setdefault(name, []).append(coordinate)
+            else:
+                columns.setdefault(metric, []).append(value)
+
+    def close(self) -> None:
+        """
+        Writes the recorded columns.
+        """
+        arrays = {name: np.array(values, dtype=np.int64) for (name, values) in self.columns.items()}
+        try:
+            if str(self.path).endswith('.csv'):
+                np.savetxt(self.path, np.column_stack(list(arrays.values())), fmt='%d', delimiter=',',
+                           header=','.join(arrays), comments='')
+            else:
+                np.savez(self.path, **arrays)
+            logger.info(f"Statistics of {len(arrays['generation'])} generations saved to {self.path}.")
+        except Exception as e:
+            logger.error(f"Failed to save statistics: {e}")
+            raise
+
+    def __enter__(self) -> "StatsRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,53 @@
+import pytest
+import numpy as np
+
+from GameOfLife.active import ActiveStepper
+from GameOfLife.game import Game
+from GameOfLife.kernels import step_numpy
+
+
+@pytest.mark.parametrize("no_wrapping", [False, True])
+def test_active_matches_numpy(no_wrapping):
+    """Check that skipping unchanged tiles gives the same generations, including partial edge tiles."""
+    rng = np.random.default_rng(9)
+    for (shape, tile_size) in [((1, 1), 4), ((5, 7), 2), ((37, 50), 8), ((64, 64), 16)]:
+        grid = rng.integers(0, 2, size=shape)
+        stepper = ActiveStepper(shape, tile_size)
+        stepper.load(grid)
+        for _ in range(40):
+            stepper.advance(1, no_wrapping)
+            grid = step_numpy(grid, no_wrapping)
+            assert np.array_equal(stepper.grid, grid)
+
+
+def test_still_regions_are_skipped():
+    """Verify that only the tiles around an oscillator are recomputed once the rest is still."""
+    grid = np.zeros((128, 128), dtype=np.uint8)
+    grid[10:12, 10:12] = 1  # Block, a still life.
+    grid[70, 69:72] = 1  # Blinker, a period-2 oscillator.
+    stepper = ActiveStepper(grid.shape, tile_size=16)
+    stepper.load(grid)
+    stepper.advance(1)
+    assert stepper.stats["computed_tiles"] == 64
+    stepper.advance(10)
+    assert stepper.stats["changed_tiles"] == 1
+    assert stepper.stats["computed_tiles"] == 9
+    assert stepper.stats["skipped_fraction"] == 1 - 9 / 64
+    assert stepper.tiles_skipped > 0
+    assert np.array_equal(stepper.grid[69:72, 70], [1, 1, 1])
+
+
+def test_game_run_reports_skipped_tiles():
+    """Check that Game.run keeps the tile counts of its active stepper, and forgets them with another backend."""
+    grid = np.zeros((128, 128), dtype=np.uint8)
+    grid[70, 69:72] = 1
+    game = Game(128, 128, random_grid=False, backend="active")
+    assert game.active_stats is None
+    game.run(grid, 10)
+    stats = game.active_stats
+    assert stats["tiles_computed"] + stats["tiles_skipped"] == 10 * 16
+    assert stats["tiles_skipped"] > 0 and stats["skipped_fraction"] == stats["tiles_skipped"] / 160
+    assert stats["last_generation"]["computed_tiles"] == 9
+    game.backend = "numpy"
+    game.run(grid, 1)
+    assert game.active_stats is None
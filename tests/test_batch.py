@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+import pytest
+
+from GameOfLife.batch import JOB_DEFAULTS, format_result, load_manifest, main, make_job, run_job, run_jobs
+from GameOfLife.game import Game
+
+
+def test_run_job_matches_game_run(tmp_path):
+    """Check that a job computes the same final grid as Game.run and reports its throughput."""
+    output = tmp_path / "final.txt"
+    result = run_job(make_job(height=40, width=30, seed=5, density=0.3, generations=25,
+                              backend="bitpacked", output=str(output)))
+    game = Game(40, 30, random_seed=5, alive_probability=0.3)
+    expected = game.run(game.initialize_grid(), 25)
+    final = Game(starting_grid_filepath=str(output))._parse_grid_from_txt()
+    assert np.array_equal(final, expected)
+    assert result["population"] == expected.sum()
+    assert result["cells_per_second"] == pytest.approx(result["generations_per_second"] * 40 * 30)
+
+
+def test_manifest_on_process_pool(tmp_path):
+    """Verify that manifest jobs run on a pool, in order, with failures reported per job."""
+    manifest = tmp_path / "jobs.jsonl"
+    jobs = [
+        {"name": "glider", "pattern": "data/glider.rle", "height": 32, "width": 32, "generations": 8},
+        {"name": "soup", "height": 16, "width": 16, "seed": 1, "rule": "highlife", "backend": "sparse"},
+        {"name": "broken", "height": 16, "width": 16, "rule": "B9"},
+    ]
+    manifest.write_text("\n".join(json.dumps(job) for job in jobs))
+    results = list(run_jobs(load_manifest(str(manifest)), processes=2))
+    assert [result["name"] for result in results] == ["glider", "soup", "broken"]
+    assert results[0]["population"] == 5 and results[0]["height"] == 32
+    assert results[1]["rule"] == "B36/S23"
+    assert "error" in results[2]
+
+
+def test_command_line(tmp_path, capsys):
+    """Ensure the command line writes the results file and signals failed jobs."""
+    results = tmp_path / "results.jsonl"
+    assert main(["--size", "20", "20", "--seed", "3", "--generations", "10", "--results", str(results)]) == 0
+    assert "gen/s" in capsys.readouterr().out
+    assert json.loads(results.read_text())["generations"] == 10
+    assert main(["--size", "20", "20", "--rule", "nonsense"]) == 1
+    assert format_result(run_job(dict(JOB_DEFAULTS, height=20))).startswith("job: FAILED")
+    assert main(["--manifest", str(tmp_path / "missing.jsonl")]) == 2
+    (tmp_path / "bad.jsonl").write_text('{"height": 8, "colour": "red"}\n')
+    assert main(["--manifest", str(tmp_path / "bad.jsonl")]) == 2
@@ -0,0 +1,19 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def test_engine_benchmark_releases_shared_memory(tmp_path):
+    """Check that benchmarking the parallel engine in run mode leaves no shared memory behind."""
+    before = set(os.listdir("/dev/shm"))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT / "src"), os.environ.get("PYTHONPATH", "")]))
+    output = subprocess.run([sys.executable, str(ROOT / "benchmarks" / "engines.py"), "--engines", "parallel",
+                             "--modes", "run", "--sizes", "64", "--densities", "0.35", "--patterns", "none",
+                             "--edges", "wrap", "--min-time", "0.01"],
+                            cwd=tmp_path, env=env, capture_output=True, text=True, check=True)
+    assert "parallel/run" in output.stdout
+    assert "leaked" not in output.stderr
+    assert set(os.listdir("/dev/shm")) <= before
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+import numpy as np
+
+from GameOfLife.bitgrid import BitGrid
+from GameOfLife.game import Game
+from GameOfLife.kernels import step_numpy
+
+
+def test_pack_roundtrip():
+    """Check that packing then unpacking a grid gives back the same cells."""
+    rng = np.random.default_rng(1)
+    for shape in [(1, 1), (3, 63), (4, 64), (5, 65), (7, 200)]:
+        grid = rng.integers(0, 2, size=shape)
+        packed = BitGrid.from_array(grid)
+        assert packed.words.shape == (shape[0], -(-shape[1] // 64))
+        assert packed.population == grid.sum()
+        assert np.array_equal(packed.to_array(), grid)
+        assert np.array_equal(np.asarray(packed), grid)
+
+
+@pytest.mark.parametrize("no_wrapping", [False, True])
+def test_step_matches_numpy(no_wrapping):
+    """Verify that the SWAR kernel matches the vectorized kernel across word boundaries."""
+    rng = np.random.default_rng(2)
+    for shape in [(1, 1), (2, 2), (3, 1), (6, 63), (6, 64), (9, 65), (31, 130)]:
+        grid = rng.integers(0, 2, size=shape)
+        packed = BitGrid.from_array(grid)
+        for _ in range(8):
+            grid = step_numpy(grid, no_wrapping)
+            packed = packed.step(no_wrapping)
+            assert np.array_equal(packed.to_array(), grid)
+
+
+def test_bitpacked_backend():
+    """Ensure that the bitpacked backend is selectable and its grids can be saved."""
+    game = Game(5, 5, backend="bitpacked")
+    grid = np.array([
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 1, 1, 1, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+    ])
+    assert np.array_equal(game.update_grid_state(grid), grid.T)
+
+    save_path = 'data/test_save_bitgrid.txt'
+    Game.save_grid_to_file(BitGrid.from_array(grid), save_path)
+    imported_grid = Game(starting_grid_filepath=save_path)._parse_grid_from_txt()
+    os.remove(save_path)
+    assert np.array_equal(imported_grid, grid)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from GameOfLife.batch import make_job, run_job
+from GameOfLife.checkpoint import Checkpointer, latest_checkpoint, list_checkpoints
+from GameOfLife.game import Game
+from GameOfLife.snapshot import load_snapshot
+
+
+@pytest.mark.parametrize("backend", ["numpy", "bitpacked", "sparse"])
+def test_checkpoints_are_rotated(tmp_path, backend):
+    """Check that checkpoints are saved every N generations, with the state of the run, and only the last ones kept."""
+    game = Game(40, 40, random_seed=6, backend=backend, rule="highlife")
+    grid = game.initialize_grid()
+    checkpointer = Checkpointer(tmp_path, every_generations=25, keep=2)
+    final = game.run(grid, 110, no_wrapping=True, checkpointer=checkpointer)
+    # Checkpoints due while the previous one is being written are skipped.
+    names = [path.name for path in list_checkpoints(tmp_path)]
+    assert names[-1] == "checkpoint-000000000110.gols" and len(names) <= 2
+    assert {int(name[11:23]) for name in names} <= {25, 50, 75, 100, 110}
+    assert checkpointer.saved + checkpointer.skipped == 5
+    snapshot = load_snapshot(latest_checkpoint(tmp_path))
+    assert (snapshot.generation, str(snapshot.rule), snapshot.no_wrapping) == (110, "B36/S23", True)
+    assert snapshot.metadata["backend"] == backend
+    assert np.array_equal(snapshot.grid.to_array(), final)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_final_checkpoint_is_not_saved_twice(tmp_path):
+    """Check that a run ending on a checkpoint interval hands its last generation to the writer only once."""
+    game = Game(40, 40, random_seed=6)
+    checkpointer = Checkpointer(tmp_path, every_generations=25, keep=3)
+    written = []
+    write = checkpointer._write
+    checkpointer._write = lambda generation, *args: (written.append(generation), write(generation, *args))
+    game.run(game.initialize_grid(), 100, checkpointer=checkpointer)
+    assert written[-1] == 100 and written.count(100) == 1
+    assert checkpointer.last_saved == 100
+    assert list_checkpoints(tmp_path)[-1].name == "checkpoint-000000000100.gols"
+
+
+def test_rotation_keeps_the_latest(tmp_path):
+    """Verify that only the last checkpoints are kept when each one is waited for."""
+    checkpointer = Checkpointer(tmp_path, every_generations=1, keep=3, prefix="run")
+    checkpointer.start(0)
+    grid = np.eye(8, dtype=np.uint8)
+    for generation in range(1, 7):
+        checkpointer.save(generation, grid, wait=True)
+    checkpointer.close()
+    assert [path.name for path in list_checkpoints(tmp_path, "run")] == [
+        f"run-{generation:012d}.gols" for generation in (4, 5, 6)]
+    assert checkpointer.saved == 6 and checkpointer.skipped == 0
+
+
+def test_resume_restores_generator_state(tmp_path):
+    """Verify that a game started from a checkpoint continues the random generator where it was saved."""
+    game = Game(16, 16, random_seed=9)
+    grid = game.initialize_grid()
+    game.run(grid, 10, checkpointer=Checkpointer(tmp_path, every_seconds=60))
+    expected = game.rng.random(4)
+    resumed = Game(starting_grid_filepath=str(latest_checkpoint(tmp_path)))
+    resumed.initialize_grid()
+    assert resumed.generation == 10
+    assert np.array_equal(resumed.rng.random(4), expected)
+
+
+def test_batch_job_resumes_from_checkpoint(tmp_path):
+    """Ensure an interrupted batch job resumed from its checkpoints ends on the grid of an uninterrupted one."""
+    fields = dict(height=48, width=48, seed=4, density=0.4, checkpoint_dir=str(tmp_path / "ck"), checkpoint_every=20)
+    run_job(make_job(generations=70, output=str(tmp_path / "partial.txt"), **fields))
+    resumed = run_job(make_job(generations=150, resume=True, output=str(tmp_path / "resumed.txt"), **fields))
+    assert (resumed["start_generation"], resumed["generations_run"]) == (70, 80)
+    run_job(make_job(generations=150, output=str(tmp_path / "full.txt"), height=48, width=48, seed=4, density=0.4))
+    assert (tmp_path / "resumed.txt").read_text() == (tmp_path / "full.txt").read_text()
+
+
+def test_callbacks_are_kept_between_checkpoints(tmp_path):
+    """Verify that checkpoint intervals do not make the run skip callbacks."""
+    game = Game(16, 16, random_seed=1)
+    called = []
+    game.run(game.initialize_grid(), 100, callback=lambda generation, grid: called.append(generation),
+             callback_every=10, checkpointer=Checkpointer(tmp_path, every_generations=25))
+    assert called == list(range(10, 101, 10))
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from GameOfLife.batch import make_job, run_job
+from GameOfLife.bitgrid import BitGrid
+from GameOfLife.cycles import Cycle, CycleDetector, grid_digest
+from GameOfLife.game import Game
+
+
+@pytest.mark.parametrize("path, period", [("data/blinker.txt", 2), ("data/pulsar.txt", 3)])
+def test_oscillators_are_detected(path, period):
+    """Check that bundled oscillators are reported with their period from generation 0."""
+    game = Game(starting_grid_filepath=path)
+    detector = CycleDetector()
+    game.run(game.initialize_grid(), 1000, detector=detector)
+    assert detector.cycle == Cycle(0, period)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "bitpacked", "sparse"])
+def test_run_stops_at_cycle_start(backend):
+    """Verify that a run stops once a soup settles, and that the cycle start is the first repeating generation."""
+    game = Game(48, 48, random_seed=11, alive_probability=0.3, backend=backend)
+    grid = game.initialize_grid()
+    detector = CycleDetector(history=64)
+    final = game.run(grid, 5000, detector=detector)
+    (start, period) = detector.cycle
+    assert np.array_equal(final, Game(48, 48).run(grid, start + period))
+    before = Game(48, 48).run(grid, start)
+    assert np.array_equal(before, final)
+    if start:
+        previous = Game(48, 48).run(grid, start - 1)
+        assert not np.array_equal(previous, Game(48, 48).run(grid, start - 1 + period))
+
+
+def test_history_bound_and_digests():
+    """Ensure periods longer than the history go unnoticed and that digests agree across representations."""
+    grid = np.zeros((6, 9), dtype=np.uint8)
+    grid[2, 3:6] = 1
+    assert grid_digest(grid) == grid_digest(grid.astype(bool))
+    assert grid_digest(BitGrid.from_array(grid)) == grid_digest(BitGrid.from_array(grid.copy()))
+
+    detector = CycleDetector(history=1)
+    game = Game(6, 9)
+    game.run(grid, 10, detector=detector)
+    assert detector.cycle is None
+    result = run_job(make_job(pattern="data/blinker.txt", generations=1000, stop_on_cycle=True))
+    assert (result["generations_run"], result["cycle_start"], result["cycle_period"]) == (2, 0, 2)
@@ -88,6 +88,33 @@ def test_import_from_file_incorrect_value():
         game._parse_grid_from_txt()
 
 
+def test_import_from_file_error_position(tmp_path):
+    """Check that an invalid character is reported at its line and column in the file."""
+    path = tmp_path / "grid.txt"
+    path.write_text("010\n\n  011\n01x\n")
+    game = Game(starting_grid_filepath=str(path))
+    with pytest.raises(ValueError, match=r"'x' at line 4, column 3"):
+        game._parse_grid_from_txt()
+
+    path.write_text("010\n01\n")
+    with pytest.raises(ValueError, match="expected 3"):
+        game._parse_grid_from_txt()
+
+
+def test_save_and_import_large_grid(tmp_path):
+    """Ensure the text writer matches np.savetxt output and round-trips through the loader."""
+    grid = np.random.default_rng(3).integers(0, 2, size=(120, 77))
+    path = tmp_path / "grid.txt"
+    Game.save_grid_to_file(grid, str(path))
+    expected = tmp_path / "expected.txt"
+    np.savetxt(expected, grid, fmt='%i', delimiter='')
+    assert path.read_bytes() == expected.read_bytes()
+
+    imported = Game(starting_grid_filepath=str(path))._parse_grid_from_txt()
+    assert imported.dtype == np.uint8
+    assert np.array_equal(imported, grid)
+
+
 def test_save_grid_to_file():
     """Verify that grids can be saved to a file and then imported with identical configuration."""
     grid = np.array(
@@ -241,3 +268,73 @@ def test_smaller_grids():
     (width, height) = initial_grid.shape
     game = Game(height, width)
     assert np.all(expected_next_grid == game.update_grid_state(initial_grid))
+
+
+def test_run_matches_update_grid_state():
+    """Check that running many generations at once matches repeated updates on every backend."""
+    initial_grid = np.random.default_rng(6).integers(0, 2, size=(12, 17))
+    for backend in ["numpy", "reference", "bitpacked", "sparse", "parallel", "active"]:
+        game = Game(12, 17, backend=backend, workers=2)
+        for no_wrapping in [False, True]:
+            expected = initial_grid
+            for _ in range(9):
+                expected = game.update_grid_state(expected, no_wrapping)
+            result = game.run(initial_grid, 9, no_wrapping)
+            assert result.dtype == initial_grid.dtype
+            assert np.array_equal(result, expected)
+
+
+def test_run_out_and_callback():
+    """Verify that run writes into the given output array and calls the callback every k generations."""
+    initial_grid = np.random.default_rng(7).integers(0, 2, size=(10, 10))
+    game = Game(10, 10)
+    seen = []
+    out = np.empty_like(initial_grid)
+    result = game.run(initial_grid, 10, out=out,
+                      callback=lambda generation, grid: seen.append((generation, grid.sum())),
+                      callback_every=3)
+    assert result is out
+    assert [generation for (generation, _) in seen] == [3, 6, 9]
+    assert seen[-1][1] == game.run(initial_grid, 9).sum()
+    assert np.array_equal(game.run(initial_grid, 0), initial_grid)
+
+
+def test_import_from_rle():
+    """Check that RLE files decode multi-row runs, stop at the terminator and add the margins."""
+    save_path = 'data/test_runs.rle'
+    with open(save_path, 'w') as file:
+        file.write("#C comment line\nx = 4, y = 5\n2o$\n3$b3o!\nignored 9o$9o\n")
+    game = Game(starting_grid_filepath=save_path)
+    grid = game._parse_grid_from_rle(vertical_spacing=1, horizontal_spacing=2)
+    os.remove(save_path)
+    expected_pattern = np.array([
+        [1, 1, 0, 0],
+        [0, 0, 0, 0],
+        [0, 0, 0, 0],
+        [0, 0, 0, 0],
+        [0, 1, 1, 1],
+    ])
+    assert grid.shape == (7, 8)
+    assert np.all(grid[1:-1, 2:-2] == expected_pattern)
+    assert grid.sum() == expected_pattern.sum()
+
+
+def test_import_from_rle_in_chunks():
+    """Verify that run counts cut between two chunks are decoded correctly."""
+    paths = ['data/gosper_glider.rle', 'data/queen_bee.rle', 'data/glider.rle']
+    for path in paths:
+        game = Game(starting_grid_filepath=path)
+        expected = game._parse_grid_from_rle()
+        for chunk_size in [1, 2, 7]:
+            assert np.array_equal(game._parse_grid_from_rle(chunk_size=chunk_size), expected)
+
+
+def test_import_from_rle_incorrect_content():
+    """Test that invalid characters or patterns larger than the header raise a ValueError."""
+    save_path = 'data/test_invalid.rle'
+    for content in ["x = 3, y = 1\n2o?o!", "x = 2, y = 1\n3o!", "x = 2, y = 1\no$o!", "2o!"]:
+        with open(save_path, 'w') as file:
+            file.write(content)
+        with pytest.raises(ValueError):
+            Game(starting_grid_filepath=save_path)._parse_grid_from_rle()
+    os.remove(save_path)
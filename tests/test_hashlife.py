@@ -0,0 +1,41 @@
+import numpy as np
+
+from GameOfLife.game import Game
+from GameOfLife.hashlife import HashLife
+from GameOfLife.kernels import step_numpy
+
+
+def test_advance_matches_numpy():
+    """Check that HashLife matches the vectorized kernel on a bounded grid the pattern never reaches."""
+    pattern = Game(starting_grid_filepath='data/gosper_glider.rle').initialize_grid()
+    grid = np.zeros((200, 200), dtype=int)
+    grid[60:60 + pattern.shape[0], 60:60 + pattern.shape[1]] = pattern
+    life = HashLife.from_array(grid)
+    for n in [1, 2, 3, 7, 30]:
+        for _ in range(n):
+            grid = step_numpy(grid, no_wrapping=True)
+        life.advance(n)
+        assert np.array_equal(life.to_array(), grid)
+    assert life.generation == 43
+    assert life.population == grid.sum()
+
+
+def test_glider_long_jump():
+    """Verify that a glider has moved one cell diagonally every 4 generations after a long jump."""
+    life = HashLife.from_file('data/glider.txt')
+    (top, left, height, width) = life.bounding_box()
+    start = life.to_array((top, left, height, width))
+    life.advance(4 * 10**6)
+    assert life.population == 5
+    assert life.bounding_box() == (top + 10**6, left + 10**6, height, width)
+    assert np.array_equal(life.to_array((top + 10**6, left + 10**6, height, width)), start)
+
+
+def test_bounded_cache():
+    """Ensure that the result cache stays within its bound and memory usage is reported."""
+    life = HashLife.from_file('data/queen_bee.rle', max_cache_size=500)
+    life.advance(100)
+    usage = life.memory_usage()
+    assert usage["cache_entries"] <= 500
+    assert usage["cache_evictions"] > 0
+    assert usage["nodes"] > 0 and usage["estimated_bytes"] > 0
@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+
+from GameOfLife.batch import make_job, run_job
+from GameOfLife.game import Game
+from GameOfLife.history import GenerationHistory
+from GameOfLife.kernels import step_numpy
+from GameOfLife.simulation import SimulationThread
+from GameOfLife.snapshot import load_snapshot
+
+
+def _generations(count, shape=(40, 56), seed=3):
+    grid = np.random.default_rng(seed).integers(0, 2, size=shape, dtype=np.uint8)
+    generations = [grid]
+    for _ in range(count - 1):
+        generations.append(step_numpy(generations[-1]))
+    return generations
+
+
+def test_seek_eviction_and_truncate():
+    """Check that stored generations are restored in any order, that old segments are evicted and that truncating continues cleanly."""
+    generations = _generations(100)
+    history = GenerationHistory(keyframe_interval=8, max_bytes=6000)
+    for (generation, grid) in enumerate(generations):
+        history(generation, grid)
+    assert history.evicted > 0 and history.oldest % 8 == 0 and history.newest == 99
+    assert history.evicted + len(history) == 100
+    assert 0 not in history and history.previous(history.oldest + 2, 10) == history.oldest
+    for generation in [99, 98, history.oldest, history.oldest + 9, history.oldest + 10, 97]:
+        assert np.array_equal(history.seek(generation), generations[generation])
+
+    history.truncate(90)
+    assert history.newest == 90 and history.previous(91) == 90
+    history(91, generations[91])
+    assert np.array_equal(history.seek(91), generations[91])
+    assert np.array_equal(history.seek(90), generations[90])
+
+
+def test_simulation_steps_back():
+    """Verify that stepping back pauses on the right earlier generation, from which the simulation goes on."""
+    generations = _generations(1)
+    simulation = SimulationThread(Game(40, 56), generations[0], history=GenerationHistory(keyframe_interval=4))
+    simulation.start()
+    deadline = time.perf_counter() + 5
+    while simulation.latest()[0] < 20 and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    simulation.pause()
+    time.sleep(0.05)
+    paused_at = simulation.latest()[0]
+    simulation.step_back(5)
+    while simulation.latest()[0] != paused_at - 5 and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    simulation.step_once()
+    while simulation.latest()[0] != paused_at - 4 and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    simulation.stop()
+    (generation, grid) = simulation.latest()
+    assert generation == paused_at - 4 and simulation.history.newest == generation
+    expected = _generations(generation + 1)[-1]
+    assert np.array_equal(grid, expected)
+
+
+def test_batch_job_saves_rewound_generations(tmp_path):
+    """Check that a batch job saves the generations it is asked to rewind to as snapshots."""
+    job = make_job(height=32, width=32, seed=4, generations=50, keyframe_interval=16,
+                   rewind=[10, -3], rewind_dir=str(tmp_path))
+    result = run_job(job)
+    assert "error" not in result
+    assert sorted(result["rewound"]) == [10, 47] and result["history"]["newest"] == 50
+    expected = Game(32, 32, random_seed=4).initialize_grid()
+    for _ in range(10):
+        expected = step_numpy(expected)
+    snapshot = load_snapshot(result["rewound"][10])
+    assert snapshot.generation == 10 and np.array_equal(np.asarray(snapshot.grid), expected)
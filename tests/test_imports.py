@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import GameOfLife
+
+# Modules which the package and its core must leave unimported until they are used.
+LAZY_MODULES = ["curses", "multiprocessing", "GameOfLife.parallel", "GameOfLife.gui", "GameOfLife.hashlife",
+                "GameOfLife.active", "GameOfLife.bitgrid", "GameOfLife.sparse", "GameOfLife.stacked",
+                "GameOfLife.stats", "GameOfLife.cycles", "GameOfLife.snapshot", "GameOfLife.checkpoint",
+                "GameOfLife.profiling"]
+# Modules which the batch runner leaves unimported until a job uses them.
+BATCH_LAZY_MODULES = LAZY_MODULES + ["GameOfLife.history", "GameOfLife.recording"]
+
+
+def test_import_has_no_side_effects(tmp_path):
+    """Check that importing the core modules writes no file and leaves the heavy ones unimported."""
+    code = ("import sys, GameOfLife.game; "
+            f"print([name for name in {LAZY_MODULES!r} if name in sys.modules])")
+    output = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+    assert not list(tmp_path.iterdir())
+
+
+def test_batch_import_is_lazy(tmp_path):
+    """Check that importing the batch runner leaves the instrumentation of the jobs unimported."""
+    code = ("import sys, GameOfLife.batch; "
+            f"print([name for name in {BATCH_LAZY_MODULES!r} if name in sys.modules])")
+    output = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_lazy_attributes_and_logging_setup(tmp_path):
+    """Verify that the package shortcuts resolve to their classes and that setup_logging writes the log file."""
+    from GameOfLife.hashlife import HashLife
+    assert GameOfLife.HashLife is HashLife
+    assert "Game" in dir(GameOfLife)
+    code = ("from GameOfLife import logger, setup_logging; setup_logging('run'); "
+            "import GameOfLife.game; logger.info('started')")
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, check=True)
+    assert "started" in (tmp_path / "run" / "running_logs.log").read_text()
@@ -0,0 +1,50 @@
+import tracemalloc
+
+import pytest
+import numpy as np
+
+from GameOfLife.game import Game
+from GameOfLife.kernels import DoubleBuffer, step_numpy, step_reference
+
+
+@pytest.mark.parametrize("no_wrapping", [False, True])
+def test_numpy_matches_reference(no_wrapping):
+    """Check that the vectorized kernel matches the cell-by-cell reference on random grids."""
+    rng = np.random.default_rng(0)
+    for shape in [(1, 1), (2, 2), (1, 7), (5, 3), (17, 23), (40, 40)]:
+        grid = rng.integers(0, 2, size=shape)
+        for _ in range(5):
+            expected = step_reference(grid, no_wrapping)
+            result = step_numpy(grid, no_wrapping)
+            assert result.dtype == grid.dtype
+            assert np.array_equal(result, expected)
+            grid = expected
+
+
+def test_default_backend_is_numpy():
+    """Ensure that the vectorized kernel is used unless another backend is requested."""
+    assert Game(3, 3).backend == "numpy"
+    assert Game(3, 3, backend="reference").backend == "reference"
+
+
+def test_unknown_backend():
+    """Verify that an unknown backend name raises a ValueError."""
+    with pytest.raises(ValueError):
+        Game(3, 3, backend="unknown")
+
+
+@pytest.mark.parametrize("no_wrapping", [False, True])
+def test_double_buffer(no_wrapping):
+    """Check that the double buffer matches the kernel without allocating a grid per generation."""
+    grid = np.random.default_rng(8).integers(0, 2, size=(400, 300))
+    buffers = DoubleBuffer(grid.shape)
+    buffers.load(grid)
+    buffers.advance(1, no_wrapping)
+    tracemalloc.start()
+    buffers.advance(20, no_wrapping)
+    (_, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for _ in range(21):
+        grid = step_numpy(grid, no_wrapping)
+    assert np.array_equal(buffers.grid, grid)
+    assert peak < grid.size // 4
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+
+from GameOfLife.game import Game
+from GameOfLife.kernels import step_numpy
+from GameOfLife.parallel import ParallelStepper, measure_scaling, step_rows
+
+
+@pytest.mark.parametrize("no_wrapping", [False, True])
+def test_step_rows_matches_numpy(no_wrapping):
+    """Check that stepping a grid tile by tile with halo rows matches the serial kernel."""
+    rng = np.random.default_rng(4)
+    for shape in [(1, 1), (2, 3), (7, 1), (25, 18)]:
+        grid = rng.integers(0, 2, size=shape).astype(np.uint8)
+        result = np.empty_like(grid)
+        bounds = np.linspace(0, shape[0], 4).astype(int)
+        for (start, stop) in zip(bounds[:-1], bounds[1:]):
+            step_rows(grid, result, start, stop, no_wrapping)
+        assert np.array_equal(result, step_numpy(grid, no_wrapping))
+
+
+@pytest.mark.parametrize("no_wrapping", [False, True])
+def test_parallel_stepper_matches_numpy(no_wrapping):
+    """Verify that the process pool gives the same generations as the serial kernel."""
+    grid = np.random.default_rng(5).integers(0, 2, size=(40, 33))
+    with ParallelStepper(grid.shape, workers=2, tiles=3) as stepper:
+        stepper.load(grid)
+        stepper.advance(10, no_wrapping)
+        for _ in range(10):
+            grid = step_numpy(grid, no_wrapping)
+        assert np.array_equal(stepper.grid, grid)
+
+
+def test_parallel_backend():
+    """Ensure that the parallel backend is selectable with a configurable worker count."""
+    game = Game(5, 5, backend="parallel", workers=2)
+    grid = np.zeros((5, 5), dtype=int)
+    grid[2, 1:4] = 1
+    assert np.array_equal(game.update_grid_state(grid), grid.T)
+    assert np.array_equal(game.update_grid_state(grid.T), grid)
+
+
+def test_measure_scaling():
+    """Check that the scaling curve reports one entry per worker count."""
+    curve = measure_scaling((64, 64), generations=2, max_workers=2)
+    assert [point["workers"] for point in curve] == [1, 2]
+    assert curve[0]["speedup"] == 1.0
+
+
+def test_steppers_are_owned_and_bounded():
+    """Verify that each run gets its own stepper, closed at the end, and that the step_parallel cache is bounded."""
+    from GameOfLife import parallel
+    game = Game(8, 8, backend="parallel", workers=1)
+    (first, second) = (game.create_stepper((8, 8)), game.create_stepper((8, 8)))
+    assert first is not second
+    for stepper in (first, second):
+        Game.close_stepper(stepper)
+        assert stepper._pool is None
+    for size in range(6, 6 + parallel.MAX_CACHED_STEPPERS + 2):
+        parallel.step_parallel(np.zeros((size, size), dtype=np.uint8), workers=1)
+    assert len(parallel._steppers) == parallel.MAX_CACHED_STEPPERS
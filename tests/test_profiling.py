@@ -0,0 +1,60 @@
+import threading
+import time
+
+import numpy as np
+
+from GameOfLife.batch import make_job, run_job
+from GameOfLife.game import Game
+from GameOfLife.profiling import LatencyHistogram, Profiler, StackSampler
+
+
+def test_histogram_percentiles():
+    """Check that percentiles are bounded within a bucket of the exact values."""
+    histogram = LatencyHistogram()
+    durations = np.geomspace(1e-5, 1e-1, 1000)
+    for seconds in durations:
+        histogram.record(seconds)
+    assert histogram.count == 1000 and histogram.maximum == durations[-1]
+    for q in (50, 90, 99):
+        exact = np.percentile(durations, q)
+        assert exact <= histogram.percentile(q) <= exact * 2 ** 0.5
+    assert histogram.percentile(100) == durations[-1]
+
+
+def test_disabled_profiler_records_nothing():
+    """Verify that a disabled profiler hands out a no-op timer and that phases are timed once enabled."""
+    profiler = Profiler(enabled=False)
+    with profiler.phase("step"):
+        pass
+    profiler.record("frame", 1.0)
+    assert profiler.histograms == {}
+    reports = []
+    profiler = Profiler(on_report=reports.append, report_interval=0)
+    game = Game(32, 32, random_seed=3)
+    game.run(game.initialize_grid(), 50, profiler=profiler)
+    assert profiler.histograms["step"].count == 50
+    assert len(reports) == 50 and "step" in profiler.report()
+
+
+def test_batch_job_latency_and_sampler(tmp_path):
+    """Ensure profiled batch jobs report and save their step latencies, and that the sampler sees a busy thread."""
+    result = run_job(make_job(height=24, width=24, seed=1, generations=30, profile_output=str(tmp_path / "p.json")))
+    assert result["latency"]["step"]["count"] == 30
+    assert (tmp_path / "p.json").exists()
+
+    stop = threading.Event()
+
+    def busy():
+        while not stop.is_set():
+            sum(range(1000))
+    thread = threading.Thread(target=busy)
+    thread.start()
+    sampler = StackSampler(thread.ident, interval=0.001)
+    sampler.start()
+    time.sleep(0.1)
+    sampler.stop()
+    stop.set()
+    thread.join()
+    assert any("busy" in stack for stack in sampler.stacks)
+    sampler.dump(tmp_path / "stacks.txt")
+    assert (tmp_path / "stacks.txt").read_text()
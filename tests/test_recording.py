@@ -0,0 +1,68 @@
+import struct
+import zlib
+
+import numpy as np
+
+from GameOfLife.batch import make_job, run_job
+from GameOfLife.game import Game
+from GameOfLife.recording import FrameRecorder, _png_bytes, export_gif, read_frames, transform_frame
+
+
+def test_frames_read_back_despite_drops(tmp_path):
+    """Check that every frame written reads back as its generation, deltas included, whatever frames were dropped."""
+    game = Game(96, 80, random_seed=2)
+    grid = game.initialize_grid()
+    expected = {}
+
+    def record(generation, current):
+        if recorder(generation, current):
+            expected[generation] = current.astype(bool)
+    with FrameRecorder(tmp_path / "run.golf", queue_size=1, keyframe_interval=7) as recorder:
+        game.run(grid, 120, callback=record)
+    assert recorder.recorded + recorder.dropped == 120
+    frames = list(read_frames(tmp_path / "run.golf"))
+    assert [generation for (generation, _) in frames] == sorted(expected)
+    assert all(np.array_equal(frame, expected[generation]) for (generation, frame) in frames)
+
+
+def test_transform_and_image_encoding(tmp_path):
+    """Verify cropping, pooling and scaling, and the structure of the exported PNG and GIF files."""
+    frame = np.zeros((5, 7), dtype=np.uint8)
+    frame[1, 2] = frame[4, 6] = 1
+    assert transform_frame(frame, pool=2).tolist() == [[False, True, False, False], [False] * 4,
+                                                       [False, False, False, True]]
+    scaled = transform_frame(frame, window=(1, 1, 2, 3), scale=3)
+    assert scaled.shape == (6, 9) and scaled[:3, 3:6].all() and scaled.sum() == 9
+
+    png = _png_bytes(scaled)
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    (length,) = struct.unpack('>I', png[33:37])
+    rows = np.frombuffer(zlib.decompress(png[41:41 + length]), dtype=np.uint8).reshape(6, 3)
+    assert (rows[:, 0] == 0).all()
+    assert np.array_equal(np.unpackbits(rows[:, 1:], axis=1, count=9) == 0, scaled)
+
+    count = export_gif(((g, transform_frame(f, scale=2)) for (g, f) in [(0, frame), (1, frame), (2, 1 - frame)]),
+                       tmp_path / "run.gif")
+    data = (tmp_path / "run.gif").read_bytes()
+    assert count == 3 and data.startswith(b"GIF89a") and data.endswith(b"\x3B")
+    assert struct.unpack('<HH', data[6:10]) == (14, 10) and data.count(b"\x21\xF9\x04") == 3
+
+
+def test_batch_job_records_frames(tmp_path):
+    """Ensure a batch job records every n-th generation and reports its recorded and dropped frames."""
+    result = run_job(make_job(height=32, width=32, seed=3, generations=40, record=str(tmp_path / "job.golf"),
+                              record_every=5))
+    assert result["frames_recorded"] + result["frames_dropped"] == 8
+    generations = [generation for (generation, _) in read_frames(tmp_path / "job.golf")]
+    assert all(generation % 5 == 0 for generation in generations)
+
+
+def test_resumed_job_records_to_a_new_log(tmp_path):
+    """Verify that a resumed job numbers its frames from its start generation and keeps the earlier log."""
+    fields = dict(height=32, width=32, seed=3, record=str(tmp_path / "job.golf"), record_every=5,
+                  checkpoint_dir=str(tmp_path / "checkpoints"), checkpoint_every=20)
+    run_job(make_job(generations=40, **fields))
+    result = run_job(make_job(generations=60, resume=True, **fields))
+    assert result["start_generation"] == 40 and result["frames_log"] == str(tmp_path / "job-000000000040.golf")
+    assert [generation for (generation, _) in read_frames(result["frames_log"])] == [45, 50, 55, 60]
+    assert len(list(read_frames(tmp_path / "job.golf"))) == 8
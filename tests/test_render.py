@@ -0,0 +1,63 @@
+import numpy as np
+
+from GameOfLife.render import changed_runs, fit_zoom, glyph_text, glyphs, render_cells, window_shape
+
+
+def test_render_cells():
+    """Check that cells are drawn one column apart with the alive character."""
+    assert render_cells(np.array([1, 0, 1, 1])) == "o   o o"
+    assert render_cells(np.array([], dtype=int)) == ""
+
+
+def test_changed_runs():
+    """Verify that runs cover exactly the changed cells and never cross rows."""
+    rng = np.random.default_rng(4)
+    previous = rng.integers(0, 2, size=(40, 30))
+    current = previous.copy()
+    current[rng.random(current.shape) < 0.05] ^= 1
+    current[5, 29] ^= 1
+    current[6, 0] ^= 1
+
+    (rows, starts, stops) = changed_runs(previous, current)
+    redrawn = previous.copy()
+    for (y, x0, x1) in zip(rows, starts, stops):
+        assert np.all(previous[y, x0:x1] != current[y, x0:x1])
+        redrawn[y, x0:x1] = current[y, x0:x1]
+    assert np.array_equal(redrawn, current)
+
+
+def test_changed_runs_merge_gap():
+    """Ensure nearby runs on a row are merged while an unchanged frame gives no runs."""
+    previous = np.zeros((2, 12), dtype=np.uint8)
+    current = previous.copy()
+    current[0, [1, 3, 10]] = 1
+    assert len(changed_runs(previous, previous)[0]) == 0
+    (rows, starts, stops) = changed_runs(previous, current, merge_gap=1)
+    assert (rows.tolist(), starts.tolist(), stops.tolist()) == ([0, 0], [1, 10], [4, 11])
+
+
+def test_zoomed_glyphs():
+    """Check the half-block and braille characters, including padding and pooled levels."""
+    cells = np.array([[1, 0, 1],
+                      [1, 0, 0],
+                      [0, 0, 0]])
+    assert glyph_text(glyphs(cells, zoom=1)[0]) == "█ ▀"
+    assert glyph_text(glyphs(cells, zoom=1)[1]) == "   "
+    braille = glyphs(cells, zoom=2)
+    assert braille.shape == (1, 2)
+    assert glyph_text(braille[0]) == chr(0x2800 + 0x01 + 0x02) + chr(0x2800 + 0x01)
+    # At level 3 each braille dot stands for a 2x2 block.
+    assert glyph_text(glyphs(cells, zoom=3)[0]) == chr(0x2800 + 0x01 + 0x08)
+
+
+def test_window_fits_screen():
+    """Verify that the fitted zoom level shows the whole grid and the previous one does not."""
+    screen = (40, 100)
+    assert window_shape(screen, 0) == (40, 50)
+    for shape in [(10, 10), (80, 100), (5000, 300)]:
+        zoom = fit_zoom(shape, screen)
+        frame = glyphs(np.ones(shape), zoom)
+        assert frame.shape[0] <= screen[0] and frame.shape[1] <= screen[1]
+        if zoom:
+            (height, width) = window_shape(screen, zoom - 1)
+            assert height < shape[0] or width < shape[1]
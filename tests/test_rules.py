@@ -0,0 +1,78 @@
+import os
+
+import pytest
+import numpy as np
+
+from GameOfLife.bitgrid import BitGrid
+from GameOfLife.game import Game
+from GameOfLife.hashlife import HashLife
+from GameOfLife.kernels import step_numpy, step_reference
+from GameOfLife.rules import CONWAY, Rule
+from GameOfLife.sparse import SparseGrid
+
+
+def test_parse_notations():
+    """Check that B/S, S/B, legacy and named notations parse to the same rules."""
+    assert Rule.from_string("B3/S23") == CONWAY
+    assert Rule.from_string("b3s23") == CONWAY
+    assert Rule.from_string("S23/B3") == CONWAY
+    assert Rule.from_string("23/3") == CONWAY
+    assert Rule.from_string("HighLife") == Rule([3, 6], [2, 3])
+    assert str(Rule.from_string("seeds")) == "B2/S"
+    assert CONWAY.table[0].tolist() == [0, 0, 0, 1, 0, 0, 0, 0, 0]
+    assert CONWAY.table[1].tolist() == [0, 0, 1, 1, 0, 0, 0, 0, 0]
+
+
+def test_invalid_rule():
+    """Verify that malformed rules raise a ValueError."""
+    for notation in ["B9/S23", "X3/Y23", "B3/S23/C2", ""]:
+        with pytest.raises(ValueError):
+            Rule.from_string(notation)
+    with pytest.raises(ValueError):
+        Game(3, 3, rule="B3/S2x")
+
+
+@pytest.mark.parametrize("notation", ["B36/S23", "B3678/S34678", "B2/S", "B1357/S02468", "B/S012345678"])
+@pytest.mark.parametrize("no_wrapping", [False, True])
+def test_kernels_agree(notation, no_wrapping):
+    """Ensure that every kernel applies other rules like the reference loop."""
+    rule = Rule.from_string(notation)
+    grid = np.random.default_rng(10).integers(0, 2, size=(13, 70))
+    expected = grid
+    packed = BitGrid.from_array(grid)
+    sparse = SparseGrid.from_array(grid)
+    for _ in range(4):
+        expected = step_reference(expected, no_wrapping, rule)
+        packed = packed.step(no_wrapping, rule)
+        sparse = sparse.step(no_wrapping, rule)
+        assert np.array_equal(packed.to_array(), expected)
+        assert np.array_equal(sparse.to_array(), expected)
+    for backend in ["numpy", "active", "parallel"]:
+        game = Game(13, 70, backend=backend, workers=2, rule=notation)
+        assert np.array_equal(game.run(grid, 4, no_wrapping), expected)
+    assert np.array_equal(step_numpy(grid, no_wrapping, rule), step_reference(grid, no_wrapping, rule))
+
+
+def test_b0_rejected_by_unbounded_engines():
+    """Check that rules with birth on 0 neighbours are refused by engines with an infinite background."""
+    rule = Rule.from_string("B0/S8")
+    with pytest.raises(ValueError):
+        SparseGrid.from_array(np.eye(3)).step(rule=rule)
+    with pytest.raises(ValueError):
+        HashLife(rule=rule)
+
+
+def test_rule_from_rle_header():
+    """Verify that the rule field of an RLE header is used unless a rule is given to Game."""
+    save_path = 'data/test_highlife.rle'
+    with open(save_path, 'w') as file:
+        file.write("x = 3, y = 1, rule = B36/S23\n3o!\n")
+    game = Game(starting_grid_filepath=save_path)
+    game.initialize_grid()
+    assert game.rule == Rule([3, 6], [2, 3])
+    game = Game(starting_grid_filepath=save_path, rule="B3/S23")
+    game.initialize_grid()
+    assert game.rule == CONWAY
+    life = HashLife.from_file(save_path)
+    assert life.rule == Rule([3, 6], [2, 3])
+    os.remove(save_path)
@@ -0,0 +1,49 @@
+import time
+
+import numpy as np
+
+from GameOfLife.game import Game
+from GameOfLife.kernels import step_numpy
+from GameOfLife.simulation import SimulationThread
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_simulation_publishes_correct_generations():
+    """Check that the published grid is the generation it is labelled with."""
+    grid = np.random.default_rng(2).integers(0, 2, size=(30, 40))
+    simulation = SimulationThread(Game(30, 40), grid)
+    simulation.start()
+    assert _wait_for(lambda: simulation.latest()[0] >= 20)
+    simulation.stop()
+    (generation, published) = simulation.latest()
+    expected = grid
+    for _ in range(generation):
+        expected = step_numpy(expected)
+    assert np.array_equal(published, expected)
+
+
+def test_simulation_speed_pause_and_step():
+    """Verify the speed limit, and that a paused simulation only moves on single steps."""
+    grid = np.zeros((8, 8), dtype=np.uint8)
+    grid[3, 2:5] = 1
+    simulation = SimulationThread(Game(8, 8), grid, speed=50)
+    simulation.start()
+    time.sleep(0.3)
+    assert 5 <= simulation.latest()[0] <= 20
+
+    simulation.pause()
+    time.sleep(0.05)
+    paused_at = simulation.latest()[0]
+    time.sleep(0.1)
+    assert simulation.latest()[0] == paused_at
+    simulation.step_once()
+    assert _wait_for(lambda: simulation.latest()[0] == paused_at + 1)
+    assert np.array_equal(simulation.latest()[1], step_numpy(grid) if paused_at % 2 == 0 else grid)
+    simulation.stop()
+    assert not simulation.is_alive()
@@ -0,0 +1,71 @@
+import json
+import os
+import struct
+
+import pytest
+import numpy as np
+
+from GameOfLife.bitgrid import BitGrid
+from GameOfLife.game import Game
+from GameOfLife.rules import Rule
+from GameOfLife.snapshot import SNAPSHOT_MAGIC, is_snapshot, load_snapshot, save_snapshot
+
+
+def test_snapshot_roundtrip():
+    """Check that a snapshot restores the grid and its state, with the body memory-mapped."""
+    grid = np.random.default_rng(11).integers(0, 2, size=(37, 130))
+    save_path = 'data/test_snapshot.gols'
+    save_snapshot(save_path, grid, rule=Rule.from_string("B36/S23"), generation=1234, no_wrapping=True)
+    snapshot = load_snapshot(save_path)
+    assert isinstance(snapshot.grid.words, np.memmap)
+    assert snapshot.shape == grid.shape
+    assert snapshot.rule == Rule.from_string("B36/S23")
+    assert snapshot.generation == 1234
+    assert snapshot.no_wrapping
+    assert np.array_equal(snapshot.grid.to_array(), grid)
+    assert snapshot.grid == load_snapshot(save_path, mmap=False).grid
+    del snapshot
+    os.remove(save_path)
+
+
+def test_snapshot_detection():
+    """Verify that Game loads snapshots by extension or by magic bytes, and saves them by extension."""
+    grid = np.random.default_rng(12).integers(0, 2, size=(9, 9))
+    for save_path in ['data/test_snapshot.gols', 'data/test_snapshot.bin']:
+        save_snapshot(save_path, BitGrid.from_array(grid), rule=Rule.from_string("seeds"), generation=7)
+        assert is_snapshot(save_path)
+        game = Game(starting_grid_filepath=save_path)
+        assert np.array_equal(game.initialize_grid(), grid)
+        assert game.rule == Rule.from_string("B2/S")
+        assert game.generation == 7
+        os.remove(save_path)
+
+    save_path = 'data/test_save.gols'
+    Game.save_grid_to_file(grid, save_path)
+    assert is_snapshot(save_path)
+    assert np.array_equal(Game(starting_grid_filepath=save_path).initialize_grid(), grid)
+    os.remove(save_path)
+    assert not is_snapshot('data/glider.txt')
+
+
+def test_invalid_snapshot(tmp_path):
+    """Test that files without the magic bytes, or with header fields missing or mistyped, are refused."""
+    with pytest.raises(ValueError):
+        load_snapshot('data/glider.txt')
+    for header in [[], {"shape": [4, 4], "generation": 0, "no_wrapping": False},
+                   {"shape": [4], "rule": "B3/S23", "generation": 0, "no_wrapping": False},
+                   {"shape": [4, 4], "rule": "B3/S23", "generation": "0", "no_wrapping": False}]:
+        encoded = json.dumps(header).encode('utf-8')
+        (tmp_path / "bad.gols").write_bytes(SNAPSHOT_MAGIC + struct.pack('<I', len(encoded)) + encoded)
+        with pytest.raises(ValueError, match="Error reading snapshot"):
+            load_snapshot(tmp_path / "bad.gols")
+
+
+def test_truncated_snapshot(tmp_path):
+    """Test that a snapshot whose grid words were cut short is refused, with or without memory mapping."""
+    path = tmp_path / "truncated.gols"
+    save_snapshot(path, np.ones((20, 70), dtype=np.uint8))
+    path.write_bytes(path.read_bytes()[:-8])
+    for mmap in [True, False]:
+        with pytest.raises(ValueError, match="Error reading snapshot"):
+            load_snapshot(path, mmap=mmap)
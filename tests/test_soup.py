@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from GameOfLife.soup import main, run_soup, search_soups, soup_grid, summarize
+
+
+def test_soups_are_reproducible():
+    """Check that a soup only depends on the search seed and its index."""
+    assert (soup_grid(3, 7, (16, 16), 0.4) == soup_grid(3, 7, (16, 16), 0.4)).all()
+    assert not (soup_grid(3, 7, (16, 16), 0.4) == soup_grid(3, 8, (16, 16), 0.4)).all()
+    assert run_soup(5, seed=2, shape=(24, 24), max_generations=2000) == \
+        run_soup(5, seed=2, shape=(24, 24), max_generations=2000, backend="numpy")
+
+
+def test_search_on_pool_matches_serial():
+    """Verify that soups run on a process pool give the same results as in this process."""
+    options = dict(shape=(20, 20), max_generations=1000)
+    serial = sorted(search_soups(12, seed=1, processes=1, **options), key=lambda result: result["index"])
+    pooled = sorted(search_soups(12, seed=1, processes=2, **options), key=lambda result: result["index"])
+    assert serial == pooled
+    summary = summarize(serial)
+    assert summary["soups"] == 12
+    assert summary["unstabilised"] + sum(summary["periods"].values()) == 12
+
+
+def test_search_resumes_from_checkpoint(tmp_path):
+    """Ensure an interrupted search skips the soups recorded in its checkpoint."""
+    checkpoint = tmp_path / "soups.jsonl"
+    options = dict(shape=(16, 16), max_generations=500, processes=1, checkpoint=str(checkpoint))
+    first = search_soups(10, **options)
+    done = [next(first) for _ in range(4)]
+    first.close()
+    with open(checkpoint, 'a') as file:
+        file.write('{"index": 9, "lif')
+    rest = list(search_soups(10, **options))
+    assert sorted(result["index"] for result in done + rest) == list(range(10))
+    recorded = [json.loads(line)["index"] for line in checkpoint.read_text().splitlines() if "lifespan" in line]
+    assert sorted(recorded) == list(range(10))
+
+
+def test_checkpoint_of_another_search_is_refused(tmp_path, capsys):
+    """Check that a checkpoint is only resumed by a search with the same parameters, and summarised up to --soups."""
+    checkpoint = tmp_path / "soups.jsonl"
+    list(search_soups(6, seed=1, shape=(16, 16), max_generations=300, processes=1, checkpoint=str(checkpoint)))
+    with pytest.raises(ValueError):
+        list(search_soups(6, seed=1, shape=(16, 16), density=0.5, max_generations=300, processes=1,
+                          checkpoint=str(checkpoint)))
+    arguments = ["--size", "16", "16", "--seed", "1", "--max-generations", "300", "--processes", "1",
+                 "--checkpoint", str(checkpoint), "--log-dir", str(tmp_path / "logs")]
+    assert main(["--soups", "4"] + arguments) == 0
+    assert json.loads(capsys.readouterr().out)["soups"] == 4
+    assert main(["--soups", "4", "--rule", "highlife"] + arguments) == 2
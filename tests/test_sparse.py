@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+
+from GameOfLife.game import Game
+from GameOfLife.kernels import step_numpy
+from GameOfLife.sparse import SparseGrid
+
+
+@pytest.mark.parametrize("no_wrapping", [False, True])
+def test_step_matches_numpy(no_wrapping):
+    """Check that the sparse engine matches the vectorized kernel in both edge modes."""
+    rng = np.random.default_rng(3)
+    for shape in [(1, 1), (2, 2), (3, 5), (20, 31)]:
+        grid = rng.integers(0, 2, size=shape)
+        sparse = SparseGrid.from_array(grid)
+        for _ in range(10):
+            grid = step_numpy(grid, no_wrapping)
+            sparse = sparse.step(no_wrapping)
+            assert np.array_equal(sparse.to_array(), grid)
+            assert sparse.population == grid.sum()
+
+
+def test_unbounded_glider():
+    """Verify that a glider keeps travelling past the grid edges on the unbounded plane."""
+    grid = Game(starting_grid_filepath='data/glider.txt').initialize_grid()
+    sparse = SparseGrid.from_array(grid, unbounded=True)
+    (top, left, height, width) = sparse.bounding_box()
+    start = sparse.to_array((top, left, height, width))
+    for _ in range(4 * 100):
+        sparse = sparse.step()
+    assert sparse.bounding_box() == (top + 100, left + 100, height, width)
+    assert np.array_equal(sparse.to_array((top + 100, left + 100, height, width)), start)
+    assert not sparse.to_array().any()
+
+
+def test_sparse_backend():
+    """Ensure that the sparse backend steps dense grids and SparseGrid instances alike."""
+    game = Game(5, 5, backend="sparse")
+    grid = np.zeros((5, 5), dtype=int)
+    grid[2, 1:4] = 1
+    assert np.array_equal(game.update_grid_state(grid), grid.T)
+    stepped = game.update_grid_state(SparseGrid.from_array(grid))
+    assert isinstance(stepped, SparseGrid)
+    assert np.array_equal(stepped.to_array(), grid.T)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from GameOfLife.game import Game
+from GameOfLife.kernels import step_numpy
+from GameOfLife.rules import Rule
+from GameOfLife.stacked import StackedStepper, bucket_shape, step_stack
+
+
+def _steps(grid, generations, no_wrapping, rule=None):
+    for _ in range(generations):
+        grid = step_numpy(grid, no_wrapping, rule) if rule else step_numpy(grid, no_wrapping)
+    return grid
+
+
+@pytest.mark.parametrize("no_wrapping", [False, True, "mixed"])
+def test_stack_matches_numpy_kernel(no_wrapping):
+    """Check that every grid of a stack evolves as if stepped alone, in its own edge mode."""
+    rng = np.random.default_rng(4)
+    grids = rng.integers(0, 2, size=(25, 12, 10))
+    modes = rng.integers(0, 2, size=25).astype(bool) if no_wrapping == "mixed" else no_wrapping
+    result = step_stack(grids, 6, modes)
+    assert result.shape == grids.shape and result.dtype == grids.dtype
+    for (i, grid) in enumerate(grids):
+        assert np.array_equal(result[i], _steps(grid, 6, np.broadcast_to(modes, 25)[i]))
+
+
+def test_grids_of_different_sizes_are_bucketed():
+    """Verify that grids padded into buckets keep their own size and wrapping."""
+    rng = np.random.default_rng(5)
+    grids = [rng.integers(0, 2, size=tuple(shape)) for shape in rng.integers(1, 20, size=(40, 2))]
+    grids += [Game(starting_grid_filepath=f"data/{name}.txt").initialize_grid() for name in ("glider", "toad")]
+    modes = rng.integers(0, 2, size=len(grids)).astype(bool)
+    highlife = Rule.from_string("B36/S23")
+    results = step_stack(grids, 9, modes, highlife)
+    for (grid, result, mode) in zip(grids, results, modes):
+        assert np.array_equal(result, _steps(grid, 9, mode, highlife))
+    assert bucket_shape((1, 9)) == (8, 16)
+    assert Game(4, 4, rule="highlife").run_stack(grids, 9, modes)[3].shape == grids[3].shape
+
+
+def test_invalid_sizes():
+    """Ensure grid sizes larger than the stack are rejected."""
+    with pytest.raises(ValueError):
+        StackedStepper((2, 8, 8), sizes=[(8, 8), (9, 8)])
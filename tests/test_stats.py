@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from GameOfLife.game import Game
+from GameOfLife.stats import StatsCollector, StatsRecorder
+
+
+def _expected(previous, current):
+    rows = np.flatnonzero(current.any(axis=1))
+    cols = np.flatnonzero(current.any(axis=0))
+    box = (rows[0], cols[0], rows[-1] - rows[0] + 1, cols[-1] - cols[0] + 1) if len(rows) else None
+    return {
+        "population": int(current.sum()),
+        "births": int((current & ~previous).sum()),
+        "deaths": int((previous & ~current).sum()),
+        "changed": int((current != previous).sum()),
+        "bounding_box": box,
+    }
+
+
+@pytest.mark.parametrize("backend", ["numpy", "active", "bitpacked", "sparse", "reference"])
+def test_stats_match_full_passes(backend):
+    """Check every metric against a direct computation on consecutive dense generations."""
+    game = Game(30, 70, random_seed=8, alive_probability=0.2, backend=backend)
+    grid = game.initialize_grid()
+    reference = Game(30, 70)
+    previous = grid.astype(bool)
+    for (generation, stats) in game.iter_stats(grid, 25, no_wrapping=True):
+        current = reference.run(grid, generation, no_wrapping=True).astype(bool)
+        expected = _expected(previous, current)
+        if generation == 0:
+            expected.update(births=0, deaths=0, changed=0)
+        assert stats == expected
+        previous = current
+
+
+def test_metric_selection_and_callback():
+    """Verify that only the requested metrics are computed and that run feeds the callback."""
+    with pytest.raises(ValueError):
+        StatsCollector(["entropy"])
+    grid = np.zeros((10, 10), dtype=np.uint8)
+    grid[4, 3:6] = 1
+    seen = []
+    Game(10, 10).run(grid, 4, on_stats=lambda generation, stats: seen.append((generation, stats)))
+    assert [generation for (generation, _) in seen] == [0, 1, 2, 3, 4]
+    assert seen[1][1]["bounding_box"] == (3, 4, 3, 1)
+    only = list(Game(10, 10).iter_stats(grid, 2, metrics=["population"]))
+    assert only == [(0, {"population": 3}), (1, {"population": 3}), (2, {"population": 3})]
+
+
+@pytest.mark.parametrize("extension", [".npz", ".csv"])
+def test_recorder_writes_columns(tmp_path, extension):
+    """Ensure the recorder writes one column per metric, with the bounding box split."""
+    path = tmp_path / f"stats{extension}"
+    grid = np.zeros((12, 12), dtype=np.uint8)
+    grid[0:2, 0:2] = 1
+    with StatsRecorder(path) as recorder:
+        Game(12, 12).run(grid, 5, on_stats=recorder)
+    if extension == ".npz":
+        columns = np.load(path)
+        assert columns["generation"].tolist() == [0, 1, 2, 3, 4, 5]
+        assert columns["population"].tolist() == [4] * 6
+        assert columns["bbox_width"].tolist() == [2] * 6
+    else:
+        lines = path.read_text().splitlines()
+        assert lines[0] == "generation,population,births,deaths,changed,bbox_top,bbox_left,bbox_height,bbox_width"
+        assert lines[1] == "0,4,0,0,0,0,0,2,2"